@@ -0,0 +1 @@
+"""Performance benchmarks for meteo_lt, see README.md in this directory"""
@@ -0,0 +1,50 @@
+"""Runs benchmarks
+
+Usage:
+    python -m benchmarks                           # run all benchmarks
+    python -m benchmarks -k decode                 # run benchmarks with "decode" in the name
+    python -m benchmarks --save baseline.json      # store results as a baseline
+    python -m benchmarks --compare baseline.json   # fail when median is slower than baseline
+"""
+
+import argparse
+import sys
+
+from . import cases  # noqa: F401 pylint: disable=unused-import
+from .fixtures import Fixtures
+from .harness import BENCHMARKS, run_benchmark, save_results, load_baseline, compare, format_results
+
+
+def main() -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--rounds", type=int, default=50, help="minimum measured calls per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimum seconds spent per benchmark")
+    parser.add_argument("--save", metavar="FILE", help="save results to a baseline file")
+    parser.add_argument("--compare", metavar="FILE", help="compare results against a baseline file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown, default 10%%")
+    args = parser.parse_args()
+
+    fixtures = Fixtures()
+    results = []
+    for name, setup in BENCHMARKS.items():
+        if args.filter in name:
+            results.append(run_benchmark(name, setup(fixtures), args.rounds, args.min_time))
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_results(args.save, results)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nSlower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Benchmark cases"""
+
+import random
+
+from meteo_lt.aggregate import ForecastAggregator
+from meteo_lt.columns import ForecastColumns
+from meteo_lt.diff import diff_forecasts
+from meteo_lt.grid import PlaceGrid
+from meteo_lt.index import NearestCache, PlaceIndex
+from meteo_lt.models import Forecast, HydroObservation, HydroObservationData, HydroStation, Place
+from meteo_lt.utils import find_nearest_location
+from meteo_lt.warnings import WeatherWarningsProcessor, enrich_forecast_for_place
+
+from .harness import benchmark
+
+# Fixed query points across Lithuania so runs are comparable
+_rnd = random.Random(1)
+QUERY_POINTS = [(_rnd.uniform(53.9, 56.45), _rnd.uniform(20.95, 26.8)) for _ in range(100)]
+
+
+@benchmark("decode_places")
+def decode_places(fixtures):
+    """All places list into Place objects"""
+    payload = fixtures.places
+    return lambda: [Place.from_dict(place) for place in payload]
+
+
+@benchmark("decode_forecast")
+def decode_forecast(fixtures):
+    """Long-term forecast of one place"""
+    payload = fixtures.forecast
+    return lambda: Forecast.from_dict(payload)
+
+
+@benchmark("decode_hydro_observations")
+def decode_hydro_observations(fixtures):
+    """Week of measured observations of one station, built the way the client does"""
+    payload = fixtures.hydro_observations
+
+    def decode():
+        return HydroObservationData(
+            station=HydroStation.from_dict(payload["station"]),
+            observations_data_range=payload.get("observationsDataRange"),
+            observations=[HydroObservation.from_dict(obs) for obs in payload["observations"]],
+        )
+
+    return decode
+
+
+@benchmark("find_nearest_place_x100")
+def find_nearest_place(fixtures):
+    """Linear nearest place search for 100 points"""
+    places = [Place.from_dict(place) for place in fixtures.places]
+    return lambda: [find_nearest_location(lat, lon, places) for lat, lon in QUERY_POINTS]
+
+
+@benchmark("nearest_place_index_x100")
+def nearest_place_index(fixtures):
+    """Indexed nearest place search for 100 points"""
+    index = PlaceIndex(Place.from_dict(place) for place in fixtures.places)
+    return lambda: [index.nearest(lat, lon) for lat, lon in QUERY_POINTS]
+
+
+@benchmark("nearest_place_cached_x100")
+def nearest_place_cached(fixtures):
+    """Nearest place for 100 points from warm cells, cells crossed by borders search the index"""
+    cache = NearestCache(PlaceIndex(Place.from_dict(place) for place in fixtures.places))
+    return lambda: [cache.nearest(lat, lon) for lat, lon in QUERY_POINTS]
+
+
+@benchmark("nearest_place_grid_x100")
+def nearest_place_grid(fixtures):
+    """Nearest place for 100 points from a precomputed grid over Lithuania"""
+    grid = PlaceGrid.build(Place.from_dict(place) for place in fixtures.places)
+    return lambda: [grid.nearest(lat, lon) for lat, lon in QUERY_POINTS]
+
+
+@benchmark("parse_warnings")
+def parse_warnings(fixtures):
+    """Warnings file into WeatherWarning objects"""
+    processor = WeatherWarningsProcessor(None)
+    payload = fixtures.warnings
+    return lambda: processor._parse_warnings_data(payload)  # pylint: disable=protected-access
+
+
+@benchmark("enrich_forecast_with_warnings")
+def enrich_forecast_with_warnings(fixtures):
+    """Attach all warnings to every timestamp of one forecast"""
+    processor = WeatherWarningsProcessor(None)
+    warnings = processor._parse_warnings_data(fixtures.warnings)  # pylint: disable=protected-access
+    forecast = Forecast.from_dict(fixtures.forecast)
+    return lambda: processor.enrich_forecast_with_warnings(forecast, warnings)
+
+
+@benchmark("enrich_forecast_for_place")
+def enrich_place_forecast(fixtures):
+    """Select warnings affecting the forecast place and attach them to its timestamps"""
+    processor = WeatherWarningsProcessor(None)
+    warnings = processor._parse_warnings_data(fixtures.warnings)  # pylint: disable=protected-access
+    forecast = Forecast.from_dict(fixtures.forecast)
+    return lambda: enrich_forecast_for_place(forecast, warnings)
+
+
+@benchmark("diff_forecasts_x100")
+def diff_forecasts_x100(fixtures):
+    """Diff 100 forecast runs against previous run columns, a few values changed in each"""
+    previous = ForecastColumns.from_forecast(Forecast.from_dict(fixtures.forecast))
+    rnd = random.Random(2)
+    runs = []
+    for _ in range(100):
+        forecast = Forecast.from_dict(fixtures.forecast)
+        for timestamp in rnd.sample(forecast.forecast_timestamps, 5):
+            timestamp.temperature += rnd.uniform(-2, 2)
+        runs.append(ForecastColumns.from_forecast(forecast))
+    return lambda: [diff_forecasts(previous, run) for run in runs]
+
+
+@benchmark("aggregate_county_max_x300")
+def aggregate_county_max(fixtures):
+    """Daily maximum wind gust per county over forecasts of 300 places"""
+    aggregator = ForecastAggregator(Forecast.from_dict(fixtures.forecast_for(place)) for place in fixtures.places[:300])
+    return lambda: aggregator.aggregate("wind_gust_speed", "max", "max")
+
+
+@benchmark("forecast_to_bytes")
+def forecast_to_bytes(fixtures):
+    """Long-term forecast of one place into binary layout"""
+    forecast = Forecast.from_dict(fixtures.forecast)
+    return forecast.to_bytes
+
+
+@benchmark("forecast_from_bytes")
+def forecast_from_bytes(fixtures):
+    """Long-term forecast of one place from binary layout"""
+    data = Forecast.from_dict(fixtures.forecast).to_bytes()
+    return lambda: Forecast.from_bytes(data)
+
+
+@benchmark("forecast_to_json")
+def forecast_to_json(fixtures):
+    """Long-term forecast of one place into JSON bytes with API keys"""
+    forecast = Forecast.from_dict(fixtures.forecast)
+    return lambda: forecast.to_json(api_keys=True, as_bytes=True)
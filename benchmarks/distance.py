@@ -0,0 +1,81 @@
+"""Distance functions against the implementations they replaced
+
+Compares the previous haversine, which converted its arguments with
+map(radians, [...]), with the current one and with squared chords between unit
+vectors precomputed on locations, and the linear nearest place search on each.
+
+Usage:
+    python -m benchmarks.distance
+    python -m benchmarks.distance --rounds 20
+"""
+
+import argparse
+import timeit
+from math import atan2, cos, radians, sin, sqrt
+from typing import List
+
+from meteo_lt.models import LocationBase, Place
+from meteo_lt.utils import EARTH_RADIUS, find_nearest_location, haversine, squared_chord, unit_vector
+
+from .cases import QUERY_POINTS
+from .fixtures import Fixtures
+
+
+def previous_haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine as it was before unit vectors"""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return EARTH_RADIUS * c
+
+
+def previous_find_nearest_location(latitude: float, longitude: float, locations: List[LocationBase]) -> LocationBase:
+    """Linear search with previous_haversine for every location"""
+    nearest_location = None
+    min_distance = float("inf")
+    for location in locations:
+        distance = previous_haversine(latitude, longitude, location.latitude, location.longitude)
+        if distance < min_distance:
+            min_distance = distance
+            nearest_location = location
+    return nearest_location
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="repetitions, the fastest is reported")
+    args = parser.parse_args()
+
+    places = [Place.from_dict(place) for place in Fixtures().places]
+    pairs = [(lat, lon, place) for lat, lon in QUERY_POINTS for place in places[:100]]
+    vectors = [(unit_vector(lat, lon), place.unit_vector) for lat, lon, place in pairs]
+    for lat, lon in QUERY_POINTS:
+        assert find_nearest_location(lat, lon, places) is previous_find_nearest_location(lat, lon, places)
+
+    cases = {
+        "previous haversine": (
+            len(pairs),
+            lambda: [previous_haversine(lat, lon, p.latitude, p.longitude) for lat, lon, p in pairs],
+        ),
+        "haversine": (len(pairs), lambda: [haversine(lat, lon, p.latitude, p.longitude) for lat, lon, p in pairs]),
+        "squared chord": (len(vectors), lambda: [squared_chord(vector, other) for vector, other in vectors]),
+        f"previous nearest of {len(places)}": (
+            len(QUERY_POINTS),
+            lambda: [previous_find_nearest_location(lat, lon, places) for lat, lon in QUERY_POINTS],
+        ),
+        f"nearest of {len(places)}": (
+            len(QUERY_POINTS),
+            lambda: [find_nearest_location(lat, lon, places) for lat, lon in QUERY_POINTS],
+        ),
+    }
+    print(f"{'case':<28}{'per call':>12}")
+    for name, (calls, run) in cases.items():
+        seconds = min(timeit.repeat(run, number=1, repeat=args.rounds)) / calls
+        print(f"{name:<28}{seconds * 1e6:>10.3f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Recorded payloads for benchmarks
+
+Forecast and warning times are shifted so the recorded forecast starts two hours
+before the current hour. Otherwise Forecast would filter every recorded timestamp
+out as past and warnings would never overlap the forecast.
+"""
+
+import copy
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+
+from .record import DATA_DIR, API_TIME_FORMAT, WARNING_TIME_FORMAT
+
+
+def load_bytes(name: str) -> bytes:
+    """Raw recorded response body"""
+    with gzip.open(DATA_DIR / f"{name}.json.gz", "rb") as file:
+        return file.read()
+
+
+def load(name: str):
+    """Decoded recorded response body"""
+    return json.loads(load_bytes(name))
+
+
+def _shift(value: str, time_format: str, shift: timedelta) -> str:
+    return (datetime.strptime(value, time_format) + shift).strftime(time_format)
+
+
+class Fixtures:
+    """Lazily loaded recorded payloads, with times rebased to now"""
+
+    @cached_property
+    def shift(self) -> timedelta:
+        """Offset applied to recorded forecast and warning times"""
+        recorded = load("forecast")
+        first = datetime.strptime(recorded["forecastTimestamps"][0]["forecastTimeUtc"], API_TIME_FORMAT)
+        current_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0, tzinfo=None)
+        return current_hour - timedelta(hours=2) - first
+
+    @cached_property
+    def places(self) -> list:
+        """Places list payload"""
+        return load("places")
+
+    @cached_property
+    def forecast(self) -> dict:
+        """Long-term forecast payload"""
+        payload = load("forecast")
+        payload["forecastCreationTimeUtc"] = _shift(payload["forecastCreationTimeUtc"], API_TIME_FORMAT, self.shift)
+        for timestamp in payload["forecastTimestamps"]:
+            timestamp["forecastTimeUtc"] = _shift(timestamp["forecastTimeUtc"], API_TIME_FORMAT, self.shift)
+        return payload
+
+    @cached_property
+    def warnings(self) -> dict:
+        """Warnings file payload"""
+        payload = load("warnings")
+        for group in payload.get("phenomenon_groups", []):
+            for area_group in group.get("area_groups", []):
+                for alert in area_group.get("single_alerts", []):
+                    for key in ("t_from", "t_to"):
+                        if alert.get(key):
+                            alert[key] = _shift(alert[key], WARNING_TIME_FORMAT, self.shift)
+        return payload
+
+    @cached_property
+    def hydro_stations(self) -> list:
+        """Hydro stations list payload"""
+        return load("hydro_stations")
+
+    @cached_property
+    def hydro_observations(self) -> dict:
+        """Hydro observations payload for a single station"""
+        return load("hydro_observations")
+
+    def forecast_for(self, place: dict) -> dict:
+        """Forecast payload copy for another place"""
+        payload = copy.deepcopy(self.forecast)
+        payload["place"] = place
+        return payload
@@ -0,0 +1,147 @@
+"""Benchmark registry, runner and baseline comparison"""
+
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark
+
+    The decorated function receives Fixtures, does all setup and returns
+    the zero-argument callable to be measured.
+    """
+
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of a single benchmark"""
+
+    name: str
+    rounds: int
+    mean: float  # seconds
+    p50: float
+    p95: float
+    p99: float
+    ops_per_sec: float
+    alloc_peak: int  # bytes
+    alloc_blocks: int  # memory blocks allocated and still alive after one call
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile of already sorted values using linear interpolation"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure_allocations(func: Callable) -> tuple:
+    """Peak traced memory and retained memory blocks of a single call"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return peak - base, blocks
+
+
+def run_benchmark(name: str, func: Callable, rounds: int, min_time: float = 0.0) -> BenchmarkResult:
+    """Time func individually for rounds calls, continuing until min_time seconds passed"""
+    func()  # warm up caches and lazy imports
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < rounds or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - call_started)
+    timings.sort()
+    alloc_peak, alloc_blocks = measure_allocations(func)
+    mean = sum(timings) / len(timings)
+    return BenchmarkResult(
+        name=name,
+        rounds=len(timings),
+        mean=mean,
+        p50=percentile(timings, 0.50),
+        p95=percentile(timings, 0.95),
+        p99=percentile(timings, 0.99),
+        ops_per_sec=1 / mean if mean else float("inf"),
+        alloc_peak=alloc_peak,
+        alloc_blocks=alloc_blocks,
+    )
+
+
+def save_results(path: str, results: List[BenchmarkResult]) -> None:
+    """Save results as a baseline file"""
+    data = {
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    """Load results saved with save_results"""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Names of benchmarks whose median got slower than baseline by more than threshold"""
+    regressions = []
+    for result in results:
+        if result.name in baseline and result.p50 > baseline[result.name]["p50"] * (1 + threshold):
+            regressions.append(result.name)
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    """Human readable duration"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def format_results(results: List[BenchmarkResult], baseline: Optional[Dict[str, dict]] = None) -> str:
+    """Results as a text table"""
+    header = f"{'benchmark':<32}{'ops/s':>12}{'p50':>11}{'p95':>11}{'p99':>11}{'peak KiB':>11}{'blocks':>9}"
+    if baseline is not None:
+        header += f"{'vs base':>9}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        line = (
+            f"{result.name:<32}{result.ops_per_sec:>12,.1f}{format_time(result.p50):>11}"
+            f"{format_time(result.p95):>11}{format_time(result.p99):>11}"
+            f"{result.alloc_peak / 1024:>11,.1f}{result.alloc_blocks:>9,}"
+        )
+        if baseline is not None:
+            base = baseline.get(result.name)
+            line += f"{result.p50 / base['p50'] - 1:>+9.1%}" if base else f"{'new':>9}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,65 @@
+"""Import time of meteo_lt modules in fresh interpreters, checked against budgets
+
+Usage:
+    python -m benchmarks.import_time               # fail if any median exceeds its budget
+    python -m benchmarks.import_time --runs 20 --budget-scale 2
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Milliseconds of cumulative import time allowed per module. Models and utils must
+# stay usable without importing aiohttp, while the API needs it.
+BUDGETS = {
+    "meteo_lt": 50,
+    "meteo_lt.models": 75,
+    "meteo_lt.utils": 75,
+    "meteo_lt.api": None,
+}
+
+
+def import_time(module: str) -> float:
+    """Cumulative import time of module in milliseconds as reported by -X importtime"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    for line in reversed(output.splitlines()):
+        _, _, cumulative, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} not found in import time output")
+
+
+def main() -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per module")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply budgets, e.g. for slow CI")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'module':<20}{'median':>10}{'min':>10}{'budget':>10}")
+    for module, budget in BUDGETS.items():
+        timings = [import_time(module) for _ in range(args.runs)]
+        median = statistics.median(timings)
+        budget_text = "-"
+        if budget is not None:
+            budget *= args.budget_scale
+            budget_text = f"{budget:.0f}ms"
+            if median > budget:
+                over_budget.append(module)
+        print(f"{module:<20}{median:>8.1f}ms{min(timings):>8.1f}ms{budget_text:>10}")
+
+    if over_budget:
+        print(f"\nOver import time budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
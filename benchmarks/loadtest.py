@@ -0,0 +1,187 @@
+"""Load test of MeteoLtAPI workloads against the local stub server
+
+Usage:
+    python -m benchmarks.loadtest --workload forecast --concurrency 32 --operations 2000 --latency 0.02
+    python -m benchmarks.loadtest --workload mixed --duration 30 --rate-limit 500
+    python -m benchmarks.loadtest --base-url http://host:8080/v1 --warnings-url http://host:8080/warnings/list
+    python -m benchmarks.loadtest --workload mixed --operations 2000 --record traffic.zip
+    python -m benchmarks.loadtest --workload mixed --operations 2000 --replay traffic.zip
+
+Replaying with the workload, operations and seed of the recording repeats its
+requests without a server, measuring decoding and model building only.
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from meteo_lt import MeteoLtAPI
+from meteo_lt.const import BASE_URL, WARNINGS_URL
+from meteo_lt.replay import TrafficArchive
+
+from .fixtures import Fixtures
+from .harness import percentile, format_time
+from .stub_server import StubServer, add_config_arguments, config_from_arguments
+
+
+def _forecast(api: MeteoLtAPI, rnd: random.Random, fixtures: Fixtures):
+    return api.get_forecast(rnd.choice(fixtures.places)["code"], include_warnings=False)
+
+
+def _forecast_with_warnings(api: MeteoLtAPI, rnd: random.Random, fixtures: Fixtures):
+    return api.get_forecast(rnd.choice(fixtures.places)["code"])
+
+
+def _nearest_forecast(api: MeteoLtAPI, rnd: random.Random, _: Fixtures):
+    return api.get_forecast_with_warnings(latitude=rnd.uniform(53.9, 56.45), longitude=rnd.uniform(20.95, 26.8))
+
+
+def _hydro_observations(api: MeteoLtAPI, rnd: random.Random, fixtures: Fixtures):
+    return api.get_hydro_observation_data(rnd.choice(fixtures.hydro_stations)["code"])
+
+
+def _mixed(api: MeteoLtAPI, rnd: random.Random, fixtures: Fixtures):
+    return rnd.choice([_forecast, _forecast_with_warnings, _nearest_forecast, _hydro_observations])(api, rnd, fixtures)
+
+
+WORKLOADS: Dict[str, Callable] = {
+    "forecast": _forecast,
+    "forecast_with_warnings": _forecast_with_warnings,
+    "nearest_forecast": _nearest_forecast,
+    "hydro_observations": _hydro_observations,
+    "mixed": _mixed,
+}
+
+
+def recorded_urls(archive: TrafficArchive) -> Tuple[str, str]:
+    """API base URL and warnings list URL of the recorded requests"""
+    base_url, warnings_url = BASE_URL, WARNINGS_URL
+    for response in archive.responses:
+        if response.endpoint == "warnings_list":
+            warnings_url = response.url
+        match = re.match(r"(.*?)/(places|hydro-stations)(/|$)", response.url)
+        if match:
+            base_url = match.group(1)
+    return base_url, warnings_url
+
+
+async def run_load(
+    api: MeteoLtAPI,
+    workload: Callable,
+    concurrency: int,
+    operations: Optional[int] = None,
+    duration: Optional[float] = None,
+    seed: int = 0,
+) -> dict:
+    """Run workload from concurrency workers until operations are done or duration passed"""
+    fixtures = Fixtures()
+    rnd = random.Random(seed)
+    latencies: List[float] = []
+    errors = Counter()
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+    remaining = [operations]
+
+    def more() -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining[0] is not None:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+        return True
+
+    async def worker():
+        while more():
+            operation_started = time.perf_counter()
+            try:
+                await workload(api, rnd, fixtures)
+            except aiohttp.ClientResponseError as exc:
+                errors[f"HTTP {exc.status}"] += 1
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                errors[type(exc).__name__] += 1
+            else:
+                latencies.append(time.perf_counter() - operation_started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "operations": len(latencies),
+        "errors": dict(errors),
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Start the stub server unless an external one is given or traffic is replayed and run the load"""
+    record = TrafficArchive() if args.record else None
+    replay = TrafficArchive.load(args.replay, latency=args.replay_latency) if args.replay else None
+    async with AsyncExitStack() as stack:
+        server = session = None
+        base_url, warnings_url = args.base_url, args.warnings_url
+        if replay is not None:
+            base_url, warnings_url = recorded_urls(replay)
+        elif base_url is None:
+            server = await stack.enter_async_context(StubServer(config_from_arguments(args)))
+            base_url, warnings_url = server.base_url, server.warnings_url
+
+        if replay is None:
+            connector = aiohttp.TCPConnector(limit=args.concurrency)
+            session = await stack.enter_async_context(aiohttp.ClientSession(connector=connector, raise_for_status=True))
+        api = MeteoLtAPI(session, base_url=base_url, warnings_url=warnings_url, record=record, replay=replay)
+        if args.warm:
+            await api.fetch_places()
+
+        result = await run_load(
+            api, WORKLOADS[args.workload], args.concurrency, args.operations, args.duration, args.seed or 0
+        )
+
+    elapsed = result["elapsed"]
+    latency = "  ".join(f"{name} {format_time(result[name])}" for name in ("p50", "p95", "p99"))
+    print(f"workload:       {args.workload} x{args.concurrency} workers")
+    print(f"operations:     {result['operations']} in {elapsed:.2f}s ({result['ops_per_sec']:,.1f}/s)")
+    if server is not None:
+        requests = server.stub.stats["requests"]
+        print(f"HTTP requests:  {requests} ({requests / elapsed:,.1f}/s)")
+    print(f"latency:        {latency}")
+    if result["errors"]:
+        print(f"errors:         {', '.join(f'{name}: {count}' for name, count in sorted(result['errors'].items()))}")
+    if record is not None:
+        record.save(args.record)
+        print(f"recorded:       {len(record)} responses to {args.record}")
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="forecast")
+    parser.add_argument("--concurrency", type=int, default=16, help="simultaneous workers")
+    parser.add_argument("--operations", type=int, help="total operations, default 1000 unless --duration is set")
+    parser.add_argument("--duration", type=float, help="seconds to run")
+    parser.add_argument("--no-warm", dest="warm", action="store_false", help="include places download in the load")
+    parser.add_argument("--base-url", help="use an already running stub server instead of starting one")
+    parser.add_argument("--warnings-url", help="warnings list URL of the external stub server")
+    parser.add_argument("--record", metavar="PATH", help="save received responses to a traffic archive")
+    parser.add_argument("--replay", metavar="PATH", help="serve responses from a traffic archive instead of HTTP")
+    parser.add_argument("--replay-latency", action="store_true", help="wait recorded network time when replaying")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    if args.operations is None and args.duration is None:
+        args.operations = 1000
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Memory retained by decoded models
+
+Every payload is decoded from its own JSON bytes like API responses are, so
+equal strings are separate objects unless the models intern them.
+
+Usage:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --forecasts 500
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable
+
+from meteo_lt.client import _build_hydro_stations
+from meteo_lt.models import Forecast, Place
+from meteo_lt.warnings import WeatherWarningsProcessor
+
+from .fixtures import Fixtures
+
+
+def retained(build: Callable[[], Any]) -> int:
+    """Bytes still allocated while the result of build is alive"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--forecasts", type=int, default=100, help="forecasts of different places to decode")
+    args = parser.parse_args()
+
+    fixtures = Fixtures()
+    places = [json.dumps(place).encode() for place in fixtures.places]
+    forecasts = [json.dumps(fixtures.forecast_for(place)).encode() for place in fixtures.places[: args.forecasts]]
+    stations = json.dumps(fixtures.hydro_stations).encode()
+    warnings = json.dumps(fixtures.warnings).encode()
+    processor = WeatherWarningsProcessor(None)
+
+    cases = {
+        f"places x{len(places)}": lambda: [Place.from_dict(json.loads(place)) for place in places],
+        f"forecasts x{len(forecasts)}": lambda: [Forecast.from_dict(json.loads(forecast)) for forecast in forecasts],
+        "hydro_stations": lambda: _build_hydro_stations(json.loads(stations)),
+        "warnings": lambda: processor._parse_warnings_data(json.loads(warnings)),  # pylint: disable=protected-access
+    }
+    print(f"{'models':<20}{'retained KiB':>14}")
+    for name, build in cases.items():
+        print(f"{name:<20}{retained(build) / 1024:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Throughput of a bulk forecast download with decoding offloaded to executors
+
+Downloads forecasts with warnings for many places from the stub server running
+in a separate process, decoding inline on the event loop and in thread and
+process pools of growing size. Process pools should scale with cores until the
+stub server or the event loop becomes the limit.
+
+Usage:
+    python -m benchmarks.offload                          # 1 to all cores
+    python -m benchmarks.offload --places 500 --workers 1 2 4 8 --no-warnings
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+import aiohttp
+
+from meteo_lt import MeteoLtAPI
+
+from .fixtures import Fixtures
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_server(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    return
+            except aiohttp.ClientConnectionError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+async def bulk_download(
+    base_url: str,
+    warnings_url: str,
+    codes: List[str],
+    executor: Optional[Executor],
+    concurrency: int,
+    include_warnings: bool,
+) -> float:
+    """Seconds to download forecasts of all codes"""
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, raise_for_status=True) as session:
+        api = MeteoLtAPI(session, base_url=base_url, warnings_url=warnings_url, executor=executor)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def download(code: str) -> None:
+            async with semaphore:
+                await api.get_forecast(code, include_warnings=include_warnings)
+
+        # Warm up connections and executor workers, which import meteo_lt on first use
+        await asyncio.gather(*(download(code) for code in codes[:concurrency]))
+        started = time.perf_counter()
+        await asyncio.gather(*(download(code) for code in codes))
+        return time.perf_counter() - started
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--places", type=int, help="forecasts to download, default all places")
+    parser.add_argument("--workers", type=int, nargs="+", help="pool sizes, default 1, 2, 4 ... up to all cores")
+    parser.add_argument("--concurrency", type=int, default=64, help="simultaneous downloads")
+    parser.add_argument("--no-warnings", dest="warnings", action="store_false", help="skip warnings enrichment")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({2**power for power in range(cores.bit_length())} | {cores})
+    codes = [place["code"] for place in Fixtures().places][: args.places]
+
+    port = _free_port()
+    base_url, warnings_url = f"http://127.0.0.1:{port}/v1", f"http://127.0.0.1:{port}/warnings/list"
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.stub_server", "--port", str(port)])
+    try:
+        asyncio.run(_wait_for_server(warnings_url))
+        configurations = [("inline", None, None)]
+        configurations += [("threads", ThreadPoolExecutor, count) for count in workers]
+        configurations += [("processes", ProcessPoolExecutor, count) for count in workers]
+
+        print(f"{len(codes)} forecasts, {cores} cores, warnings {'on' if args.warnings else 'off'}")
+        print(f"{'executor':<12}{'workers':>8}{'seconds':>10}{'forecasts/s':>14}{'speedup':>10}")
+        inline_seconds = None
+        for name, executor_class, count in configurations:
+            executor = executor_class(count) if executor_class else None
+            try:
+                seconds = asyncio.run(
+                    bulk_download(base_url, warnings_url, codes, executor, args.concurrency, args.warnings)
+                )
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            inline_seconds = inline_seconds or seconds
+            print(
+                f"{name:<12}{count or '-':>8}{seconds:>10.2f}{len(codes) / seconds:>14,.1f}"
+                f"{inline_seconds / seconds:>9.2f}x"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Records API payloads used by benchmarks
+
+Usage:
+    python -m benchmarks.record            # download current payloads from api.meteo.lt
+    python -m benchmarks.record --synthetic  # generate deterministic payloads of the same shape offline
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from meteo_lt.const import BASE_URL, WARNINGS_URL, COUNTY_MUNICIPALITIES, ENCODING
+
+DATA_DIR = Path(__file__).parent / "data"
+FORECAST_PLACE = "vilnius"
+API_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+WARNING_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+CONDITION_CODES = [
+    "clear",
+    "partly-cloudy",
+    "cloudy-with-sunny-intervals",
+    "cloudy",
+    "light-rain",
+    "rain",
+    "heavy-rain",
+    "thunder",
+    "isolated-thunderstorms",
+    "thunderstorms",
+    "light-sleet",
+    "sleet",
+    "freezing-rain",
+    "hail",
+    "light-snow",
+    "snow",
+    "heavy-snow",
+    "fog",
+]
+SYLLABLES = ["ka", "lė", "pa", "šiau", "ri", "ve", "žu", "na", "ša", "tu", "kai", "mo", "ė", "ly", "dž", "ūt", "ąs"]
+ENDINGS = ["ai", "iai", "ė", "ys", "as", "iškės", "uva", "inė"]
+WATER_BODIES = ["Nemunas", "Neris", "Šventoji", "Nevėžis", "Dubysa", "Minija", "Venta", "Jūra", "Merkys", "Žeimena"]
+
+
+def save(name, payload):
+    """Write payload as gzipped JSON into the data directory"""
+    DATA_DIR.mkdir(exist_ok=True)
+    with gzip.open(DATA_DIR / f"{name}.json.gz", "wt", encoding=ENCODING) as file:
+        json.dump(payload, file, ensure_ascii=False, separators=(",", ":"))
+
+
+async def record_live():
+    """Download payloads from the real APIs"""
+    import aiohttp  # pylint: disable=import-outside-toplevel
+
+    async with aiohttp.ClientSession(raise_for_status=True) as session:
+
+        async def get(url):
+            async with session.get(url) as response:
+                return json.loads(await response.read())
+
+        save("places", await get(f"{BASE_URL}/places"))
+        save("forecast", await get(f"{BASE_URL}/places/{FORECAST_PLACE}/forecasts/long-term"))
+        stations = await get(f"{BASE_URL}/hydro-stations")
+        save("hydro_stations", stations)
+        save(
+            "hydro_observations",
+            await get(f"{BASE_URL}/hydro-stations/{stations[0]['code']}/observations/measured/latest"),
+        )
+        file_list = await get(WARNINGS_URL)
+        save("warnings", await get(file_list[0]) if file_list else {})
+
+
+def synthetic_name(rnd):
+    """Lithuanian looking place name"""
+    name = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(1, 3))) + rnd.choice(ENDINGS)
+    if rnd.random() < 0.1:
+        name = f"{rnd.choice(['Naujoji', 'Senoji', 'Didieji', 'Mažieji'])} {name.capitalize()}"
+    return name[0].upper() + name[1:]
+
+
+def synthetic_place(rnd, code_counts):
+    """Place payload"""
+    name = synthetic_name(rnd)
+    code = name.lower().replace(" ", "-")
+    code_counts[code] = code_counts.get(code, 0) + 1
+    if code_counts[code] > 1:
+        code = f"{code}-{code_counts[code]}"
+    county = rnd.choice(list(COUNTY_MUNICIPALITIES))
+    return {
+        "code": code,
+        "name": name,
+        "administrativeDivision": f"{rnd.choice(COUNTY_MUNICIPALITIES[county])} savivaldybė",
+        "countryCode": "LT",
+        "coordinates": {
+            "latitude": round(rnd.uniform(53.9, 56.45), 6),
+            "longitude": round(rnd.uniform(20.95, 26.8), 6),
+        },
+    }
+
+
+def synthetic_forecast(rnd, place, created):
+    """Long-term forecast payload: hourly for three days, then every three hours up to a week"""
+    timestamps = []
+    time = created
+    while time < created + timedelta(days=7):
+        timestamps.append(
+            {
+                "forecastTimeUtc": time.strftime(API_TIME_FORMAT),
+                "airTemperature": round(rnd.uniform(-15, 30), 1),
+                "feelsLikeTemperature": round(rnd.uniform(-20, 32), 1),
+                "windSpeed": rnd.randint(0, 15),
+                "windGust": rnd.randint(0, 25),
+                "windDirection": rnd.randint(0, 359),
+                "cloudCover": rnd.randint(0, 100),
+                "seaLevelPressure": rnd.randint(975, 1040),
+                "relativeHumidity": rnd.randint(30, 100),
+                "totalPrecipitation": round(max(0.0, rnd.gauss(0, 1)), 1),
+                "conditionCode": rnd.choice(CONDITION_CODES),
+            }
+        )
+        time += timedelta(hours=1 if time < created + timedelta(days=3) else 3)
+    return {
+        "place": place,
+        "forecastType": "long-term",
+        "forecastCreationTimeUtc": created.strftime(API_TIME_FORMAT),
+        "forecastTimestamps": timestamps,
+    }
+
+
+def synthetic_station(rnd, number):
+    """Hydro station payload"""
+    return {
+        "code": f"station-{number}",
+        "name": f"{synthetic_name(rnd)} VMS",
+        "waterBody": rnd.choice(WATER_BODIES),
+        "coordinates": {
+            "latitude": round(rnd.uniform(53.9, 56.45), 6),
+            "longitude": round(rnd.uniform(20.95, 26.8), 6),
+        },
+    }
+
+
+def synthetic_hydro_observations(rnd, station, created):
+    """Measured observations for the last week, every hour"""
+    start = created - timedelta(days=7)
+    observations = [
+        {
+            "observationTimeUtc": (start + timedelta(hours=hour)).strftime(API_TIME_FORMAT),
+            "waterLevel": round(rnd.uniform(100, 500), 1),
+            "waterTemperature": round(rnd.uniform(0, 22), 1),
+            "waterDischarge": round(rnd.uniform(5, 800), 1) if rnd.random() < 0.8 else None,
+        }
+        for hour in range(7 * 24)
+    ]
+    return {
+        "station": station,
+        "observationsDataRange": {
+            "startTimeUtc": start.strftime(API_TIME_FORMAT),
+            "endTimeUtc": created.strftime(API_TIME_FORMAT),
+        },
+        "observations": observations,
+    }
+
+
+def synthetic_warnings(rnd, created):
+    """Warnings file payload with meteorological and hydrological groups"""
+    groups = []
+    for category, phenomena in [
+        ("wind", ["wind", "dangerous-wind", "severe-wind"]),
+        ("temperature", ["frost", "dangerous-heat", "extreme-cold"]),
+        ("precipitation", ["rain", "dangerous-rain", "snow", "black-ice"]),
+        ("hydrological", ["high-water-level", "dangerous-high-water-level"]),
+    ]:
+        area_groups = []
+        for _ in range(rnd.randint(2, 4)):
+            areas = rnd.sample(list(COUNTY_MUNICIPALITIES), rnd.randint(1, 4))
+            start = created + timedelta(hours=rnd.randint(-6, 48))
+            alerts = []
+            for _ in range(rnd.randint(1, 3)):
+                phenomenon = rnd.choice(phenomena)
+                alerts.append(
+                    {
+                        "phenomenon": phenomenon,
+                        "severity": rnd.choice(["Minor", "Moderate", "Severe", "Extreme"]),
+                        "description": {
+                            "lt": f"{phenomenon} aprašymas",
+                            "en": f"{phenomenon.replace('-', ' ').capitalize()} expected in many places",
+                        },
+                        "instruction": {"lt": "Būkite atsargūs", "en": "Be careful and follow the news"},
+                        "t_from": start.strftime(WARNING_TIME_FORMAT),
+                        "t_to": (start + timedelta(hours=rnd.randint(3, 36))).strftime(WARNING_TIME_FORMAT),
+                    }
+                )
+            area_groups.append(
+                {
+                    "areas": [{"id": f"lt.lhms.county:LT{i:03d}", "name": name} for i, name in enumerate(areas)],
+                    "single_alerts": alerts,
+                }
+            )
+        groups.append({"phenomenon_category": category, "area_groups": area_groups})
+    return {"phenomenon_groups": groups}
+
+
+def record_synthetic(seed=2024):
+    """Generate deterministic payloads in the shape of the real ones"""
+    rnd = random.Random(seed)
+    created = datetime(2026, 1, 1, 0, 0, 0)
+    code_counts = {}
+    places = [synthetic_place(rnd, code_counts) for _ in range(1900)]
+    stations = [synthetic_station(rnd, number) for number in range(110)]
+    save("places", places)
+    save("forecast", synthetic_forecast(rnd, places[0], created))
+    save("hydro_stations", stations)
+    save("hydro_observations", synthetic_hydro_observations(rnd, stations[0], created))
+    save("warnings", synthetic_warnings(rnd, created))
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", action="store_true", help="generate payloads offline instead of downloading")
+    args = parser.parse_args()
+    if args.synthetic:
+        record_synthetic()
+    else:
+        asyncio.run(record_live())
+
+
+if __name__ == "__main__":
+    main()
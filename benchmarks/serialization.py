@@ -0,0 +1,79 @@
+"""Size and speed of binary serialization against pickle and JSON
+
+JSON is the API payload decoded with from_dict, which is what a worker does
+without a shared cache.
+
+Usage:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rounds 50
+"""
+
+import argparse
+import json
+import pickle
+import time
+from typing import Callable, Dict, Tuple
+
+from meteo_lt.client import _build_hydro_observation_data
+from meteo_lt.models import Forecast, HydroObservationData, Place
+
+from .fixtures import Fixtures
+from .harness import format_time, percentile
+
+
+def _formats(model_cls, model, payload) -> Dict[str, Tuple[Callable, Callable]]:
+    return {
+        "to_bytes": (model.to_bytes, model_cls.from_bytes),
+        "pickle": (lambda: pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        "json": (lambda: json.dumps(payload).encode(), payload_decoder(model_cls)),
+    }
+
+
+def payload_decoder(model_cls) -> Callable:
+    """Decode an API payload into model_cls the way the client does"""
+    if model_cls is HydroObservationData:
+        return lambda data: _build_hydro_observation_data(json.loads(data))
+    return lambda data: model_cls.from_dict(json.loads(data))
+
+
+def _median_time(func: Callable, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return percentile(timings, 0.5)
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200, help="measurements per format")
+    args = parser.parse_args()
+
+    fixtures = Fixtures()
+    models = {
+        "place": (Place, Place.from_dict(fixtures.places[0]), fixtures.places[0]),
+        "forecast": (Forecast, Forecast.from_dict(fixtures.forecast), fixtures.forecast),
+        "hydro_observations": (
+            HydroObservationData,
+            _build_hydro_observation_data(fixtures.hydro_observations),
+            fixtures.hydro_observations,
+        ),
+    }
+
+    print(f"{'model':<20}{'format':<10}{'bytes':>10}{'dumps':>12}{'loads':>12}")
+    for name, (model_cls, model, payload) in models.items():
+        for format_name, (dumps, loads) in _formats(model_cls, model, payload).items():
+            data = dumps()
+            dumps_time = _median_time(dumps, args.rounds)
+            loads_time = _median_time(lambda: loads(data), args.rounds)  # pylint: disable=cell-var-from-loop
+            print(
+                f"{name:<20}{format_name:<10}{len(data):>10,}"
+                f"{format_time(dumps_time):>12}{format_time(loads_time):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Local stand-in for api.meteo.lt and the warnings endpoint serving recorded payloads
+
+Usage:
+    python -m benchmarks.stub_server --port 8080 --latency 0.05 --jitter 0.02 --error-rate 0.01 --rate-limit 200
+
+Then point the client at it:
+    MeteoLtAPI(base_url="http://127.0.0.1:8080/v1", warnings_url="http://127.0.0.1:8080/warnings/list")
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from aiohttp import web
+
+from .fixtures import Fixtures
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server"""
+
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # random extra seconds, uniform between 0 and jitter
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 500
+    rate_limit: Optional[float] = None  # requests per second before answering HTTP 429
+    burst: Optional[int] = None  # token bucket size, defaults to one second of requests
+    seed: Optional[int] = None
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class StubApi:
+    """aiohttp application serving recorded payloads with configurable latency, errors and throttling"""
+
+    def __init__(self, config: Optional[StubConfig] = None, fixtures: Optional[Fixtures] = None):
+        self.config = config or StubConfig()
+        self.stats = Counter()
+        self._random = random.Random(self.config.seed)
+        self._tokens = float(self._burst)
+        self._tokens_updated = time.monotonic()
+
+        fixtures = fixtures or Fixtures()
+        # Responses are encoded once, so server side work does not skew client measurements
+        self._places = _dumps(fixtures.places)
+        self._place_json = {place["code"]: _dumps(place) for place in fixtures.places}
+        forecast = dict(fixtures.forecast)
+        forecast.pop("place")
+        # Forecast for any place is {"place": <place>, <rest of the recorded forecast>}
+        self._forecast_tail = b"," + _dumps(forecast)[1:]
+        self._stations = _dumps(fixtures.hydro_stations)
+        self._station_json = {station["code"]: station for station in fixtures.hydro_stations}
+        self._observations = fixtures.hydro_observations
+        self._warnings = _dumps(fixtures.warnings)
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get("/v1/places", self._get_places)
+        self.app.router.add_get("/v1/places/{code}/forecasts/long-term", self._get_forecast)
+        self.app.router.add_get("/v1/hydro-stations", self._get_stations)
+        self.app.router.add_get("/v1/hydro-stations/{code}", self._get_station)
+        self.app.router.add_get("/v1/hydro-stations/{code}/observations/{type}/{date}", self._get_observations)
+        self.app.router.add_get("/warnings/list", self._get_warnings_list)
+        self.app.router.add_get("/warnings/latest", self._get_warnings)
+
+    @property
+    def _burst(self) -> int:
+        if self.config.burst is not None:
+            return self.config.burst
+        return max(1, int(self.config.rate_limit or 1))
+
+    def _take_token(self) -> bool:
+        """Token bucket refilled at rate_limit tokens per second"""
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._tokens_updated) * self.config.rate_limit)
+        self._tokens_updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.stats["requests"] += 1
+        if self.config.rate_limit and not self._take_token():
+            self.stats["429"] += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.config.error_rate:
+            self.stats["500"] += 1
+            return web.Response(status=500, text="Stub server error")
+
+        response = await handler(request)
+        self.stats[str(response.status)] += 1
+        return response
+
+    @staticmethod
+    def _json(body: bytes) -> web.Response:
+        return web.Response(body=body, content_type=JSON_CONTENT_TYPE, charset="utf-8")
+
+    async def _get_places(self, _: web.Request) -> web.Response:
+        return self._json(self._places)
+
+    async def _get_forecast(self, request: web.Request) -> web.Response:
+        place = self._place_json.get(request.match_info["code"])
+        if place is None:
+            raise web.HTTPNotFound()
+        return self._json(b'{"place":' + place + self._forecast_tail)
+
+    async def _get_stations(self, _: web.Request) -> web.Response:
+        return self._json(self._stations)
+
+    async def _get_station(self, request: web.Request) -> web.Response:
+        station = self._station_json.get(request.match_info["code"])
+        if station is None:
+            raise web.HTTPNotFound()
+        return self._json(_dumps(station))
+
+    async def _get_observations(self, request: web.Request) -> web.Response:
+        station = self._station_json.get(request.match_info["code"])
+        if station is None:
+            raise web.HTTPNotFound()
+        return self._json(_dumps({**self._observations, "station": station}))
+
+    async def _get_warnings_list(self, request: web.Request) -> web.Response:
+        return self._json(_dumps([str(request.url.with_path("/warnings/latest").with_query(None))]))
+
+    async def _get_warnings(self, _: web.Request) -> web.Response:
+        # The real endpoint serves warnings files as text
+        return web.Response(body=self._warnings, content_type="text/plain", charset="utf-8")
+
+
+class StubServer:
+    """Runs StubApi on a local port inside the current event loop
+
+    async with StubServer(StubConfig(latency=0.05)) as server:
+        api = MeteoLtAPI(base_url=server.base_url, warnings_url=server.warnings_url)
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.stub = StubApi(config)
+        self.host = host
+        self.port = port
+        self._runner = web.AppRunner(self.stub.app, access_log=None)
+
+    @property
+    def base_url(self) -> str:
+        """Value for MeteoLtAPI base_url"""
+        return f"http://{self.host}:{self.port}/v1"
+
+    @property
+    def warnings_url(self) -> str:
+        """Value for MeteoLtAPI warnings_url"""
+        return f"http://{self.host}:{self.port}/warnings/list"
+
+    async def __aenter__(self):
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._runner.cleanup()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Command line options for StubConfig"""
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds up to this value")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit", type=float, help="requests per second before HTTP 429")
+    parser.add_argument("--burst", type=int, help="requests allowed at once above the rate limit")
+    parser.add_argument("--seed", type=int, help="random seed for jitter and errors")
+
+
+def config_from_arguments(args: argparse.Namespace) -> StubConfig:
+    """StubConfig from parsed add_config_arguments options"""
+    return StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(StubApi(config_from_arguments(args)).app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,54 @@
-"""init.py"""
-
-from .api import MeteoLtAPI
-from .models import (
-    Coordinates,
-    LocationBase,
-    Place,
-    ForecastTimestamp,
-    Forecast,
-    WeatherWarning,
-    HydroStation,
-    HydroObservation,
-    HydroObservationData,
-)
-
-__all__ = [
-    "MeteoLtAPI",
-    "Coordinates",
-    "LocationBase",
-    "Place",
-    "ForecastTimestamp",
-    "Forecast",
-    "WeatherWarning",
-    "HydroStation",
-    "HydroObservation",
-    "HydroObservationData",
-]
+"""init.py
+
+Exports are imported on first access, so using only models or utils
+does not pay for importing aiohttp and the API client.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "MeteoLtAPI": "api",
+    "MeteoLtSyncAPI": "sync",
+    "HydroObservationError": "api",
+    "Coordinates": "models",
+    "LocationBase": "models",
+    "Place": "models",
+    "ForecastTimestamp": "models",
+    "Forecast": "models",
+    "WeatherWarning": "models",
+    "HydroStation": "models",
+    "HydroObservation": "models",
+    "HydroObservationData": "models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .api import HydroObservationError, MeteoLtAPI  # noqa: F401
+    from .sync import MeteoLtSyncAPI  # noqa: F401
+    from .models import (  # noqa: F401
+        Coordinates,
+        LocationBase,
+        Place,
+        ForecastTimestamp,
+        Forecast,
+        WeatherWarning,
+        HydroStation,
+        HydroObservation,
+        HydroObservationData,
+    )
@@ -0,0 +1,150 @@
+"""Aggregates of forecasts of many places by region and time window
+
+Values of a field are first reduced over each time window for every place, e.g.
+precipitation summed over 24 hours, then combined across the places of a county
+or administrative division, e.g. averaged. Work is done on ForecastColumns
+arrays with built-in min, max and sum, missing values are skipped.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from statistics import fmean
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .columns import NUMERIC_FIELDS, ForecastColumns
+from .models import Forecast, Place
+
+FUNCTIONS: Dict[str, Callable[[Sequence[float]], float]] = {
+    "min": min,
+    "max": max,
+    "sum": math.fsum,
+    "mean": fmean,
+}
+
+# Place attributes giving the regions of a place
+GROUPINGS: Dict[str, Callable[[Place], Sequence[str]]] = {
+    "county": lambda place: place.counties,
+    "administrative_division": lambda place: (place.administrative_division,),
+}
+
+
+@dataclass
+class RegionAggregate:
+    """Values of a field per region and time window
+
+    starts are POSIX timestamps of window starts, windows are window seconds long.
+    Every region has one value per window, NaN when none of its places has values.
+    """
+
+    name: str
+    function: str
+    across: str
+    window: float
+    starts: array = field(default_factory=lambda: array("d"))
+    values: Dict[str, array] = field(default_factory=dict)  # region to values per window
+
+    def datetimes(self) -> List[str]:
+        """Window starts as ISO 8601 strings"""
+        return [datetime.fromtimestamp(start, timezone.utc).isoformat() for start in self.starts]
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Values by region and window start, windows without values are left out"""
+        starts = self.datetimes()
+        return {
+            region: {start: value for start, value in zip(starts, values) if not math.isnan(value)}
+            for region, values in self.values.items()
+        }
+
+
+def _apply(function: Callable[[Sequence[float]], float], values: Sequence[float]) -> float:
+    """Function of values without NaN, NaN when no values are left"""
+    # Sum is NaN only with NaN values, which are rare, so they are filtered only then
+    if math.isnan(sum(values)):
+        values = [value for value in values if not math.isnan(value)]
+    return function(values) if values else math.nan
+
+
+class ForecastAggregator:
+    """Forecasts of many places grouped by region for repeated aggregate queries
+
+    Forecasts are converted to ForecastColumns once. by is county, where places
+    in several counties count in each, or administrative_division.
+    """
+
+    def __init__(self, forecasts: Iterable[Forecast], by: str = "county"):
+        if by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping {by}, expected one of {', '.join(GROUPINGS)}")
+        self.by = by
+        self.columns: List[ForecastColumns] = []
+        self.regions: Dict[str, List[int]] = {}  # region to indexes of columns
+        for forecast in forecasts:
+            if forecast.place is None:
+                continue
+            for region in GROUPINGS[by](forecast.place):
+                self.regions.setdefault(region, []).append(len(self.columns))
+            self.columns.append(ForecastColumns.from_forecast(forecast))
+
+    def aggregate(
+        self,
+        name: str,
+        function: str = "mean",
+        across: str = "mean",
+        window: Union[timedelta, float] = timedelta(hours=24),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> RegionAggregate:
+        """Aggregate field name over time windows per region
+
+        function reduces the values of each place in a window and across combines
+        those of the places in a region, both are min, max, sum or mean. Windows
+        are window long (timedelta or seconds) from start, by default the earliest
+        timestamp, until end, by default after the latest timestamp.
+        """
+        if name not in NUMERIC_FIELDS:
+            raise ValueError(f"Unknown numeric field {name}")
+        for value in (function, across):
+            if value not in FUNCTIONS:
+                raise ValueError(f"Unknown function {value}, expected one of {', '.join(FUNCTIONS)}")
+        seconds = window.total_seconds() if isinstance(window, timedelta) else float(window)
+        if seconds <= 0:
+            raise ValueError("window must be positive")
+
+        result = RegionAggregate(name, function, across, seconds)
+        times = [columns.times for columns in self.columns if len(columns)]
+        if not times:
+            return result
+        first = start.timestamp() if start is not None else min(place_times[0] for place_times in times)
+        last = end.timestamp() if end is not None else max(place_times[-1] for place_times in times) + 1
+        count = max(0, math.ceil((last - first) / seconds))
+        result.starts = array("d", (first + index * seconds for index in range(count)))
+        edges = list(result.starts) + [min(first + count * seconds, last)]
+
+        reduce = FUNCTIONS[function]
+        per_place = []
+        for columns in self.columns:
+            values = columns.columns[name]
+            bounds = [bisect_left(columns.times, edge) for edge in edges]
+            per_place.append([_apply(reduce, values[low:high]) for low, high in zip(bounds, bounds[1:])])
+
+        combine = FUNCTIONS[across]
+        for region, indexes in self.regions.items():
+            windows = zip(*(per_place[index] for index in indexes))
+            result.values[region] = array("d", (_apply(combine, values) for values in windows))
+        return result
+
+
+def aggregate_forecasts(
+    forecasts: Iterable[Forecast],
+    name: str,
+    function: str = "mean",
+    across: str = "mean",
+    by: str = "county",
+    window: Union[timedelta, float] = timedelta(hours=24),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> RegionAggregate:
+    """Aggregate field name of forecasts per region and time window, see ForecastAggregator.aggregate"""
+    return ForecastAggregator(forecasts, by).aggregate(name, function, across, window, start, end)
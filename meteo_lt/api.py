@@ -1,6 +1,10 @@
 """Main API class script"""
 
-from typing import List, Optional
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterable, List, Optional, Union
 
 from .models import (
     Forecast,
@@ -9,18 +13,64 @@ from .models import (
     HydroStation,
     HydroObservationData,
 )
-from .utils import find_nearest_location
+from .grid import PlaceGrid
+from .index import HydroStationIndex, NearestCache, PlaceIndex
 from .client import MeteoLtClient
-from .warnings import WeatherWarningsProcessor
+from .warnings import WarningsSnapshot, WeatherWarningsProcessor
+from .watcher import WarningsWatcher
+from .metrics import ClientMetrics
+from .replay import TrafficArchive
+from .tracing import NOOP_TRACER, traced
+from .const import (
+    BASE_URL,
+    WARNINGS_URL,
+    GRID_CELL_SIZE,
+    HYDRO_CONCURRENCY,
+    HYDRO_STATIONS_TTL,
+    NEAREST_CACHE_SIZE,
+    NEAREST_CELL_SIZE,
+    WARNINGS_POLL_INTERVAL,
+)
+
+
+class HydroObservationError(Exception):
+    """Failed observation data request of a station, the original error is the cause"""
+
+    def __init__(self, station_code: str, error: Exception):
+        super().__init__(f"Observation data of station {station_code} failed: {error!r}")
+        self.station_code = station_code
+        self.error = error
 
 
 class MeteoLtAPI:
     """Main API class that orchestrates external API calls and warning processing"""
 
-    def __init__(self, session=None):
+    def __init__(
+        self,
+        session=None,
+        hydro_stations_ttl: Optional[float] = HYDRO_STATIONS_TTL,
+        base_url: str = BASE_URL,
+        warnings_url: str = WARNINGS_URL,
+        metrics: Optional[ClientMetrics] = None,
+        tracer=None,
+        executor: Optional[Executor] = None,
+        nearest_cell_size: Optional[float] = NEAREST_CELL_SIZE,
+        nearest_cache_size: int = NEAREST_CACHE_SIZE,
+        record: Optional[TrafficArchive] = None,
+        replay: Optional[TrafficArchive] = None,
+    ):
+        # Nearest place cache is rebuilt with the places, None cell size disables it
+        self.nearest_cell_size = nearest_cell_size
+        self.nearest_cache_size = nearest_cache_size
         self.places = []
-        self.client = MeteoLtClient(session)
-        self.warnings_processor = WeatherWarningsProcessor(self.client)
+        self.hydro_stations_ttl = hydro_stations_ttl
+        self.hydro_stations = []
+        # Concurrent callers missing a cache wait for one download
+        self._places_lock = asyncio.Lock()
+        self._hydro_stations_lock = asyncio.Lock()
+        self.tracer = tracer or NOOP_TRACER
+        self.client = MeteoLtClient(session, base_url, warnings_url, metrics, self.tracer, executor, record, replay)
+        self.warnings_processor = WeatherWarningsProcessor(self.client, self.tracer)
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -36,20 +86,104 @@ class MeteoLtAPI:
         """Async context manager exit"""
         await self.client.__aexit__(exc_type, exc_val, exc_tb)
 
+    @property
+    def places(self) -> List[Place]:
+        """Cached places"""
+        return self.place_index.locations
+
+    @places.setter
+    def places(self, places: List[Place]) -> None:
+        self.place_index = PlaceIndex(places)
+        # Grids are built for one set of places
+        self.place_grid: Optional[PlaceGrid] = None
+        self.nearest_place_cache = None
+        if self.nearest_cell_size is not None:
+            self.nearest_place_cache = NearestCache(self.place_index, self.nearest_cell_size, self.nearest_cache_size)
+
+    @property
+    def hydro_stations(self) -> List[HydroStation]:
+        """Cached hydrological stations"""
+        return self.hydro_station_index.locations
+
+    @hydro_stations.setter
+    def hydro_stations(self, stations: List[HydroStation]) -> None:
+        self.hydro_station_index = HydroStationIndex(stations)
+        self._hydro_stations_updated = time.monotonic()
+
     async def close(self):
         """Close the API client and cleanup resources"""
         await self.client.close()
 
+    @traced("meteo_lt.fetch_places")
     async def fetch_places(self) -> None:
         """Gets all places from API"""
         self.places = await self.client.fetch_places()
 
+    async def _ensure_places(self) -> None:
+        """Fetch places unless they are cached, once for concurrent callers"""
+        if not self.places:
+            async with self._places_lock:
+                if not self.places:
+                    self._record_cache("places", False)
+                    await self.fetch_places()
+                    return
+        self._record_cache("places", True)
+
+    def _record_cache(self, cache: str, hit: bool) -> None:
+        if self.client.metrics is not None:
+            self.client.metrics.record_cache(cache, hit)
+
+    @traced("meteo_lt.get_nearest_place")
     async def get_nearest_place(self, latitude: float, longitude: float) -> Optional[Place]:
         """Finds nearest place using provided coordinates"""
-        if not self.places:
-            await self.fetch_places()
-        return find_nearest_location(latitude, longitude, self.places)
+        await self._ensure_places()
+        if self.place_grid is not None:
+            return self.place_grid.nearest(latitude, longitude)
+        if self.nearest_place_cache is None:
+            return self.place_index.nearest(latitude, longitude)
+        place, hit = self.nearest_place_cache.lookup(latitude, longitude)
+        self._record_cache("nearest_place", hit)
+        return place
+
+    async def build_place_grid(self, path: Optional[str] = None, cell_size: float = GRID_CELL_SIZE) -> PlaceGrid:
+        """Build a nearest place grid over Lithuania used by get_nearest_place
+
+        Building takes seconds, so it runs in the default executor. With path the
+        grid is saved there for load_place_grid. Fetching places again drops the grid.
+        """
+        await self._ensure_places()
+        loop = asyncio.get_running_loop()
+        grid = await loop.run_in_executor(None, functools.partial(PlaceGrid.build, self.places, cell_size=cell_size))
+        if path is not None:
+            await loop.run_in_executor(None, grid.save, path)
+        self.place_grid = grid
+        return grid
 
+    async def load_place_grid(self, path: str) -> PlaceGrid:
+        """Load a nearest place grid saved by build_place_grid for the current places
+
+        Reading and checking the file runs in the default executor. Raises ValueError
+        when the grid was built for other places.
+        """
+        await self._ensure_places()
+        places = self.places
+        grid = await asyncio.get_running_loop().run_in_executor(None, PlaceGrid.load, path, places)
+        # Places fetched again meanwhile drop grids of the previous ones
+        if self.places is places:
+            self.place_grid = grid
+        return grid
+
+    async def get_place(self, place_code: str) -> Optional[Place]:
+        """Finds place by its code"""
+        await self._ensure_places()
+        return self.place_index.get(place_code)
+
+    async def search_places(self, name_prefix: str, limit: Optional[int] = 10) -> List[Place]:
+        """Finds places by name prefix ignoring case and diacritics"""
+        await self._ensure_places()
+        return self.place_index.search(name_prefix, limit)
+
+    @traced("meteo_lt.get_forecast_with_warnings")
     async def get_forecast_with_warnings(
         self,
         latitude: Optional[float] = None,
@@ -65,8 +199,14 @@ class MeteoLtAPI:
 
         return await self.get_forecast(place_code, include_warnings=True)
 
+    @traced("meteo_lt.get_forecast")
     async def get_forecast(self, place_code: str, include_warnings: bool = True) -> Forecast:
         """Retrieves forecast data from API"""
+        if include_warnings and self.client.executor is not None:
+            # Warnings are fetched first, so they are attached in the same executor call that builds the forecast
+            warnings = await self.get_weather_warnings()
+            return await self.client.fetch_forecast(place_code, warnings)
+
         forecast = await self.client.fetch_forecast(place_code)
 
         if include_warnings:
@@ -78,6 +218,30 @@ class MeteoLtAPI:
         """Fetches weather warnings from meteo.lt JSON API"""
         return await self.warnings_processor.get_weather_warnings(administrative_division)
 
+    async def get_warnings_snapshot(self) -> WarningsSnapshot:
+        """Fetches meteorological and hydrological warnings with a single download"""
+        return await self.warnings_processor.get_warnings_snapshot()
+
+    def watch_warnings(self, interval: float = WARNINGS_POLL_INTERVAL, emit_initial: bool = True) -> WarningsWatcher:
+        """Watcher emitting added, removed and changed warnings when a new warnings file appears"""
+        return WarningsWatcher(self.warnings_processor, interval, emit_initial)
+
+    async def get_hydro_warnings(self, station_code: Optional[str] = None) -> List[WeatherWarning]:
+        """Fetches hydrological warnings, optionally only those around a station
+
+        Unknown station codes give no warnings.
+        """
+        snapshot = await self.get_warnings_snapshot()
+        if station_code is None:
+            return snapshot.hydrological
+
+        station = await self.get_hydro_station(station_code)
+        if station is None:
+            return []
+        await self._ensure_places()
+        return snapshot.hydrological_for_station(station, self.place_index)
+
+    @traced("meteo_lt.enrich_forecast_with_warnings")
     async def _enrich_forecast_with_warnings(self, forecast: Forecast) -> None:
         """Enrich forecast timestamps with relevant weather warnings"""
         if not forecast or not forecast.place or not forecast.place.administrative_division:
@@ -88,17 +252,49 @@ class MeteoLtAPI:
         if warnings:
             self.warnings_processor.enrich_forecast_with_warnings(forecast, warnings)
 
+    @traced("meteo_lt.fetch_hydro_stations")
+    async def fetch_hydro_stations(self) -> None:
+        """Gets all hydrological stations from API"""
+        self.hydro_stations = await self.client.fetch_hydro_stations()
+
+    def _hydro_stations_cached(self) -> bool:
+        expired = (
+            self.hydro_stations_ttl is not None
+            and time.monotonic() - self._hydro_stations_updated > self.hydro_stations_ttl
+        )
+        return bool(self.hydro_stations) and not expired
+
     async def get_hydro_stations(self) -> List[HydroStation]:
-        """Get list of all hydrological stations"""
-        return await self.client.fetch_hydro_stations()
+        """Get list of all hydrological stations, downloading it when missing or expired
+
+        Concurrent callers wait for one download.
+        """
+        if not self._hydro_stations_cached():
+            async with self._hydro_stations_lock:
+                if not self._hydro_stations_cached():
+                    self._record_cache("hydro_stations", False)
+                    await self.fetch_hydro_stations()
+                    return self.hydro_stations
+        self._record_cache("hydro_stations", True)
+        return self.hydro_stations
+
+    async def get_hydro_station(self, station_code: str) -> Optional[HydroStation]:
+        """Find a hydrological station by its code"""
+        await self.get_hydro_stations()
+        return self.hydro_station_index.get(station_code)
+
+    async def get_hydro_stations_by_water_body(self, water_body: str) -> List[HydroStation]:
+        """Get all hydrological stations on a water body"""
+        await self.get_hydro_stations()
+        return self.hydro_station_index.for_water_body(water_body)
 
+    @traced("meteo_lt.get_nearest_hydro_station")
     async def get_nearest_hydro_station(self, latitude: float, longitude: float) -> Optional[HydroStation]:
         """Find the nearest hydrological station to given coordinates"""
-        stations = await self.get_hydro_stations()
-        if not stations:
-            return None
-        return find_nearest_location(latitude, longitude, stations)
+        await self.get_hydro_stations()
+        return self.hydro_station_index.nearest(latitude, longitude)
 
+    @traced("meteo_lt.get_hydro_observation_data")
     async def get_hydro_observation_data(
         self,
         station_code: str,
@@ -107,3 +303,51 @@ class MeteoLtAPI:
     ) -> HydroObservationData:
         """Get hydrological observation data for a station"""
         return await self.client.fetch_hydro_observation_data(station_code, observation_type, date)
+
+    async def iter_hydro_observation_data(
+        self,
+        station_codes: Optional[Iterable[str]] = None,
+        observation_type: str = "measured",
+        date: str = "latest",
+        max_concurrency: int = HYDRO_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Union[HydroObservationData, HydroObservationError]]:
+        """Yield observation data for many stations as responses arrive
+
+        All cached stations are used when no station codes are given. At most
+        max_concurrency requests are in flight at once. With return_exceptions
+        failed stations are yielded as HydroObservationError with the station code
+        instead of stopping the stream.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        if station_codes is None:
+            station_codes = [station.code for station in await self.get_hydro_stations()]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(station_code: str) -> HydroObservationData:
+            async with semaphore:
+                try:
+                    return await self.client.fetch_hydro_observation_data(station_code, observation_type, date)
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    # Results arrive in completion order, the station code tells which one failed
+                    raise HydroObservationError(station_code, exc) from exc
+
+        tasks = [asyncio.ensure_future(fetch(station_code)) for station_code in station_codes]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    yield await next_done
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    if not return_exceptions:
+                        raise
+                    yield exc
+        finally:
+            # Consumer stopped early or a request failed - do not leave requests behind
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
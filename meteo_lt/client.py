@@ -1,7 +1,11 @@
 """MeteoLt API client for external API calls"""
 
+import asyncio
+import functools
 import json
-from typing import List, Optional, Dict, Any
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 
@@ -11,20 +15,49 @@ from .models import (
     HydroStation,
     HydroObservationData,
     HydroObservation,
+    WeatherWarning,
 )
+from .warnings import enrich_forecast_for_place
 from .const import BASE_URL, WARNINGS_URL, TIMEOUT, ENCODING
+from .metrics import ClientMetrics, RequestSample
+from .replay import RecordedResponse, TrafficArchive
+from .tracing import NOOP_TRACER
 
 
 class MeteoLtClient:
-    """Client for external API calls to meteo.lt"""
+    """Client for external API calls to meteo.lt
 
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+    With an executor, response bodies are decoded and models built in it, so a
+    process pool keeps CPU heavy bulk downloads off the event loop.
+
+    Responses are added to a record archive as received, failed ones included.
+    With a replay archive they are served from it and no session is used.
+    """
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        base_url: str = BASE_URL,
+        warnings_url: str = WARNINGS_URL,
+        metrics: Optional[ClientMetrics] = None,
+        tracer=None,
+        executor: Optional[Executor] = None,
+        record: Optional[TrafficArchive] = None,
+        replay: Optional[TrafficArchive] = None,
+    ):
         self._session = session
         self._owns_session = session is None
+        self.base_url = base_url
+        self.warnings_url = warnings_url
+        self.metrics = metrics
+        self.tracer = tracer or NOOP_TRACER
+        self.executor = executor
+        self.record = record
+        self.replay = replay
 
     async def __aenter__(self):
         """Async context manager entry"""
-        if self._session is None:
+        if self._session is None and self.replay is None:
             self._session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=TIMEOUT),
                 raise_for_status=True,
@@ -55,61 +88,113 @@ class MeteoLtClient:
             )
         return self._session
 
+    async def _fetch(
+        self,
+        endpoint: str,
+        url: str,
+        build: Optional[Callable[[Any], Any]] = None,
+        check_status: bool = False,
+    ) -> Any:
+        """GET url, decode its JSON body and build models from it, recording metrics for endpoint"""
+        sample = RequestSample(endpoint=endpoint, url=url)
+        started = time.perf_counter()
+        attributes = {"http.request.method": "GET", "url.full": url, "meteo_lt.endpoint": endpoint}
+        with self.tracer.start_as_current_span(f"GET {endpoint}", attributes=attributes) as span:
+            try:
+                if self.replay is not None:
+                    recorded = await self.replay.replay(url)
+                    span.set_attribute("http.response.status_code", recorded.status)
+                    recorded.raise_for_status()
+                    status, body = recorded.status, recorded.body
+                else:
+                    status, body = await self._get(endpoint, url, started)
+                    span.set_attribute("http.response.status_code", status)
+                if check_status and status != 200:
+                    raise aiohttp.ClientError(f"API returned status {status}")
+                sample.size = len(body)
+                sample.network = time.perf_counter() - started
+                span.set_attribute("http.response.body.size", sample.size)
+
+                if self.executor is None:
+                    result, sample.decode, sample.build = _decode(body, build)
+                else:
+                    result, sample.decode, sample.build = await asyncio.get_running_loop().run_in_executor(
+                        self.executor, _decode, body, build
+                    )
+                return result
+            except Exception as exc:
+                sample.error = exc
+                raise
+            finally:
+                if self.metrics is not None:
+                    self.metrics.record_request(sample)
+
+    async def _get(self, endpoint: str, url: str, started: float) -> Tuple[int, bytes]:
+        """Status and body of a GET request, added to the record archive failed or not"""
+        session = await self._get_session()
+        try:
+            async with session.get(url) as response:
+                status = response.status
+                body = await response.read()
+                headers = list(response.headers.items()) if self.record is not None else []
+        except aiohttp.ClientResponseError as exc:
+            if self.record is not None:
+                headers = list(exc.headers.items()) if exc.headers else []
+                network = time.perf_counter() - started
+                self.record.add(RecordedResponse(endpoint, url, exc.status, headers, b"", network, exc.message))
+            raise
+        if self.record is not None:
+            self.record.add(RecordedResponse(endpoint, url, status, headers, body, time.perf_counter() - started))
+        return status, body
+
     async def fetch_places(self) -> List[Place]:
         """Gets all places from API"""
-        session = await self._get_session()
-        async with session.get(f"{BASE_URL}/places") as response:
-            response.encoding = ENCODING
-            response_json = await response.json()
-            return [Place.from_dict(place) for place in response_json]
+        return await self._fetch("places", f"{self.base_url}/places", _build_places)
 
-    async def fetch_forecast(self, place_code: str) -> Forecast:
-        """Retrieves forecast data from API"""
-        session = await self._get_session()
-        async with session.get(f"{BASE_URL}/places/{place_code}/forecasts/long-term") as response:
-            response.encoding = ENCODING
-            response_json = await response.json()
-            return Forecast.from_dict(response_json)
+    async def fetch_forecast(self, place_code: str, warnings: Optional[List[WeatherWarning]] = None) -> Forecast:
+        """Retrieves forecast data from API
+
+        Warnings affecting the forecast place are attached while building the forecast.
+        """
+        build = Forecast.from_dict
+        if warnings:
+            build = functools.partial(_build_forecast_with_warnings, warnings=warnings)
+        return await self._fetch("forecast", f"{self.base_url}/places/{place_code}/forecasts/long-term", build)
 
     async def fetch_weather_warnings(self) -> Dict[str, Any]:
         """Fetches raw weather warnings data from meteo.lt JSON API"""
-        session = await self._get_session()
-
         # Get the latest warnings file
-        async with session.get(WARNINGS_URL) as response:
-            file_list = await response.json()
+        file_list = await self.fetch_warnings_file_list()
 
         if not file_list:
             return []
 
         # Fetch the latest warnings data
         latest_file_url = file_list[0]  # First file is the most recent
-        async with session.get(latest_file_url) as response:
-            text_data = await response.text()
-            return json.loads(text_data)
+        return await self.fetch_warnings_file(latest_file_url)
+
+    async def fetch_warnings_file_list(self) -> List[str]:
+        """Fetches URLs of warnings files, the most recent first"""
+        return await self._fetch("warnings_list", self.warnings_url)
+
+    async def fetch_warnings_file(self, url: str) -> Dict[str, Any]:
+        """Fetches raw weather warnings data from a warnings file"""
+        return await self._fetch("warnings", url)
 
     async def fetch_hydro_stations(self) -> List[HydroStation]:
         """Get list of all hydrological stations."""
-        session = await self._get_session()
-        async with session.get(f"{BASE_URL}/hydro-stations") as resp:
-            if resp.status == 200:
-                resp.encoding = ENCODING
-                response = await resp.json()
-                stations = []
-                for station_data in response:
-                    stations.append(HydroStation.from_dict(station_data))
-                return stations
-            raise aiohttp.ClientError(f"API returned status {resp.status}")
+        return await self._fetch(
+            "hydro_stations", f"{self.base_url}/hydro-stations", _build_hydro_stations, check_status=True
+        )
 
     async def fetch_hydro_station(self, station_code: str) -> HydroStation:
         """Get information about a specific hydrological station."""
-        session = await self._get_session()
-        async with session.get(f"{BASE_URL}/hydro-stations/{station_code}") as resp:
-            if resp.status == 200:
-                resp.encoding = ENCODING
-                response = await resp.json()
-                return HydroStation.from_dict(response)
-            raise aiohttp.ClientError(f"API returned status {resp.status}")
+        return await self._fetch(
+            "hydro_station",
+            f"{self.base_url}/hydro-stations/{station_code}",
+            HydroStation.from_dict,
+            check_status=True,
+        )
 
     async def fetch_hydro_observation_data(
         self,
@@ -118,21 +203,39 @@ class MeteoLtClient:
         date: str = "latest",
     ) -> HydroObservationData:
         """Get hydrological observation data for a station."""
-        session = await self._get_session()
-        async with session.get(
-            f"{BASE_URL}/hydro-stations/{station_code}/observations/{observation_type}/{date}"
-        ) as resp:
-            if resp.status == 200:
-                response = await resp.json()
-                station = HydroStation.from_dict(response.get("station"))
-
-                observations = []
-                for obs_data in response.get("observations", []):
-                    observations.append(HydroObservation.from_dict(obs_data))
-
-                return HydroObservationData(
-                    station=station,
-                    observations_data_range=response.get("observationsDataRange"),
-                    observations=observations,
-                )
-            raise aiohttp.ClientError(f"API returned status {resp.status}")
+        return await self._fetch(
+            "hydro_observations",
+            f"{self.base_url}/hydro-stations/{station_code}/observations/{observation_type}/{date}",
+            _build_hydro_observation_data,
+            check_status=True,
+        )
+
+
+def _decode(body: bytes, build: Optional[Callable[[Any], Any]]) -> Tuple[Any, float, float]:
+    """Decoded and built response body with seconds spent decoding and building"""
+    started = time.perf_counter()
+    result = json.loads(body.decode(ENCODING))
+    decoded = time.perf_counter()
+    if build is not None:
+        result = build(result)
+    return result, decoded - started, time.perf_counter() - decoded
+
+
+def _build_forecast_with_warnings(response: Dict[str, Any], warnings: List[WeatherWarning]) -> Forecast:
+    return enrich_forecast_for_place(Forecast.from_dict(response), warnings)
+
+
+def _build_places(response: List[Dict[str, Any]]) -> List[Place]:
+    return [Place.from_dict(place) for place in response]
+
+
+def _build_hydro_stations(response: List[Dict[str, Any]]) -> List[HydroStation]:
+    return [HydroStation.from_dict(station_data) for station_data in response]
+
+
+def _build_hydro_observation_data(response: Dict[str, Any]) -> HydroObservationData:
+    return HydroObservationData(
+        station=HydroStation.from_dict(response.get("station")),
+        observations_data_range=response.get("observationsDataRange"),
+        observations=[HydroObservation.from_dict(obs_data) for obs_data in response.get("observations", [])],
+    )
@@ -0,0 +1,77 @@
+"""Columnar forecast values
+
+ForecastColumns keeps forecast timestamps as one array of doubles per field,
+which is compact and cheap to compare for many places.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from .models import Forecast
+
+# ForecastTimestamp fields stored as float columns
+NUMERIC_FIELDS = (
+    "temperature",
+    "apparent_temperature",
+    "wind_speed",
+    "wind_gust_speed",
+    "wind_bearing",
+    "cloud_coverage",
+    "pressure",
+    "humidity",
+    "precipitation",
+)
+
+
+def to_posix(value: Optional[str]) -> float:
+    """POSIX timestamp of an ISO 8601 time, UTC when it has no offset, NaN for None"""
+    if value is None:
+        return math.nan
+    parsed = datetime.fromisoformat(value)
+    return (parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+
+
+@lru_cache(maxsize=1024)
+def from_posix(value: float) -> Optional[str]:
+    """UTC ISO 8601 time of a POSIX timestamp, None for NaN, forecasts of all places share the same times"""
+    return None if math.isnan(value) else datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+@dataclass
+class ForecastColumns:
+    """Forecast timestamps of a place as columns
+
+    times are POSIX timestamps, missing numeric values are NaN.
+    """
+
+    place_code: Optional[str]
+    forecast_created: str
+    times: array = field(default_factory=lambda: array("d"))
+    columns: Dict[str, array] = field(default_factory=lambda: {name: array("d") for name in NUMERIC_FIELDS})
+    condition_codes: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_forecast(cls, forecast: Forecast) -> "ForecastColumns":
+        """Columns of forecast timestamps"""
+        timestamps = forecast.forecast_timestamps
+        return cls(
+            place_code=forecast.place.code if forecast.place else None,
+            forecast_created=forecast.forecast_created,
+            times=array("d", (datetime.fromisoformat(timestamp.datetime).timestamp() for timestamp in timestamps)),
+            columns={
+                name: array("d", (_to_float(getattr(timestamp, name)) for timestamp in timestamps))
+                for name in NUMERIC_FIELDS
+            },
+            condition_codes=[timestamp.condition_code for timestamp in timestamps],
+        )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+
+def _to_float(value) -> float:
+    return math.nan if value is None else float(value)
@@ -4,6 +4,20 @@ BASE_URL = "https://api.meteo.lt/v1"
 WARNINGS_URL = "https://www.meteo.lt/app/mu-plugins/Meteo/Components/" "WeatherWarningsNew/list_JSON.php"
 TIMEOUT = 30
 ENCODING = "utf-8"
+# Maximum number of simultaneous requests for bulk hydro observations
+HYDRO_CONCURRENCY = 8
+# Seconds to keep hydro stations list before downloading it again
+HYDRO_STATIONS_TTL = 24 * 60 * 60
+# Seconds between checks of the warnings list for a new warnings file
+WARNINGS_POLL_INTERVAL = 5 * 60
+# Degrees of quantized coordinate cells remembering their nearest place, about 550 m by 320 m in Lithuania
+NEAREST_CELL_SIZE = 0.005
+# Maximum number of cells remembered by the nearest place cache
+NEAREST_CACHE_SIZE = 4096
+# South, west, north and east edges of Lithuania with a margin, covered by nearest place grids
+LITHUANIA_BOUNDS = (53.85, 20.9, 56.5, 26.9)
+# Degrees of nearest place grid cells
+GRID_CELL_SIZE = 0.005
 
 # Define the county to administrative divisions mapping
 # https://www.infolex.lt/teise/DocumentSinglePart.aspx?AktoId=125125&StrNr=5#
@@ -0,0 +1,110 @@
+"""Differences between forecast runs of a place"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+from .models import Forecast
+from .columns import NUMERIC_FIELDS, ForecastColumns
+
+# Smallest difference of a field that counts as a change, fields not listed
+# here change on any difference
+DEFAULT_THRESHOLDS = {
+    "temperature": 0.5,  # °C
+    "apparent_temperature": 0.5,  # °C
+    "wind_speed": 1.0,  # m/s
+    "wind_gust_speed": 1.0,  # m/s
+    "wind_bearing": 20.0,  # degrees, compared around the circle
+    "cloud_coverage": 10.0,  # %
+    "pressure": 1.0,  # hPa
+    "humidity": 5.0,  # %
+    "precipitation": 0.1,  # mm
+}
+
+
+@dataclass
+class ForecastDiff:
+    """Timestamps whose values changed between two forecast runs
+
+    Timestamps are POSIX timestamps. Only timestamps present in both runs can
+    be changed, the others are added or removed.
+    """
+
+    changed: Dict[str, List[float]] = field(default_factory=dict)  # field name to changed timestamps
+    added: List[float] = field(default_factory=list)
+    removed: List[float] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.added or self.removed)
+
+    @property
+    def timestamps(self) -> List[float]:
+        """Sorted added timestamps and timestamps with any changed field"""
+        return sorted(set(self.added).union(*self.changed.values()))
+
+    def datetimes(self, name: Optional[str] = None) -> List[str]:
+        """Changed timestamps of field name, or all of timestamps, as ISO 8601 strings"""
+        times = self.timestamps if name is None else self.changed.get(name, [])
+        return [datetime.fromtimestamp(time, timezone.utc).isoformat() for time in times]
+
+
+def diff_forecasts(
+    old: Union[Forecast, ForecastColumns],
+    new: Union[Forecast, ForecastColumns],
+    thresholds: Optional[Dict[str, float]] = None,
+) -> ForecastDiff:
+    """Compare two forecasts of the same place field by field
+
+    thresholds override DEFAULT_THRESHOLDS per field. Keeping ForecastColumns of
+    the previous run instead of Forecast avoids converting it again.
+    """
+    if isinstance(old, Forecast):
+        old = ForecastColumns.from_forecast(old)
+    if isinstance(new, Forecast):
+        new = ForecastColumns.from_forecast(new)
+    if old.place_code != new.place_code:
+        raise ValueError(f"Cannot compare forecasts of {old.place_code} and {new.place_code}")
+    limits = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        limits.update(thresholds)
+
+    old_positions = {time: position for position, time in enumerate(old.times)}
+    pairs = []
+    diff = ForecastDiff()
+    for position, time in enumerate(new.times):
+        old_position = old_positions.pop(time, None)
+        if old_position is None:
+            diff.added.append(time)
+        else:
+            pairs.append((old_position, position))
+    diff.removed = sorted(old_positions)
+
+    for name in NUMERIC_FIELDS:
+        old_values, new_values = old.columns[name], new.columns[name]
+        limit = limits.get(name, 0.0)
+        circular = name == "wind_bearing"
+        changed = [
+            new.times[j]
+            for i, j in pairs
+            # Most values stay equal, skip the call for them
+            if old_values[i] != new_values[j] and _changed(old_values[i], new_values[j], limit, circular)
+        ]
+        if changed:
+            diff.changed[name] = changed
+
+    changed = [new.times[j] for i, j in pairs if old.condition_codes[i] != new.condition_codes[j]]
+    if changed:
+        diff.changed["condition_code"] = changed
+    return diff
+
+
+def _changed(old: float, new: float, limit: float, circular: bool) -> bool:
+    if math.isnan(old) or math.isnan(new):
+        return not (math.isnan(old) and math.isnan(new))
+    difference = abs(new - old)
+    if circular:
+        difference %= 360
+        difference = min(difference, 360 - difference)
+    # Any difference is a change with a zero limit
+    return difference >= limit if limit else difference > 0
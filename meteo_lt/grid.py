@@ -0,0 +1,255 @@
+"""Precomputed nearest place raster over a bounded region
+
+PlaceGrid divides a coordinate rectangle, Lithuania by default, into cells of
+equal size in degrees and keeps for every cell the places that can be nearest to
+some point of it. Most cells have a single such place, so a lookup is an array
+index, other cells compare distances to their few candidates. Points outside
+the rectangle are searched with find_nearest_location.
+
+Layout of saved grids version 1, all numbers little endian:
+
+    header      8s magic b"MTLTGRID", I version, d south, d west, d cell size, I rows,
+                I columns, I place count, I candidates length
+    places      per place: H code length, UTF-8 code, d latitude, d longitude
+    cells       I per cell row by row from south west: place index below place count,
+                otherwise place count plus offset of the cell in candidates
+    candidates  I candidate count followed by place indexes, for each offset
+"""
+
+import struct
+import sys
+from array import array
+from math import ceil, floor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .const import ENCODING, GRID_CELL_SIZE, LITHUANIA_BOUNDS
+from .models import Place
+from .utils import (
+    atomic_write,
+    chord_distance,
+    distance_chord,
+    find_nearest_location,
+    rectangle_radius,
+    squared_chord,
+    unit_vector,
+)
+
+MAGIC = b"MTLTGRID"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIdddIIII")
+_PLACE = struct.Struct("<dd")
+# Kilometers added to candidate distance limits, covers rounding of cell edges
+_TOLERANCE = 1e-6
+
+
+def _candidates(
+    vectors: List[Tuple[float, float, float]],
+    indexes: Sequence[int],
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+) -> List[int]:
+    """Indexes of places that can be nearest to some point of the rectangle
+
+    A place nearest to a point is at most twice the rectangle radius farther from
+    its center than the place nearest to the center. Order of indexes is kept.
+    """
+    center = unit_vector((south + north) / 2, (west + east) / 2)
+    squared = [squared_chord(center, vectors[index]) for index in indexes]
+    limit = chord_distance(min(squared)) + 2 * rectangle_radius(south, west, north, east) + _TOLERANCE
+    limit_squared = distance_chord(limit)
+    return [index for index, value in zip(indexes, squared) if value <= limit_squared]
+
+
+class PlaceGrid:
+    """Nearest place lookup through a precomputed raster of candidate places"""
+
+    def __init__(
+        self,
+        places: List[Place],
+        south: float,
+        west: float,
+        cell_size: float,
+        rows: int,
+        columns: int,
+        cells: array,
+        candidates: array,
+    ):
+        self.places = places
+        self.south = south
+        self.west = west
+        self.cell_size = cell_size
+        self.rows = rows
+        self.columns = columns
+        self.cells = cells
+        self.candidates = candidates
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """South, west, north and east edges of the grid"""
+        return (
+            self.south,
+            self.west,
+            self.south + self.rows * self.cell_size,
+            self.west + self.columns * self.cell_size,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        places: Iterable[Place],
+        bounds: Tuple[float, float, float, float] = LITHUANIA_BOUNDS,
+        cell_size: float = GRID_CELL_SIZE,
+    ) -> "PlaceGrid":
+        """Build the grid for places over bounds given as south, west, north and east edges
+
+        Blocks of cells are split in four until a single place can be nearest in a
+        block or the block is one cell, a block only checks the candidates of its parent.
+        Places without coordinates are left out.
+        """
+        places = [place for place in places if place.unit_vector is not None]
+        if not places:
+            raise ValueError("PlaceGrid needs at least one place with coordinates")
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        south, west, north, east = bounds
+        rows, columns = ceil((north - south) / cell_size), ceil((east - west) / cell_size)
+        if rows <= 0 or columns <= 0:
+            raise ValueError("bounds must have north above south and east above west")
+
+        vectors = [place.unit_vector for place in places]
+        cells = array("I", bytes(4 * rows * columns))
+        candidates = array("I")
+        offsets = {}
+        stack = [(0, rows, 0, columns, range(len(places)))]
+        while stack:
+            first_row, end_row, first_column, end_column, parent = stack.pop()
+            near = _candidates(
+                vectors,
+                parent,
+                south + first_row * cell_size,
+                west + first_column * cell_size,
+                south + end_row * cell_size,
+                west + end_column * cell_size,
+            )
+            if len(near) > 1 and (end_row - first_row > 1 or end_column - first_column > 1):
+                middle_row, middle_column = (first_row + end_row + 1) // 2, (first_column + end_column + 1) // 2
+                for row_range in ((first_row, middle_row), (middle_row, end_row)):
+                    for column_range in ((first_column, middle_column), (middle_column, end_column)):
+                        if row_range[0] < row_range[1] and column_range[0] < column_range[1]:
+                            stack.append((*row_range, *column_range, near))
+                continue
+
+            if len(near) == 1:
+                value = near[0]
+            else:
+                key = tuple(near)
+                if key not in offsets:
+                    offsets[key] = len(candidates)
+                    candidates.append(len(near))
+                    candidates.extend(near)
+                value = len(places) + offsets[key]
+            values = array("I", [value]) * (end_column - first_column)
+            for row in range(first_row, end_row):
+                cells[row * columns + first_column : row * columns + end_column] = values
+
+        return cls(places, south, west, cell_size, rows, columns, cells, candidates)
+
+    def nearest(self, latitude: float, longitude: float) -> Optional[Place]:
+        """Find the nearest place to the given coordinates"""
+        row = floor((latitude - self.south) / self.cell_size)
+        column = floor((longitude - self.west) / self.cell_size)
+        if not (0 <= row < self.rows and 0 <= column < self.columns):
+            return find_nearest_location(latitude, longitude, self.places)
+
+        value = self.cells[row * self.columns + column]
+        if value < len(self.places):
+            return self.places[value]
+
+        start = value - len(self.places) + 1
+        nearest_place = None
+        min_squared = float("inf")
+        vector = unit_vector(latitude, longitude)
+        for index in self.candidates[start : start + self.candidates[start - 1]]:
+            place = self.places[index]
+            squared = squared_chord(vector, place.unit_vector)
+            if squared < min_squared:
+                min_squared = squared
+                nearest_place = place
+        return nearest_place
+
+    def save(self, path: str) -> None:
+        """Write the grid to path, replacing an existing file atomically"""
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.south,
+            self.west,
+            self.cell_size,
+            self.rows,
+            self.columns,
+            len(self.places),
+            len(self.candidates),
+        )
+        places = []
+        for place in self.places:
+            code = place.code.encode(ENCODING)
+            places.append(struct.pack("<H", len(code)) + code + _PLACE.pack(place.latitude, place.longitude))
+        cells, candidates = self.cells, self.candidates
+        if sys.byteorder != "little":
+            cells, candidates = array("I", cells), array("I", candidates)
+            cells.byteswap()
+            candidates.byteswap()
+
+        with atomic_write(path, prefix=".grid-") as file:
+            file.write(header)
+            file.write(b"".join(places))
+            file.write(cells.tobytes())
+            file.write(candidates.tobytes())
+
+    @classmethod
+    def load(cls, path: str, places: Iterable[Place]) -> "PlaceGrid":
+        """Read a grid saved by save for the same places
+
+        Raises ValueError when the file is not a grid or was built for places with
+        other codes or coordinates.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        by_code = {place.code: place for place in places if place.unit_vector is not None}
+        try:
+            magic, version, south, west, cell_size, rows, columns, place_count, candidate_count = _HEADER.unpack_from(
+                data
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a place grid")
+            if version != VERSION:
+                raise ValueError(f"Unsupported place grid version {version}")
+
+            offset = _HEADER.size
+            grid_places = []
+            for _ in range(place_count):
+                (length,) = struct.unpack_from("<H", data, offset)
+                code = data[offset + 2 : offset + 2 + length].decode(ENCODING)
+                latitude, longitude = _PLACE.unpack_from(data, offset + 2 + length)
+                offset += 2 + length + _PLACE.size
+                place = by_code.get(code)
+                if place is None or (place.latitude, place.longitude) != (latitude, longitude):
+                    raise ValueError(f"Place grid {path} was built for other places")
+                grid_places.append(place)
+        except (struct.error, UnicodeDecodeError) as error:
+            raise ValueError(f"Invalid place grid {path}: {error}") from error
+        if len(by_code) != place_count:
+            raise ValueError(f"Place grid {path} was built for other places")
+
+        end = offset + 4 * (rows * columns + candidate_count)
+        if len(data) != end:
+            raise ValueError(f"Invalid place grid {path}: expected {end} bytes, got {len(data)}")
+        cells = array("I", data[offset : offset + 4 * rows * columns])
+        candidates = array("I", data[offset + 4 * rows * columns : end])
+        if sys.byteorder != "little":
+            cells.byteswap()
+            candidates.byteswap()
+        return cls(grid_places, south, west, cell_size, rows, columns, cells, candidates)
@@ -0,0 +1,236 @@
+"""In-memory indexes for places and hydrological stations"""
+
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from math import floor, radians
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .const import NEAREST_CACHE_SIZE, NEAREST_CELL_SIZE
+from .models import LocationBase, HydroStation, Place
+from .utils import chord_distance, rectangle_radius, squared_chord, unit_vector, EARTH_RADIUS
+
+
+def normalize_name(name: str) -> str:
+    """Lower case name with diacritics removed, e.g. Šiauliai becomes siauliai"""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class SpatialIndex:
+    """Exact nearest location lookup over locations sorted by latitude
+
+    Great-circle distance is never shorter than the distance along the meridian,
+    so the scan walks outwards from the query latitude and stops as soon as the
+    latitude difference alone is farther than the best match found. Locations
+    without coordinates are kept in locations but never found as nearest.
+    """
+
+    def __init__(self, locations: Iterable[LocationBase]):
+        self.locations = list(locations)
+        located = [location for location in self.locations if location.unit_vector is not None]
+        self._by_latitude = sorted(located, key=lambda location: location.latitude)
+        self._latitudes = [location.latitude for location in self._by_latitude]
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def _outwards(self, latitude: float) -> Iterator[Tuple[float, LocationBase]]:
+        """Locations by growing latitude difference from latitude, with the difference in km"""
+        right = bisect_left(self._latitudes, latitude)
+        left = right - 1
+        while left >= 0 or right < len(self._latitudes):
+            left_gap = latitude - self._latitudes[left] if left >= 0 else float("inf")
+            right_gap = self._latitudes[right] - latitude if right < len(self._latitudes) else float("inf")
+            if left_gap <= right_gap:
+                index, gap = left, left_gap
+                left -= 1
+            else:
+                index, gap = right, right_gap
+                right += 1
+            yield radians(gap) * EARTH_RADIUS, self._by_latitude[index]
+
+    def nearest(self, latitude: float, longitude: float) -> Optional[LocationBase]:
+        """Find the nearest location to the given coordinates"""
+        nearest_location = None
+        min_squared = min_distance = float("inf")
+
+        vector = unit_vector(latitude, longitude)
+        for gap, location in self._outwards(latitude):
+            if gap > min_distance:
+                break
+            squared = squared_chord(vector, location.unit_vector)
+            if squared < min_squared:
+                min_squared = squared
+                min_distance = chord_distance(squared)
+                nearest_location = location
+
+        return nearest_location
+
+    def nearest_with_margin(self, latitude: float, longitude: float) -> Tuple[Optional[LocationBase], float]:
+        """Find the nearest location and how much farther the second nearest one is in km
+
+        The margin is 0 for equally near locations and infinite for a single location.
+        """
+        nearest_location = None
+        min_squared = second_squared = second_distance = float("inf")
+
+        vector = unit_vector(latitude, longitude)
+        for gap, location in self._outwards(latitude):
+            if gap > second_distance:
+                break
+            squared = squared_chord(vector, location.unit_vector)
+            if squared < second_squared:
+                if squared < min_squared:
+                    min_squared, second_squared = squared, min_squared
+                    nearest_location = location
+                else:
+                    second_squared = squared
+                if second_squared < float("inf"):
+                    second_distance = chord_distance(second_squared)
+
+        if nearest_location is None:
+            return None, float("inf")
+        return nearest_location, second_distance - chord_distance(min_squared)
+
+
+class NearestCache:
+    """Nearest location per quantized coordinate cell, kept in a bounded LRU
+
+    Coordinates are rounded down to cells of cell_size degrees. The first lookup
+    in a cell finds the location nearest to the cell center and the margin to the
+    second nearest one. No point of the cell is farther from the center than the
+    cell radius, so by the triangle inequality the same location is nearest in the
+    whole cell when the margin exceeds twice the radius. Cells crossed by a border
+    between nearest locations fall back to an exact search for every lookup.
+    """
+
+    def __init__(self, index: SpatialIndex, cell_size: float = NEAREST_CELL_SIZE, maxsize: int = NEAREST_CACHE_SIZE):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.index = index
+        self.cell_size = cell_size
+        self.maxsize = maxsize
+        self._cells: "OrderedDict[Tuple[int, int], object]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def clear(self) -> None:
+        """Forget all cells"""
+        self._cells.clear()
+
+    def nearest(self, latitude: float, longitude: float) -> Optional[LocationBase]:
+        """Find the nearest location to the given coordinates"""
+        return self.lookup(latitude, longitude)[0]
+
+    def lookup(self, latitude: float, longitude: float) -> Tuple[Optional[LocationBase], bool]:
+        """Find the nearest location and whether it came from the cache without a search"""
+        cell = (floor(latitude / self.cell_size), floor(longitude / self.cell_size))
+        location = self._cells.get(cell, _MISSING)
+        if location is _MISSING:
+            location = self._resolve(cell)
+            self._cells[cell] = location
+            if len(self._cells) > self.maxsize:
+                self._cells.popitem(last=False)
+            hit = False
+        else:
+            self._cells.move_to_end(cell)
+            hit = location is not _EXACT
+        if location is _EXACT:
+            return self.index.nearest(latitude, longitude), False
+        return location, hit
+
+    def _resolve(self, cell: Tuple[int, int]) -> object:
+        """Location nearest to every point of the cell or _EXACT when it differs"""
+        south, west = cell[0] * self.cell_size, cell[1] * self.cell_size
+        location, margin = self.index.nearest_with_margin(south + self.cell_size / 2, west + self.cell_size / 2)
+        radius = rectangle_radius(south, west, south + self.cell_size, west + self.cell_size)
+        return location if margin > 2 * radius else _EXACT
+
+
+# Cell values of NearestCache for cells not looked up yet and cells needing exact searches
+_MISSING = object()
+_EXACT = object()
+
+
+class HydroStationIndex(SpatialIndex):
+    """Hydrological stations indexed by location, code and water body"""
+
+    def __init__(self, stations: Iterable[HydroStation]):
+        super().__init__(stations)
+        self.by_code: Dict[str, HydroStation] = {}
+        self.by_water_body: Dict[str, List[HydroStation]] = {}
+        for station in self.locations:
+            self.by_code[station.code] = station
+            if station.water_body:
+                self.by_water_body.setdefault(station.water_body.casefold(), []).append(station)
+
+    def get(self, code: str) -> Optional[HydroStation]:
+        """Get station by its code"""
+        return self.by_code.get(code)
+
+    def for_water_body(self, water_body: str) -> List[HydroStation]:
+        """Get all stations on a water body, case insensitive"""
+        return list(self.by_water_body.get(water_body.casefold(), []))
+
+
+class PlaceIndex(SpatialIndex):
+    """Places indexed by location, code, name prefix, administrative division and county"""
+
+    def __init__(self, places: Iterable[Place]):
+        super().__init__(places)
+        self.by_code: Dict[str, Place] = {}
+        self.by_administrative_division: Dict[str, List[Place]] = {}
+        self.by_county: Dict[str, List[Place]] = {}
+        # (normalized key, rank, position) - rank 0 is the whole name, 1 is a later word of it
+        self._name_keys = []
+        for position, place in enumerate(self.locations):
+            self.by_code[place.code] = place
+            self.by_administrative_division.setdefault(place.administrative_division, []).append(place)
+            for county in place.counties:
+                self.by_county.setdefault(county, []).append(place)
+
+            words = normalize_name(place.name).split()
+            for word_index in range(len(words)):
+                self._name_keys.append((" ".join(words[word_index:]), min(word_index, 1), position))
+        self._name_keys.sort()
+
+    def get(self, code: str) -> Optional[Place]:
+        """Get place by its code"""
+        return self.by_code.get(code)
+
+    def search(self, prefix: str, limit: Optional[int] = 10) -> List[Place]:
+        """Find places whose name or any word of it starts with prefix
+
+        Matching ignores case and diacritics. Names starting with the prefix come first.
+        """
+        key = " ".join(normalize_name(prefix).split())
+        if not key:
+            return []
+
+        matches = []
+        for index in range(bisect_left(self._name_keys, (key,)), len(self._name_keys)):
+            name_key, rank, position = self._name_keys[index]
+            if not name_key.startswith(key):
+                break
+            matches.append((rank, name_key, position))
+        matches.sort()
+
+        places = []
+        seen = set()
+        for _, _, position in matches:
+            if position not in seen:
+                seen.add(position)
+                places.append(self.locations[position])
+                if limit is not None and len(places) >= limit:
+                    break
+        return places
+
+    def in_administrative_division(self, administrative_division: str) -> List[Place]:
+        """Get all places in an administrative division"""
+        return list(self.by_administrative_division.get(administrative_division, []))
+
+    def in_county(self, county: str) -> List[Place]:
+        """Get all places in a county"""
+        return list(self.by_county.get(county, []))
@@ -0,0 +1,146 @@
+"""Request metrics for MeteoLtClient"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds of request duration histogram buckets
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class RequestSample:
+    """Timings of a single request split into phases"""
+
+    endpoint: str
+    url: str
+    network: float = 0.0  # seconds until the whole response body is received
+    decode: float = 0.0  # seconds spent decoding JSON
+    build: float = 0.0  # seconds spent creating models
+    size: int = 0  # response body bytes
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> float:
+        """Total seconds of all phases"""
+        return self.network + self.decode + self.build
+
+
+@dataclass
+class EndpointStats:
+    """Aggregated measurements of an endpoint"""
+
+    requests: int = 0
+    errors: int = 0
+    network: float = 0.0
+    decode: float = 0.0
+    build: float = 0.0
+    response_bytes: int = 0
+    bucket_counts: List[int] = field(default_factory=list)
+
+
+class ClientMetrics:
+    """Collects per endpoint request timings, payload sizes, errors and cache hits
+
+    Callbacks added with add_hook receive every RequestSample, which allows
+    forwarding measurements to any metrics library.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.cache: Dict[Tuple[str, bool], int] = {}
+        self.hooks: List[Callable[[RequestSample], None]] = []
+
+    def add_hook(self, hook: Callable[[RequestSample], None]) -> None:
+        """Call hook with every recorded request"""
+        self.hooks.append(hook)
+
+    def record_request(self, sample: RequestSample) -> None:
+        """Record a finished or failed request"""
+        stats = self.endpoints.get(sample.endpoint)
+        if stats is None:
+            stats = self.endpoints[sample.endpoint] = EndpointStats(bucket_counts=[0] * (len(self.buckets) + 1))
+        stats.requests += 1
+        stats.network += sample.network
+        stats.decode += sample.decode
+        stats.build += sample.build
+        stats.response_bytes += sample.size
+        if sample.error is not None:
+            stats.errors += 1
+        stats.bucket_counts[bisect_left(self.buckets, sample.duration)] += 1
+
+        for hook in self.hooks:
+            hook(sample)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Record a lookup of cached data"""
+        self.cache[(cache, hit)] = self.cache.get((cache, hit), 0) + 1
+
+    def to_prometheus(self, prefix: str = "meteo_lt") -> str:
+        """Metrics in Prometheus text exposition format"""
+        lines = []
+
+        def metric(name: str, metric_type: str, description: str, samples: List[Tuple[str, Dict[str, str], float]]):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+                lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value!r}")
+
+        endpoints = sorted(self.endpoints.items())
+        metric(
+            "requests_total",
+            "counter",
+            "Requests made per endpoint.",
+            [("", {"endpoint": name}, stats.requests) for name, stats in endpoints],
+        )
+        metric(
+            "request_errors_total",
+            "counter",
+            "Failed requests per endpoint.",
+            [("", {"endpoint": name}, stats.errors) for name, stats in endpoints],
+        )
+        metric(
+            "response_bytes_total",
+            "counter",
+            "Received response body bytes per endpoint.",
+            [("", {"endpoint": name}, stats.response_bytes) for name, stats in endpoints],
+        )
+        metric(
+            "request_phase_seconds_total",
+            "counter",
+            "Seconds spent per endpoint in network, decode and build phases.",
+            [
+                ("", {"endpoint": name, "phase": phase}, getattr(stats, phase))
+                for name, stats in endpoints
+                for phase in ("network", "decode", "build")
+            ],
+        )
+
+        histogram = []
+        for name, stats in endpoints:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), stats.bucket_counts):
+                cumulative += count
+                histogram.append(
+                    ("_bucket", {"endpoint": name, "le": "+Inf" if bound == float("inf") else bound}, cumulative)
+                )
+            histogram.append(("_sum", {"endpoint": name}, stats.network + stats.decode + stats.build))
+            histogram.append(("_count", {"endpoint": name}, stats.requests))
+        metric("request_duration_seconds", "histogram", "Request duration per endpoint.", histogram)
+
+        metric(
+            "cache_requests_total",
+            "counter",
+            "Cached data lookups.",
+            [
+                ("", {"cache": cache, "result": "hit" if hit else "miss"}, count)
+                for (cache, hit), count in sorted(self.cache.items())
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
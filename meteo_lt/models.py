@@ -1,10 +1,16 @@
 """Models script"""
 
-from dataclasses import dataclass, field, fields
-from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any, Type
+import math
+import sys
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import InitVar, dataclass, field, fields, is_dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import AbstractSet, List, Optional, Dict, Any, FrozenSet, Sequence, Tuple, Type, Union, get_origin
 
-from .const import COUNTY_MUNICIPALITIES
+from .const import COUNTY_MUNICIPALITIES, ENCODING
+from .utils import unit_vector
 
 
 @dataclass
@@ -22,6 +28,18 @@ class LocationBase:
     code: str
     name: str
     coordinates: Coordinates
+    # Computed when created, squared chords between unit vectors rank locations by distance.
+    # None without coordinates, nearest location searches skip such locations
+    unit_vector: Optional[Tuple[float, float, float]] = field(
+        init=False, repr=False, compare=False, metadata={"export": False}
+    )
+
+    def __post_init__(self):
+        coordinates = self.coordinates
+        if coordinates is None or coordinates.latitude is None or coordinates.longitude is None:
+            self.unit_vector = None
+        else:
+            self.unit_vector = unit_vector(coordinates.latitude, coordinates.longitude)
 
     @property
     def latitude(self):
@@ -38,15 +56,77 @@ class LocationBase:
 class Place(LocationBase):
     """Places"""
 
-    administrative_division: str = field(metadata={"json_key": "administrativeDivision"})
-    country_code: str = field(metadata={"json_key": "countryCode"})
-    counties: List[str] = field(init=False)
+    administrative_division: str = field(metadata={"json_key": "administrativeDivision", "intern": True})
+    country_code: str = field(metadata={"json_key": "countryCode", "intern": True})
+    # Shared by all places of the same administrative division
+    counties: Tuple[str, ...] = field(init=False)
+    # Precomputed for matching warning areas without string operations per forecast
+    division_key: str = field(init=False, repr=False, compare=False, metadata={"export": False})
+    warning_areas: FrozenSet[str] = field(init=False, repr=False, compare=False, metadata={"export": False})
 
     def __post_init__(self):
-        self.counties = []
-        for county, municipalities in COUNTY_MUNICIPALITIES.items():
-            if self.administrative_division.replace(" savivaldybė", "") in municipalities:
-                self.counties.append(county)
+        super().__post_init__()
+        self.counties = division_counties(self.administrative_division)
+        self.division_key = normalize_division(self.administrative_division)
+        self.warning_areas = division_warning_areas(self.administrative_division)
+
+    def matching_warning_areas(self, areas: AbstractSet[str]) -> FrozenSet[str]:
+        """Warning areas among areas that affect the place
+
+        Areas missing from COUNTY_MUNICIPALITIES match when they contain the division name.
+        """
+        matching = self.warning_areas.intersection(areas)
+        unknown = [area for area in areas - KNOWN_WARNING_AREAS if self.division_key in area.lower()]
+        return matching.union(unknown) if unknown else matching
+
+
+# Warning areas with known municipalities, other areas are matched by name
+KNOWN_WARNING_AREAS = frozenset(COUNTY_MUNICIPALITIES)
+
+
+@lru_cache(maxsize=None)
+def division_counties(administrative_division: str) -> Tuple[str, ...]:
+    """Counties containing an administrative division"""
+    municipality = administrative_division.replace(" savivaldybė", "")
+    return tuple(county for county, municipalities in COUNTY_MUNICIPALITIES.items() if municipality in municipalities)
+
+
+@lru_cache(maxsize=None)
+def normalize_division(administrative_division: str) -> str:
+    """Lowercase administrative division name without municipality suffix"""
+    return sys.intern(administrative_division.lower().replace(" savivaldybė", "").replace(" sav.", ""))
+
+
+@lru_cache(maxsize=None)
+def division_warning_areas(administrative_division: str) -> FrozenSet[str]:
+    """Areas of COUNTY_MUNICIPALITIES whose warnings affect an administrative division
+
+    An area affects a division named in it or containing its municipality, these
+    are counties and Baltic coast areas.
+    """
+    key = normalize_division(administrative_division)
+    areas = set()
+    for area, municipalities in COUNTY_MUNICIPALITIES.items():
+        if key in area.lower():
+            areas.add(area)
+            continue
+        for municipality in municipalities:
+            name = normalize_division(municipality)
+            if key in name or name in key:
+                areas.add(area)
+                break
+    return frozenset(areas)
+
+
+def parse_warning_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse warning time like 2025-09-30T12:00:00Z, times without zone are UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
 
 @dataclass
@@ -54,11 +134,20 @@ class WeatherWarning:
     """Weather Warning"""
 
     county: str
-    warning_type: str
-    severity: str
+    warning_type: str = field(metadata={"intern": True})
+    severity: str = field(metadata={"intern": True})
     description: str
     start_time: Optional[str] = None
     end_time: Optional[str] = None
+    # Parsed start_time and end_time, so matching against timestamps does not parse them again
+    start_datetime: Optional[datetime] = field(default=None, repr=False, compare=False, metadata={"export": False})
+    end_datetime: Optional[datetime] = field(default=None, repr=False, compare=False, metadata={"export": False})
+
+    def __post_init__(self):
+        if self.start_datetime is None:
+            self.start_datetime = parse_warning_time(self.start_time)
+        if self.end_datetime is None:
+            self.end_datetime = parse_warning_time(self.end_time)
 
 
 @dataclass
@@ -94,7 +183,7 @@ class ForecastTimestamp:
     datetime: str = field(metadata={"json_key": "forecastTimeUtc"})
     temperature: float = field(metadata={"json_key": "airTemperature"})
     apparent_temperature: float = field(metadata={"json_key": "feelsLikeTemperature"})
-    condition_code: str = field(metadata={"json_key": "conditionCode"})
+    condition_code: str = field(metadata={"json_key": "conditionCode", "intern": True})
     wind_speed: float = field(metadata={"json_key": "windSpeed"})
     wind_gust_speed: float = field(metadata={"json_key": "windGust"})
     wind_bearing: float = field(metadata={"json_key": "windDirection"})
@@ -111,34 +200,135 @@ class Forecast:
 
     place: Place
     forecast_created: str = field(metadata={"json_key": "forecastCreationTimeUtc"})
-    current_conditions: ForecastTimestamp
-    forecast_timestamps: List[ForecastTimestamp] = field(metadata={"json_key": "forecastTimestamps"})
-
-    def __post_init__(self):
+    # Taken from forecast_timestamps, the API does not send it. API keyed to_dict puts it back
+    # as the first forecast timestamp
+    current_conditions: ForecastTimestamp = field(metadata={"api": False})
+    forecast_timestamps: List[ForecastTimestamp] = field(
+        metadata={"json_key": "forecastTimestamps", "api_first": "current_conditions"}
+    )
+    # POSIX times of forecast_timestamps when already known, saves parsing them
+    posix_times: InitVar[Optional[Sequence[float]]] = None
+    # Times of the indexed forecast_timestamps list for window queries and summaries of
+    # them by period length and time zone, see reindex
+    _indexed: Optional[List[ForecastTimestamp]] = field(
+        default=None, init=False, repr=False, compare=False, metadata={"export": False}
+    )
+    _times: List[float] = field(default_factory=list, init=False, repr=False, compare=False, metadata={"export": False})
+    _summaries: Dict[Tuple[int, tzinfo], List["ForecastSummary"]] = field(
+        default_factory=dict, init=False, repr=False, compare=False, metadata={"export": False}
+    )
+
+    def __post_init__(self, posix_times: Optional[Sequence[float]]):
         """Post-initialization processing."""
 
-        current_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
-        # Current conditions are equal to current hour record
-        for forecast in self.forecast_timestamps:
-            if (
-                datetime.fromisoformat(forecast.datetime)
-                .astimezone(timezone.utc)
-                .replace(minute=0, second=0, microsecond=0)
-            ) == current_hour:
+        current_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0).timestamp()
+        next_hour = current_hour + 3600
+        if posix_times is None:
+            posix_times = [
+                datetime.fromisoformat(forecast.datetime).timestamp() for forecast in self.forecast_timestamps
+            ]
+        current_found = False
+        timestamps = []
+        times = []
+        for forecast, forecast_time in zip(self.forecast_timestamps, posix_times):
+            # Current conditions are equal to current hour record
+            if not current_found and current_hour <= forecast_time < next_hour:
                 self.current_conditions = forecast
-                break
+                current_found = True
+            # Filter out timestamps that are older than current hour
+            if forecast_time >= next_hour:
+                timestamps.append(forecast)
+                times.append(forecast_time)
+        self.forecast_timestamps = timestamps
+        # Times are already known, window queries need not parse them
+        self._indexed = timestamps
+        self._times = times
+
+    def reindex(self) -> None:
+        """Parse times of forecast_timestamps again and drop summaries
+
+        Assigning another list to forecast_timestamps is noticed by the next query,
+        call this after changing the list or the times of its items in place.
+        """
+        timestamps = self.forecast_timestamps
+        self._indexed = timestamps
+        self._times = [datetime.fromisoformat(timestamp.datetime).timestamp() for timestamp in timestamps]
+        self._summaries = {}
+
+    def _time_index(self) -> List[float]:
+        """POSIX times of forecast_timestamps, indexed again when another list was assigned"""
+        if self._indexed is not self.forecast_timestamps:
+            self.reindex()
+        return self._times
+
+    def between(self, start: datetime, end: datetime) -> List[ForecastTimestamp]:
+        """Forecast timestamps from start until end, found by bisecting times parsed once"""
+        times = self._time_index()
+        return self.forecast_timestamps[bisect_left(times, start.timestamp()) : bisect_left(times, end.timestamp())]
+
+    def next_hours(self, hours: float, now: Optional[datetime] = None) -> List[ForecastTimestamp]:
+        """Forecast timestamps within hours from now"""
+        now = now or datetime.now(timezone.utc)
+        return self.between(now, now + timedelta(hours=hours))
+
+    def on_day(self, day: Optional[date] = None, tz: tzinfo = timezone.utc) -> List[ForecastTimestamp]:
+        """Forecast timestamps of a day in time zone tz, today by default"""
+        day = day or datetime.now(tz).date()
+        return self.between(datetime.combine(day, time(), tz), datetime.combine(day + timedelta(days=1), time(), tz))
+
+    def resample(self, hours: int = 24, tz: tzinfo = timezone.utc) -> List["ForecastSummary"]:
+        """Summaries of forecast timestamps in periods of hours from midnight in time zone tz
+
+        hours must divide a day, e.g. 24 for daily or 3 for 3-hourly summaries.
+        Summaries are computed once per forecast, periods without timestamps are left out.
+        """
+        if not isinstance(hours, int) or hours <= 0 or 24 % hours:
+            raise ValueError("hours must be a whole number dividing 24")
+        times = self._time_index()
+        if (hours, tz) not in self._summaries:
+            periods: Dict[datetime, List[ForecastTimestamp]] = {}
+            for timestamp, posix_time in zip(self.forecast_timestamps, times):
+                local = datetime.fromtimestamp(posix_time, tz)
+                start = local.replace(hour=local.hour - local.hour % hours, minute=0, second=0, microsecond=0)
+                periods.setdefault(start, []).append(timestamp)
+            self._summaries[(hours, tz)] = [
+                ForecastSummary.from_timestamps(start, start + timedelta(hours=hours), timestamps)
+                for start, timestamps in periods.items()
+            ]
+        return list(self._summaries[(hours, tz)])
 
-        # Filter out timestamps that are older than current hour
-        self.forecast_timestamps = [
-            forecast
-            for forecast in self.forecast_timestamps
-            if (
-                datetime.fromisoformat(forecast.datetime)
-                .astimezone(timezone.utc)
-                .replace(minute=0, second=0, microsecond=0)
-            )
-            > current_hour
-        ]
+
+@dataclass
+class ForecastSummary:
+    """Forecast timestamps from start until end summarized"""
+
+    start: datetime
+    end: datetime
+    temperature_min: Optional[float]
+    temperature_max: Optional[float]
+    precipitation: float  # total, missing values are skipped
+    condition_code: Optional[str]  # most frequent, the earliest of equally frequent
+    count: int
+
+    @classmethod
+    def from_timestamps(cls, start: datetime, end: datetime, timestamps: List[ForecastTimestamp]) -> "ForecastSummary":
+        """Summary of timestamps"""
+        temperatures = [timestamp.temperature for timestamp in timestamps if timestamp.temperature is not None]
+        conditions = Counter(timestamp.condition_code for timestamp in timestamps if timestamp.condition_code)
+        return cls(
+            start=start,
+            end=end,
+            temperature_min=min(temperatures, default=None),
+            temperature_max=max(temperatures, default=None),
+            precipitation=math.fsum(t.precipitation for t in timestamps if t.precipitation is not None),
+            condition_code=conditions.most_common(1)[0][0] if conditions else None,
+            count=len(timestamps),
+        )
+
+
+# Fields with API times, which are UTC in API_TIME_FORMAT and ISO 8601 strings in models
+API_TIME_FIELDS = ("datetime", "forecast_created", "observation_datetime")
+API_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 def from_dict(cls: Type, data: Dict[str, Any]) -> Any:
@@ -156,15 +346,100 @@ def from_dict(cls: Type, data: Dict[str, Any]) -> Any:
             value = from_dict(f.type, value)
         elif isinstance(value, list) and hasattr(f.type.__args__[0], "from_dict"):
             value = [from_dict(f.type.__args__[0], item) for item in value]
-        elif f.name in ("datetime", "forecast_created", "observation_datetime") and value:
+        elif f.name in API_TIME_FIELDS and value:
             # Convert datetime to ISO 8601 format
-            dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-            value = dt.isoformat()
+            dt = datetime.strptime(value, API_TIME_FORMAT).replace(tzinfo=timezone.utc)
+            # Forecasts of all places share the same times
+            value = sys.intern(dt.isoformat())
+        elif f.metadata.get("intern") and isinstance(value, str):
+            # Few distinct values repeat across many objects, keep one copy of each
+            value = sys.intern(value)
 
         init_args[f.name] = value
     return cls(**init_args)
 
 
+# Generated to_dict functions by name, also the globals they are executed in, so
+# nested models are looked up when called and definition order does not matter
+_TO_DICT_FUNCTIONS: Dict[str, Any] = {}
+
+
+def _to_dict_name(cls: Type, api_keys: bool) -> str:
+    return f"_{cls.__name__}_to_{'api' if api_keys else 'snake'}_dict"
+
+
+@lru_cache(maxsize=1024)
+def _api_time(value: Optional[str]) -> Optional[str]:
+    """ISO 8601 time in API_TIME_FORMAT, forecasts of all places share the same times"""
+    if not value:
+        return value
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime(API_TIME_FORMAT)
+
+
+_TO_DICT_FUNCTIONS["_api_time"] = _api_time
+
+
+def _generate_to_dict(cls: Type, api_keys: bool) -> Any:
+    """Create a function converting instances of cls into dictionaries
+
+    Nested models are converted too, other values are used as they are, without
+    copying. Fields with export False in metadata are left out. With api_keys the
+    result has the shape of API responses, which from_dict reads back: times are in
+    API_TIME_FORMAT, fields computed by models or with api False are left out and
+    lists with api_first in metadata start with that field when it is not None.
+    """
+    items = []
+    for f in fields(cls):
+        if not f.metadata.get("export", True):
+            continue
+        if api_keys and (not f.init or not f.metadata.get("api", True)):
+            continue
+        key = f.metadata.get("json_key", f.name) if api_keys else f.name
+        value = f"self.{f.name}"
+        if api_keys and f.name in API_TIME_FIELDS:
+            value = f"_api_time({value})"
+        elif is_dataclass(f.type):
+            value = f"None if {value} is None else {_to_dict_name(f.type, api_keys)}({value})"
+        elif get_origin(f.type) is list and is_dataclass(f.type.__args__[0]):
+            convert = _to_dict_name(f.type.__args__[0], api_keys)
+            first = f.metadata.get("api_first") if api_keys else None
+            if first:
+                first_item = f"[] if self.{first} is None else [{convert}(self.{first})]"
+                value = f"({first_item}) + [{convert}(item) for item in {value} or ()]"
+            else:
+                value = f"None if {value} is None else [{convert}(item) for item in {value}]"
+        items.append(f"        {key!r}: {value},")
+
+    name = _to_dict_name(cls, api_keys)
+    source = "\n".join([f"def {name}(self):", "    return {", *items, "    }"])
+    exec(source, _TO_DICT_FUNCTIONS)  # pylint: disable=exec-used
+    return _TO_DICT_FUNCTIONS[name]
+
+
+def _add_to_dict(cls: Type) -> None:
+    snake_case = _generate_to_dict(cls, api_keys=False)
+    api = _generate_to_dict(cls, api_keys=True)
+
+    def to_dict(self, api_keys: bool = False) -> Dict[str, Any]:
+        """Fields as a dictionary keyed by field names, or by API keys with api_keys"""
+        return api(self) if api_keys else snake_case(self)
+
+    cls.to_dict = to_dict
+    cls.to_json = to_json
+
+
+def to_json(self, api_keys: bool = False, as_bytes: bool = False) -> Union[str, bytes]:
+    """Fields as compact JSON, keyed by field names or by API keys with api_keys"""
+    # json is imported on first use, it is not needed to build models from decoded responses
+    import json  # pylint: disable=import-outside-toplevel
+
+    text = json.dumps(self.to_dict(api_keys), ensure_ascii=False, separators=(",", ":"))
+    return text.encode(ENCODING) if as_bytes else text
+
+
 Coordinates.from_dict = classmethod(from_dict)
 Place.from_dict = classmethod(from_dict)
 ForecastTimestamp.from_dict = classmethod(from_dict)
@@ -173,3 +448,36 @@ WeatherWarning.from_dict = classmethod(from_dict)
 HydroStation.from_dict = classmethod(from_dict)
 HydroObservation.from_dict = classmethod(from_dict)
 HydroObservationData.from_dict = classmethod(from_dict)
+
+
+def _serialized(name: str) -> Any:
+    """Function name of serialization, importing the module with json and struct on first call"""
+
+    def call(*args):
+        from . import serialization  # pylint: disable=import-outside-toplevel
+
+        return getattr(serialization, name)(*args)
+
+    call.__name__ = name
+    call.__doc__ = f"Binary layout conversion, see serialization.{name}"
+    return call
+
+
+Place.to_bytes = _serialized("place_to_bytes")
+Place.from_bytes = classmethod(_serialized("place_from_bytes"))
+Forecast.to_bytes = _serialized("forecast_to_bytes")
+Forecast.from_bytes = classmethod(_serialized("forecast_from_bytes"))
+HydroObservationData.to_bytes = _serialized("hydro_observation_data_to_bytes")
+HydroObservationData.from_bytes = classmethod(_serialized("hydro_observation_data_from_bytes"))
+
+for _model in (
+    Coordinates,
+    Place,
+    ForecastTimestamp,
+    Forecast,
+    WeatherWarning,
+    HydroStation,
+    HydroObservation,
+    HydroObservationData,
+):
+    _add_to_dict(_model)
@@ -0,0 +1,161 @@
+"""Recorded HTTP traffic of MeteoLtClient for offline replay
+
+A client given a TrafficArchive to record adds every response it receives,
+with status, headers, body and network seconds, failed ones included. A client
+given an archive to replay serves responses from it instead of the network,
+bodies then go through the same status checks, decoding, model building, metrics
+and tracing as downloaded ones. Responses the session rejected with
+aiohttp.ClientResponseError are stored with its message and raise it again.
+
+Archives are saved as ZIP files of deflated members:
+
+    manifest.json   {"version": 1, "responses": [...]} with endpoint, url, status,
+                    headers as [name, value] pairs, network seconds, body member and
+                    error message or null of each response in the order received
+    bodies/<hash>   response bodies named by SHA-256, identical bodies stored once
+"""
+
+import asyncio
+import hashlib
+import json
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .const import ENCODING
+from .utils import atomic_write
+
+VERSION = 1
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class RecordedResponse:
+    """HTTP response as received by the client"""
+
+    endpoint: str
+    url: str
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    network: float  # seconds from request start until the body was read
+    error: Optional[str] = None  # message of the ClientResponseError raised instead of reading the body
+
+    def raise_for_status(self) -> None:
+        """Raise aiohttp.ClientResponseError again when the session raised it for this response"""
+        if self.error is None:
+            return
+        headers = CIMultiDictProxy(CIMultiDict(self.headers))
+        request_info = aiohttp.RequestInfo(URL(self.url), "GET", CIMultiDictProxy(CIMultiDict()), URL(self.url))
+        raise aiohttp.ClientResponseError(request_info, (), status=self.status, message=self.error, headers=headers)
+
+
+class TrafficArchive:
+    """Responses recorded by a client, replayed per URL in the order received
+
+    Repeated requests of a URL get its responses in turn, the last one again once
+    all were served. With latency, replay waits the recorded network seconds of
+    each response, otherwise responses are served without delay.
+    """
+
+    def __init__(self, responses: Iterable[RecordedResponse] = (), latency: bool = False):
+        self.responses: List[RecordedResponse] = []
+        self.latency = latency
+        self._by_url: Dict[str, List[RecordedResponse]] = {}
+        self._served: Dict[str, int] = {}
+        for response in responses:
+            self.add(response)
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def add(self, response: RecordedResponse) -> None:
+        """Record a response"""
+        self.responses.append(response)
+        self._by_url.setdefault(response.url, []).append(response)
+
+    def rewind(self) -> None:
+        """Serve every URL from its first response again"""
+        self._served.clear()
+
+    def response(self, url: str) -> RecordedResponse:
+        """Next recorded response for url
+
+        Raises aiohttp.ClientConnectionError when nothing was recorded for url,
+        so callers handle it like a failed request.
+        """
+        responses = self._by_url.get(url)
+        if not responses:
+            raise aiohttp.ClientConnectionError(f"No recorded response for {url}")
+        served = self._served.get(url, 0)
+        self._served[url] = served + 1
+        return responses[min(served, len(responses) - 1)]
+
+    async def replay(self, url: str) -> RecordedResponse:
+        """Next recorded response for url, after its recorded network time with latency"""
+        response = self.response(url)
+        if self.latency:
+            await asyncio.sleep(response.network)
+        return response
+
+    def save(self, path: str) -> None:
+        """Write the archive to path, replacing an existing file atomically"""
+        manifest = []
+        bodies = {}
+        for response in self.responses:
+            name = f"bodies/{hashlib.sha256(response.body).hexdigest()}"
+            bodies[name] = response.body
+            manifest.append(
+                {
+                    "endpoint": response.endpoint,
+                    "url": response.url,
+                    "status": response.status,
+                    "headers": [list(header) for header in response.headers],
+                    "network": response.network,
+                    "body": name,
+                    "error": response.error,
+                }
+            )
+
+        with atomic_write(path, prefix=".traffic-") as file:
+            with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                document = {"version": VERSION, "responses": manifest}
+                archive.writestr(MANIFEST, json.dumps(document, ensure_ascii=False).encode(ENCODING))
+                for name, body in bodies.items():
+                    archive.writestr(name, body)
+
+    @classmethod
+    def load(cls, path: str, latency: bool = False) -> "TrafficArchive":
+        """Read an archive saved by save, decompressing all bodies up front
+
+        Raises ValueError when the file is not a traffic archive.
+        """
+        try:
+            with zipfile.ZipFile(path) as archive:
+                document = json.loads(archive.read(MANIFEST).decode(ENCODING))
+                if document.get("version") != VERSION:
+                    raise ValueError(f"Unsupported traffic archive version {document.get('version')}")
+                bodies: Dict[str, bytes] = {}
+                responses = []
+                for entry in document["responses"]:
+                    name = entry["body"]
+                    if name not in bodies:
+                        bodies[name] = archive.read(name)
+                    responses.append(
+                        RecordedResponse(
+                            endpoint=entry["endpoint"],
+                            url=entry["url"],
+                            status=entry["status"],
+                            headers=[(header, value) for header, value in entry["headers"]],
+                            body=bodies[name],
+                            network=entry["network"],
+                            error=entry.get("error"),
+                        )
+                    )
+        except (zipfile.BadZipFile, json.JSONDecodeError, KeyError, TypeError, AttributeError) as error:
+            raise ValueError(f"Invalid traffic archive {path}: {error}") from error
+        return cls(responses, latency)
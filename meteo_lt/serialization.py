@@ -0,0 +1,318 @@
+"""Compact binary serialization of models
+
+Layout of version 1, all numbers little endian:
+
+    header      4s magic b"MTLT", B version, B kind (P place, F forecast, H hydro observation data)
+    strings     I count, then per string I length and UTF-8 bytes
+    body        kind specific, see the _write functions
+
+Every string in the body is an I index into strings, NONE stands for None, so
+repeated values like condition codes are stored once. Numbers are float64 columns
+where NaN stands for None and times are POSIX timestamps, which come back as UTC
+ISO 8601 strings. Any layout change increases VERSION, other versions are rejected.
+
+Nested model classes are taken from field types of the class being decoded, so
+models can import this module on first use.
+"""
+
+import json
+import math
+import struct
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from .columns import NUMERIC_FIELDS, from_posix, to_posix
+from .const import ENCODING
+
+MAGIC = b"MTLT"
+VERSION = 1
+NONE = 0xFFFFFFFF
+
+PLACE = ord("P")
+FORECAST = ord("F")
+HYDRO_OBSERVATION_DATA = ord("H")
+
+# HydroObservation fields stored as float64 columns in layout order, forecasts use NUMERIC_FIELDS
+HYDRO_COLUMNS = ("water_level", "water_temperature", "water_discharge")
+WARNING_FIELDS = ("county", "warning_type", "severity", "description", "start_time", "end_time")
+
+_HEADER = struct.Struct("<4sBB")
+_UINT = struct.Struct("<I")
+
+
+class _Writer:
+    """Collects body parts and the string table"""
+
+    def __init__(self, kind: int):
+        self.kind = kind
+        self.strings = {}
+        self.parts = []
+
+    def string(self, value: Optional[str]) -> int:
+        """Index of value in the string table"""
+        if value is None:
+            return NONE
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def pack(self, fmt: str, *values) -> None:
+        """Append values to the body"""
+        self.parts.append(struct.pack(fmt, *values))
+
+    def getvalue(self) -> bytes:
+        """Header, string table and body"""
+        table = [_HEADER.pack(MAGIC, VERSION, self.kind), _UINT.pack(len(self.strings))]
+        for value in self.strings:
+            encoded = value.encode(ENCODING)
+            table.append(_UINT.pack(len(encoded)))
+            table.append(encoded)
+        return b"".join(table + self.parts)
+
+
+class _Reader:
+    """Reads the string table and body values in order"""
+
+    def __init__(self, data: bytes, kind: int):
+        magic, version, found = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not serialized meteo_lt data")
+        if version != VERSION:
+            raise ValueError(f"Unsupported serialization version {version}, expected {VERSION}")
+        if found != kind:
+            raise ValueError(f"Serialized {chr(found)} data, expected {chr(kind)}")
+        self.data = data
+        self.offset = _HEADER.size
+
+        self.strings: List[str] = []
+        for _ in range(self.unpack("<I")[0]):
+            (length,) = self.unpack("<I")
+            end = self.offset + length
+            if end > len(data):
+                raise ValueError("Truncated serialized data")
+            self.strings.append(str(data[self.offset : end], ENCODING))
+            self.offset = end
+
+    def unpack(self, fmt: str) -> tuple:
+        """Next values of the body"""
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def string(self, index: int) -> Optional[str]:
+        """String of a string table index"""
+        return None if index == NONE else self.strings[index]
+
+
+@lru_cache(maxsize=None)
+def _init_fields(cls: type) -> Tuple[str, ...]:
+    """Names of the __init__ arguments of a model class in order"""
+    return tuple(field.name for field in fields(cls) if field.init)
+
+
+@lru_cache(maxsize=None)
+def _field_type(cls: type, name: str) -> type:
+    """Class of a field, or of list items for list fields"""
+    for field in fields(cls):
+        if field.name == name:
+            return getattr(field.type, "__args__", (field.type,))[0]
+    raise AttributeError(f"{cls.__name__} has no field {name}")
+
+
+def _loads(cls: type, data: bytes, kind: int, read) -> Any:
+    try:
+        reader = _Reader(data, kind)
+        return read(reader, cls)
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid serialized {cls.__name__}: {exc}") from exc
+
+
+def _number(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _write_column(writer: _Writer, values: List[float]) -> None:
+    writer.pack(f"<{len(values)}d", *values)
+
+
+def _read_column(reader: _Reader, count: int) -> List[Optional[float]]:
+    # NaN is the only value not equal to itself, comparing is faster than calling math.isnan
+    values = reader.unpack(f"<{count}d")
+    return [value if value == value else None for value in values]  # pylint: disable=comparison-with-itself
+
+
+def _rows(cls: type, columns: dict) -> list:
+    """Instances of cls from columns of values by field name, passed positionally in field order"""
+    return list(map(cls, *(columns[name] for name in _init_fields(cls))))
+
+
+# Place: I code, I name, d latitude, d longitude, I administrative division, I country code
+
+
+def _write_place(writer: _Writer, place) -> None:
+    writer.pack(
+        "<IIddII",
+        writer.string(place.code),
+        writer.string(place.name),
+        place.latitude,
+        place.longitude,
+        writer.string(place.administrative_division),
+        writer.string(place.country_code),
+    )
+
+
+def _read_place(reader: _Reader, cls: type):
+    code, name, latitude, longitude, division, country = reader.unpack("<IIddII")
+    return cls(
+        code=reader.string(code),
+        name=reader.string(name),
+        coordinates=_field_type(cls, "coordinates")(latitude=latitude, longitude=longitude),
+        administrative_division=reader.string(division),
+        country_code=reader.string(country),
+    )
+
+
+def place_to_bytes(place) -> bytes:
+    """Place in binary layout"""
+    writer = _Writer(PLACE)
+    _write_place(writer, place)
+    return writer.getvalue()
+
+
+def place_from_bytes(cls: type, data: bytes):
+    """Place from binary layout"""
+    return _loads(cls, data, PLACE, _read_place)
+
+
+# Forecast: place, I forecast created, B has current conditions, I row count n, then columns
+# of n rows, current conditions first when present: d times, d per NUMERIC_FIELDS,
+# I condition codes. Then I unique warning count, 6I per warning for WARNING_FIELDS,
+# I warning count per row and I warning indexes of all rows.
+
+
+def forecast_to_bytes(forecast) -> bytes:
+    """Forecast in binary layout, including warnings of timestamps"""
+    writer = _Writer(FORECAST)
+    _write_place(writer, forecast.place)
+
+    current = forecast.current_conditions
+    rows = ([current] if current is not None else []) + list(forecast.forecast_timestamps)
+    writer.pack("<IBI", writer.string(forecast.forecast_created), current is not None, len(rows))
+    _write_column(writer, [to_posix(row.datetime) for row in rows])
+    for name in NUMERIC_FIELDS:
+        _write_column(writer, [_number(getattr(row, name)) for row in rows])
+    writer.pack(f"<{len(rows)}I", *(writer.string(row.condition_code) for row in rows))
+
+    # The same warning usually applies to many timestamps, store it once
+    positions = {}
+    warnings = []
+    indexes = []
+    for row in rows:
+        for warning in row.warnings:
+            position = positions.get(id(warning))
+            if position is None:
+                position = positions[id(warning)] = len(warnings)
+                warnings.append(warning)
+            indexes.append(position)
+    writer.pack("<I", len(warnings))
+    for warning in warnings:
+        writer.pack("<6I", *(writer.string(getattr(warning, name)) for name in WARNING_FIELDS))
+    writer.pack(f"<{len(rows)}I", *(len(row.warnings) for row in rows))
+    writer.pack(f"<{len(indexes)}I", *indexes)
+    return writer.getvalue()
+
+
+def _read_forecast(reader: _Reader, cls: type):
+    place = _read_place(reader, _field_type(cls, "place"))
+    created, has_current, count = reader.unpack("<IBI")
+    times = reader.unpack(f"<{count}d")
+    columns = [_read_column(reader, count) for _ in NUMERIC_FIELDS]
+    codes = reader.unpack(f"<{count}I")
+
+    warning_cls = _field_type(_field_type(cls, "forecast_timestamps"), "warnings")
+    warnings = []
+    for _ in range(reader.unpack("<I")[0]):
+        values = (reader.string(index) for index in reader.unpack("<6I"))
+        warnings.append(warning_cls(**dict(zip(WARNING_FIELDS, values))))
+    warning_counts = reader.unpack(f"<{count}I")
+    indexes = reader.unpack(f"<{sum(warning_counts)}I")
+
+    row_columns = dict(zip(NUMERIC_FIELDS, columns))
+    row_columns["datetime"] = list(map(from_posix, times))
+    row_columns["condition_code"] = list(map(reader.string, codes))
+    rows = _rows(_field_type(cls, "forecast_timestamps"), row_columns)
+    start = 0
+    for timestamp, warning_count in zip(rows, warning_counts):
+        if warning_count:
+            timestamp.warnings = [warnings[index] for index in indexes[start : start + warning_count]]
+            start += warning_count
+
+    # Decoded times spare Forecast parsing the time strings again to drop past hours
+    return cls(
+        place=place,
+        forecast_created=reader.string(created),
+        current_conditions=rows[0] if has_current else None,
+        forecast_timestamps=rows[1:] if has_current else rows,
+        posix_times=times[1:] if has_current else times,
+    )
+
+
+def forecast_from_bytes(cls: type, data: bytes):
+    """Forecast from binary layout"""
+    return _loads(cls, data, FORECAST, _read_forecast)
+
+
+# HydroObservationData: station as I code, I name, d latitude, d longitude, I water body,
+# I observations data range as JSON, I row count n, then columns of n rows: d times,
+# d per HYDRO_COLUMNS.
+
+
+def hydro_observation_data_to_bytes(data) -> bytes:
+    """Hydro observation data in binary layout"""
+    writer = _Writer(HYDRO_OBSERVATION_DATA)
+    station = data.station
+    data_range = None if data.observations_data_range is None else json.dumps(data.observations_data_range)
+    writer.pack(
+        "<IIddIII",
+        writer.string(station.code),
+        writer.string(station.name),
+        station.latitude,
+        station.longitude,
+        writer.string(station.water_body),
+        writer.string(data_range),
+        len(data.observations),
+    )
+    _write_column(writer, [to_posix(observation.observation_datetime) for observation in data.observations])
+    for name in HYDRO_COLUMNS:
+        _write_column(writer, [_number(getattr(observation, name)) for observation in data.observations])
+    return writer.getvalue()
+
+
+def _read_hydro_observation_data(reader: _Reader, cls: type):
+    code, name, latitude, longitude, water_body, data_range, count = reader.unpack("<IIddIII")
+    station_cls = _field_type(cls, "station")
+    station = station_cls(
+        code=reader.string(code),
+        name=reader.string(name),
+        coordinates=_field_type(station_cls, "coordinates")(latitude=latitude, longitude=longitude),
+        water_body=reader.string(water_body),
+    )
+    data_range = reader.string(data_range)
+
+    times = reader.unpack(f"<{count}d")
+    columns = [_read_column(reader, count) for _ in HYDRO_COLUMNS]
+    row_columns = dict(zip(HYDRO_COLUMNS, columns))
+    row_columns["observation_datetime"] = list(map(from_posix, times))
+    observations = _rows(_field_type(cls, "observations"), row_columns)
+    return cls(
+        station=station,
+        observations_data_range=None if data_range is None else json.loads(data_range),
+        observations=observations,
+    )
+
+
+def hydro_observation_data_from_bytes(cls: type, data: bytes):
+    """Hydro observation data from binary layout"""
+    return _loads(cls, data, HYDRO_OBSERVATION_DATA, _read_hydro_observation_data)
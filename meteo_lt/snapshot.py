@@ -0,0 +1,372 @@
+"""Memory-mapped snapshot of forecasts of many places
+
+write_snapshot stores forecasts in one file with a fixed columnar layout, which
+ForecastSnapshot maps read-only, so processes reading the same file share one
+physical copy through the page cache. Layout of version 1, all numbers little endian:
+
+    header      8s magic b"MTLTSNAP", I version, I place count, I row count, I string count,
+                Q offsets of string offsets, string data, places and rows
+    strings     Q offsets of string count + 1 boundaries into UTF-8 string data
+    places      per place sorted by code: I code, I name, d latitude, d longitude,
+                I administrative division, I country code, I forecast created, I first row,
+                I row count, 4x padding
+    rows        rows of all places in place order: d times, d per NUMERIC_FIELDS,
+                I condition codes
+
+Strings are I indexes into strings, NONE stands for None. Numbers are NaN for None
+and times are POSIX timestamps. Sections start at multiples of 8 bytes. Columns are
+read as native memoryviews, so reading needs a little endian machine.
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .models import Coordinates, Forecast, ForecastTimestamp, Place
+from .columns import NUMERIC_FIELDS, from_posix, to_posix
+from .serialization import NONE
+from .const import ENCODING
+from .utils import atomic_write
+
+MAGIC = b"MTLTSNAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIII4Q")
+_PLACE = struct.Struct("<IIddIIIII4x")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_snapshot(path: str, forecasts: Iterable[Forecast]) -> None:
+    """Write forecasts to path, replacing an existing snapshot atomically
+
+    Rows are the current conditions and forecast timestamps of each forecast
+    ordered by time. Warnings of timestamps are not stored.
+    """
+    by_code = {}
+    for forecast in forecasts:
+        if forecast.place.code in by_code:
+            raise ValueError(f"Duplicate forecast for {forecast.place.code}")
+        by_code[forecast.place.code] = forecast
+
+    strings = {}
+
+    def string(value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    places = []
+    rows: List[ForecastTimestamp] = []
+    for code in sorted(by_code):
+        forecast = by_code[code]
+        timestamps = {}
+        current = forecast.current_conditions
+        for timestamp in ([current] if current is not None else []) + list(forecast.forecast_timestamps):
+            timestamps.setdefault(to_posix(timestamp.datetime), timestamp)
+        place = forecast.place
+        places.append(
+            _PLACE.pack(
+                string(place.code),
+                string(place.name),
+                place.latitude,
+                place.longitude,
+                string(place.administrative_division),
+                string(place.country_code),
+                string(forecast.forecast_created),
+                len(rows),
+                len(timestamps),
+            )
+        )
+        rows.extend(timestamps[time] for time in sorted(timestamps))
+
+    columns = [struct.pack(f"<{len(rows)}d", *(to_posix(row.datetime) for row in rows))]
+    for name in NUMERIC_FIELDS:
+        values = (getattr(row, name) for row in rows)
+        columns.append(struct.pack(f"<{len(rows)}d", *(math.nan if value is None else value for value in values)))
+    columns.append(struct.pack(f"<{len(rows)}I", *(string(row.condition_code) for row in rows)))
+
+    encoded = [value.encode(ENCODING) for value in strings]
+    boundaries = [0]
+    for value in encoded:
+        boundaries.append(boundaries[-1] + len(value))
+
+    strings_offset = _HEADER.size + (-_HEADER.size % 8)
+    string_data_offset = strings_offset + 8 * len(boundaries)
+    places_offset = _align(string_data_offset + boundaries[-1])
+    rows_offset = places_offset + _PLACE.size * len(places)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(places),
+        len(rows),
+        len(strings),
+        strings_offset,
+        string_data_offset,
+        places_offset,
+        rows_offset,
+    )
+
+    # Readers see either the old or the new file, never a partially written one
+    with atomic_write(path, prefix=".snapshot-") as file:
+        file.write(header.ljust(strings_offset, b"\0"))
+        file.write(struct.pack(f"<{len(boundaries)}Q", *boundaries))
+        file.write(b"".join(encoded).ljust(places_offset - string_data_offset, b"\0"))
+        file.write(b"".join(places))
+        file.write(b"".join(columns))
+
+
+class _SnapshotData:
+    """Mapped snapshot file with column views"""
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Forecast snapshots can only be read on little endian machines")
+        with open(path, "rb") as file:
+            self.stat = os.fstat(file.fileno())
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self.map)
+        try:
+            (
+                magic,
+                version,
+                self.place_count,
+                row_count,
+                string_count,
+                strings_offset,
+                self.string_data_offset,
+                self.places_offset,
+                rows_offset,
+            ) = _HEADER.unpack_from(buffer)
+        except struct.error as exc:
+            raise ValueError(f"Invalid forecast snapshot {path}") from exc
+        if magic != MAGIC:
+            raise ValueError(f"Not a forecast snapshot: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported forecast snapshot version {version}, expected {VERSION}")
+        if rows_offset + row_count * (8 * (len(NUMERIC_FIELDS) + 1) + 4) > len(buffer):
+            raise ValueError(f"Truncated forecast snapshot {path}")
+
+        self.buffer = buffer
+        self.boundaries = buffer[strings_offset : strings_offset + 8 * (string_count + 1)].cast("Q")
+        self.strings: Dict[int, str] = {}
+
+        size = 8 * row_count
+        self.times = buffer[rows_offset : rows_offset + size].cast("d")
+        self.columns = {}
+        offset = rows_offset + size
+        for name in NUMERIC_FIELDS:
+            self.columns[name] = buffer[offset : offset + size].cast("d")
+            offset += size
+        self.condition_codes = buffer[offset : offset + 4 * row_count].cast("I")
+
+    def string(self, index: int) -> Optional[str]:
+        """Decoded string, each one is decoded once"""
+        if index == NONE:
+            return None
+        value = self.strings.get(index)
+        if value is None:
+            start = self.string_data_offset + self.boundaries[index]
+            end = self.string_data_offset + self.boundaries[index + 1]
+            value = self.strings[index] = str(self.buffer[start:end], ENCODING)
+        return value
+
+    def place_record(self, position: int) -> tuple:
+        """Fields of the place at position"""
+        return _PLACE.unpack_from(self.buffer, self.places_offset + position * _PLACE.size)
+
+    def find(self, code: str) -> Optional[int]:
+        """Position of the place with code"""
+        low, high = 0, self.place_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(self.place_record(middle)[0]) < code:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.place_count and self.string(self.place_record(low)[0]) == code:
+            return low
+        return None
+
+
+class TimestampView:
+    """Read-only ForecastTimestamp backed by a snapshot row"""
+
+    __slots__ = ("_data", "_row", "warnings")
+
+    def __init__(self, data: _SnapshotData, row: int):
+        self._data = data
+        self._row = row
+        self.warnings = []
+
+    @property
+    def datetime(self) -> Optional[str]:
+        """Forecast time as UTC ISO 8601 string"""
+        return from_posix(self._data.times[self._row])
+
+    @property
+    def condition_code(self) -> Optional[str]:
+        """Condition code"""
+        return self._data.string(self._data.condition_codes[self._row])
+
+    def to_timestamp(self) -> ForecastTimestamp:
+        """Copy into a ForecastTimestamp"""
+        timestamp = ForecastTimestamp(
+            datetime=self.datetime,
+            condition_code=self.condition_code,
+            **{name: getattr(self, name) for name in NUMERIC_FIELDS},
+        )
+        timestamp.warnings = list(self.warnings)
+        return timestamp
+
+    def __repr__(self) -> str:
+        return f"TimestampView(datetime={self.datetime!r}, condition_code={self.condition_code!r})"
+
+
+def _column_property(name: str) -> property:
+    def getter(self: TimestampView) -> Optional[float]:
+        value = self._data.columns[name][self._row]  # pylint: disable=protected-access
+        return None if math.isnan(value) else value
+
+    return property(getter, doc=f"{name} of the row, None when missing")
+
+
+for _name in NUMERIC_FIELDS:
+    setattr(TimestampView, _name, _column_property(_name))
+
+
+class ForecastView:
+    """Read-only Forecast of a place backed by snapshot rows
+
+    Like Forecast, current_conditions is the latest row before the next hour and
+    forecast_timestamps are the later rows, both decided when the view is created.
+    times and column give the rows of the place as zero copy memoryviews.
+    """
+
+    def __init__(self, data: _SnapshotData, position: int):
+        self._data = data
+        code, name, latitude, longitude, division, country, created, first, count = data.place_record(position)
+        self._place = (code, name, latitude, longitude, division, country)
+        self.forecast_created = data.string(created)
+        self.first_row = first
+        self.row_count = count
+
+        next_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        times = self.times
+        self._future = bisect_left(times, next_hour.timestamp())
+
+    @property
+    def place(self) -> Place:
+        """Place of the forecast"""
+        code, name, latitude, longitude, division, country = self._place
+        return Place(
+            code=self._data.string(code),
+            name=self._data.string(name),
+            coordinates=Coordinates(latitude=latitude, longitude=longitude),
+            administrative_division=self._data.string(division),
+            country_code=self._data.string(country),
+        )
+
+    @property
+    def times(self) -> memoryview:
+        """POSIX timestamps of all rows of the place"""
+        return self._data.times[self.first_row : self.first_row + self.row_count]
+
+    def column(self, name: str) -> memoryview:
+        """Values of a NUMERIC_FIELDS field for all rows of the place, NaN when missing"""
+        return self._data.columns[name][self.first_row : self.first_row + self.row_count]
+
+    @property
+    def current_conditions(self) -> Optional[TimestampView]:
+        """Row of the current hour, or the latest earlier one"""
+        if self._future == 0:
+            return None
+        return TimestampView(self._data, self.first_row + self._future - 1)
+
+    @property
+    def forecast_timestamps(self) -> List[TimestampView]:
+        """Rows after the current hour"""
+        return [
+            TimestampView(self._data, row)
+            for row in range(self.first_row + self._future, self.first_row + self.row_count)
+        ]
+
+    def to_forecast(self) -> Forecast:
+        """Copy into a Forecast"""
+        current = self.current_conditions
+        return Forecast(
+            place=self.place,
+            forecast_created=self.forecast_created,
+            current_conditions=current.to_timestamp() if current is not None else None,
+            forecast_timestamps=[timestamp.to_timestamp() for timestamp in self.forecast_timestamps],
+        )
+
+
+class ForecastSnapshot:
+    """Read-only memory-mapped forecasts written by write_snapshot
+
+    reload maps the file again when write_snapshot replaced it. Views keep the
+    snapshot they were created from, which is unmapped once no view refers to it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Optional[_SnapshotData] = _SnapshotData(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop using the snapshot"""
+        self._data = None
+
+    def reload(self) -> bool:
+        """Map the file again if it was replaced, True if it was"""
+        stat = os.stat(self.path)
+        current = self._data.stat if self._data is not None else None
+        if current is not None and (stat.st_ino, stat.st_dev, stat.st_mtime_ns, stat.st_size) == (
+            current.st_ino,
+            current.st_dev,
+            current.st_mtime_ns,
+            current.st_size,
+        ):
+            return False
+        self._data = _SnapshotData(self.path)
+        return True
+
+    @property
+    def data(self) -> _SnapshotData:
+        """Currently mapped snapshot"""
+        if self._data is None:
+            raise ValueError("Forecast snapshot is closed")
+        return self._data
+
+    def __len__(self) -> int:
+        return self.data.place_count
+
+    def __contains__(self, place_code: str) -> bool:
+        return self.data.find(place_code) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Place codes in sorted order"""
+        data = self.data
+        return (data.string(data.place_record(position)[0]) for position in range(data.place_count))
+
+    def get(self, place_code: str) -> Optional[ForecastView]:
+        """Forecast view of a place"""
+        data = self.data
+        position = data.find(place_code)
+        return ForecastView(data, position) if position is not None else None
@@ -0,0 +1,100 @@
+"""Blocking facade of MeteoLtAPI for synchronous code"""
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+from typing import Any, Coroutine, Iterator, Optional
+
+from .api import MeteoLtAPI
+
+
+class MeteoLtSyncAPI:
+    """MeteoLtAPI with blocking methods, safe to share between threads
+
+    One background thread runs an event loop that owns the MeteoLtAPI, so its
+    HTTP session, connections and caches are reused by all calls. Coroutine
+    methods of MeteoLtAPI block until their result is ready, async generator
+    methods become generators and other attributes are returned as they are.
+    Arguments are passed to MeteoLtAPI, timeout limits each call in seconds.
+    """
+
+    def __init__(self, *args, timeout: Optional[float] = None, **kwargs):
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="meteo-lt-loop", daemon=True)
+        self._thread.start()
+        self.api: MeteoLtAPI = self._call(self._create_api(args, kwargs))
+
+    @staticmethod
+    async def _create_api(args: tuple, kwargs: dict) -> MeteoLtAPI:
+        # The API and its session must be created on the loop they run on
+        return MeteoLtAPI(*args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the API session and stop the loop thread"""
+        if self._loop.is_closed():
+            return
+        try:
+            self._call(self.api.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def _call(self, coroutine: Coroutine) -> Any:
+        """Run coroutine on the loop thread and wait for its result"""
+        if self._loop.is_closed():
+            coroutine.close()
+            raise RuntimeError("MeteoLtSyncAPI is closed")
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("MeteoLtSyncAPI can not be called from its own event loop")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _iterate(self, generator) -> Iterator[Any]:
+        """Items of an async generator running on the loop thread"""
+        try:
+            while True:
+                try:
+                    yield self._call(generator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._loop.is_closed():
+                self._call(generator.aclose())
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "api" or name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(self.api, name)
+        if inspect.iscoroutinefunction(attribute):
+
+            @functools.wraps(attribute)
+            def call(*args, **kwargs):
+                return self._call(attribute(*args, **kwargs))
+
+            # Later lookups find the wrapper without calling __getattr__
+            setattr(self, name, call)
+            return call
+        if inspect.isasyncgenfunction(attribute):
+
+            @functools.wraps(attribute)
+            def iterate(*args, **kwargs):
+                return self._iterate(attribute(*args, **kwargs))
+
+            setattr(self, name, iterate)
+            return iterate
+        return attribute
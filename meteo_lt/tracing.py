@@ -0,0 +1,58 @@
+"""Optional tracing spans compatible with OpenTelemetry tracers
+
+Any object with an OpenTelemetry style start_as_current_span(name, attributes=None)
+context manager can be passed as tracer, e.g. opentelemetry.trace.get_tracer("meteo_lt").
+Without one, spans are no-ops.
+"""
+
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class NoopSpan:
+    """Span that records nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore attribute"""
+
+    def record_exception(self, exception: BaseException, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Ignore exception"""
+
+
+class NoopTracer:
+    """Tracer used when tracing is not configured"""
+
+    _span = NoopSpan()
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[NoopSpan]:
+        """Context manager yielding a span that records nothing"""
+        yield self._span
+
+
+NOOP_TRACER = NoopTracer()
+
+
+def traced(name: str) -> Callable:
+    """Wrap a method of an object with a tracer attribute in a span"""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                with self.tracer.start_as_current_span(name):
+                    return await func(self, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.start_as_current_span(name):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,36 +1,101 @@
 """utils.py"""
 
-from math import radians, sin, cos, sqrt, atan2
-from typing import List
-from meteo_lt.models import LocationBase
+import os
+import tempfile
+from contextlib import contextmanager
+from math import asin, atan2, cos, pi, radians, sin, sqrt
+from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    # Models store unit vectors computed here
+    from meteo_lt.models import LocationBase
+
+EARTH_RADIUS = 6371  # Radius of Earth in kilometers
 
 
 def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate the great-circle distance between two points on the Earth's surface."""
-    # Convert latitude and longitude from degrees to radians
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    lat1, lat2 = radians(lat1), radians(lat2)
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin(radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * atan2(sqrt(a), sqrt(1 - a))
+
+
+def unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere for coordinates in degrees"""
+    latitude, longitude = radians(latitude), radians(longitude)
+    cos_latitude = cos(latitude)
+    return cos_latitude * cos(longitude), cos_latitude * sin(longitude), sin(latitude)
+
+
+def squared_chord(vector: Tuple[float, float, float], other: Tuple[float, float, float]) -> float:
+    """Squared straight line distance between unit vectors
+
+    It grows with great-circle distance, so it ranks locations exactly without
+    any trigonometry, chord_distance converts it to km.
+    """
+    return (vector[0] - other[0]) ** 2 + (vector[1] - other[1]) ** 2 + (vector[2] - other[2]) ** 2
+
+
+def chord_distance(squared: float) -> float:
+    """Great-circle distance in km between unit vectors with the squared chord"""
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(squared) / 2))
 
-    # Haversine formula
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    r = 6371  # Radius of Earth in kilometers
-    return r * c
 
+def distance_chord(distance: float) -> float:
+    """Squared chord between unit vectors of points distance km apart"""
+    return (2 * sin(min(pi, distance / EARTH_RADIUS) / 2)) ** 2
 
-def find_nearest_location(latitude: float, longitude: float, locations: List[LocationBase]) -> LocationBase:
-    """Find the nearest location from a list of locations based on the given latitude and longitude."""
+
+def rectangle_radius(south: float, west: float, north: float, east: float) -> float:
+    """Upper bound of the distance in km from the center of a coordinate rectangle to any point of it
+
+    That is the distance along the meridian to the latitude of a point plus the
+    distance along that parallel, which is widest at the latitude nearest the equator.
+    """
+    widest = 1.0 if south <= 0 <= north else max(cos(radians(south)), cos(radians(north)))
+    return (radians(north - south) + radians(east - west) * widest) / 2 * EARTH_RADIUS
+
+
+def find_nearest_location(latitude: float, longitude: float, locations: List["LocationBase"]) -> "LocationBase":
+    """Find the nearest location from a list of locations based on the given latitude and longitude.
+
+    Locations without coordinates are skipped.
+    """
     nearest_location = None
-    min_distance = float("inf")
+    min_squared = float("inf")
 
+    # Ranking by squared chords to unit vectors precomputed on locations needs no trigonometry per location
+    x, y, z = unit_vector(latitude, longitude)
     for location in locations:
-        location_lat = location.latitude
-        location_lon = location.longitude
-        distance = haversine(latitude, longitude, location_lat, location_lon)
+        vector = location.unit_vector
+        if vector is None:
+            continue
+        location_x, location_y, location_z = vector
+        squared = (x - location_x) ** 2 + (y - location_y) ** 2 + (z - location_z) ** 2
 
-        if distance < min_distance:
-            min_distance = distance
+        if squared < min_squared:
+            min_squared = squared
             nearest_location = location
 
     return nearest_location
+
+
+@contextmanager
+def atomic_write(path: str, prefix: str = ".tmp-") -> Iterator[BinaryIO]:
+    """Binary file replacing path once the block completes without an exception
+
+    Data is written to a temporary file in the same directory, synced and renamed
+    over path, so readers see either the old or the new file, never a partial one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=prefix)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
@@ -1,66 +1,157 @@
 """Weather warnings processor for handling warning-related logic"""
 
 import re
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
+
+from .models import (
+    KNOWN_WARNING_AREAS,
+    Forecast,
+    HydroStation,
+    WeatherWarning,
+    division_warning_areas,
+    normalize_division,
+    parse_warning_time,
+)
+from .tracing import NOOP_TRACER, traced
+
+if TYPE_CHECKING:
+    # The client builds forecasts with enrich_forecast_for_place from this module
+    from .client import MeteoLtClient
+
+# Severity is a separate field, so it is removed from phenomenon, e.g. dangerous-wind is wind
+SEVERITY_PREFIX = re.compile(r"^(dangerous|severe|extreme)-")
+
+
+@dataclass
+class WarningsSnapshot:
+    """Meteorological and hydrological warnings parsed from the same warnings file
+
+    Hydrological warnings are indexed by area name.
+    """
+
+    weather: List[WeatherWarning] = field(default_factory=list)
+    hydrological: List[WeatherWarning] = field(default_factory=list)
+    hydrological_by_area: Dict[str, List[WeatherWarning]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.hydrological_by_area = {}
+        for warning in self.hydrological:
+            self.hydrological_by_area.setdefault(warning.county, []).append(warning)
+
+    def hydrological_for_area(self, area: str) -> List[WeatherWarning]:
+        """Hydrological warnings for an area"""
+        return list(self.hydrological_by_area.get(area, []))
+
+    def hydrological_for_station(self, station: HydroStation, place_index) -> List[WeatherWarning]:
+        """Hydrological warnings for areas around a station
+
+        A station is linked to the counties of its nearest place in place_index
+        and to an area named as its water body.
+        """
+        areas = [station.water_body]
+        nearest_place = None
+        if station.unit_vector is not None:
+            nearest_place = place_index.nearest(station.latitude, station.longitude)
+        if nearest_place is not None:
+            areas.extend(nearest_place.counties)
 
-from .models import Forecast, WeatherWarning
-from .const import COUNTY_MUNICIPALITIES
-from .client import MeteoLtClient
+        warnings = []
+        for area in dict.fromkeys(areas):
+            warnings.extend(self.hydrological_by_area.get(area, []))
+        return warnings
 
 
 class WeatherWarningsProcessor:
     """Processes weather warnings data and handles warning-related logic"""
 
-    def __init__(self, client: MeteoLtClient):
+    def __init__(self, client: "MeteoLtClient", tracer=None):
         self.client = client
+        self.tracer = tracer or NOOP_TRACER
 
+    @traced("meteo_lt.get_weather_warnings")
     async def get_weather_warnings(self, administrative_division: str = None) -> List[WeatherWarning]:
         """Fetches and processes weather warnings"""
         warnings_data = await self.client.fetch_weather_warnings()
-        warnings = self._parse_warnings_data(warnings_data)
-
         # Filter by administrative division if specified
-        if administrative_division:
-            warnings = [w for w in warnings if self._warning_affects_area(w, administrative_division)]
+        return self._parse_warnings_data(warnings_data, administrative_division)
 
-        return warnings
-
-    def _parse_warnings_data(self, warnings_data: Optional[Dict[str, Any]]) -> List[WeatherWarning]:
-        """Parse raw warnings data into WeatherWarning objects"""
-        warnings = []
+    @traced("meteo_lt.get_warnings_snapshot")
+    async def get_warnings_snapshot(self) -> "WarningsSnapshot":
+        """Fetches warnings once and processes both meteorological and hydrological ones"""
+        warnings_data = await self.client.fetch_weather_warnings()
+        return self.parse_warnings_snapshot(warnings_data)
+
+    def parse_warnings_snapshot(self, warnings_data: Optional[Dict[str, Any]]) -> "WarningsSnapshot":
+        """Parse raw warnings data into meteorological and hydrological warnings"""
+        return self._parse_warnings(warnings_data, include_hydrological=True)
+
+    def _parse_warnings_data(
+        self, warnings_data: Optional[Dict[str, Any]], administrative_division: Optional[str] = None
+    ) -> List[WeatherWarning]:
+        """Parse raw warnings data into meteorological WeatherWarning objects"""
+        return self._parse_warnings(warnings_data, administrative_division).weather
+
+    @traced("meteo_lt.parse_warnings")
+    def _parse_warnings(
+        self,
+        warnings_data: Optional[Dict[str, Any]],
+        administrative_division: Optional[str] = None,
+        include_hydrological: bool = False,
+    ) -> "WarningsSnapshot":
+        """Parse raw warnings data into WeatherWarning objects
+
+        Fields shared by all areas of an alert are built once per alert. With
+        administrative_division only meteorological warnings for areas affecting
+        it are created, hydrological warnings are never filtered by division.
+        """
+        weather = []
+        hydrological = []
 
         # Handle empty response (list instead of dict)
         if not warnings_data or isinstance(warnings_data, list):
-            return warnings
+            return WarningsSnapshot(weather, hydrological)
+
+        area_matches = {}
 
         # Parse the warnings data
         for phenomenon_group in warnings_data.get("phenomenon_groups", []):
-            # Skip hydrological warnings if needed (they're usually for water levels)
-            if phenomenon_group.get("phenomenon_category") == "hydrological":
+            # Hydrological warnings are about water levels, they go to a separate list
+            is_hydrological = phenomenon_group.get("phenomenon_category") == "hydrological"
+            if is_hydrological and not include_hydrological:
                 continue
+            warnings = hydrological if is_hydrological else weather
 
             for area_group in phenomenon_group.get("area_groups", []):
+                counties = []
+                for area in area_group.get("areas", []):
+                    county = area.get("name", "Unknown")
+                    if administrative_division and not is_hydrological:
+                        if county not in area_matches:
+                            area_matches[county] = self._area_affects_division(county, administrative_division)
+                        if not area_matches[county]:
+                            continue
+                    counties.append(county)
+                if not counties:
+                    continue
+
                 for alert in area_group.get("single_alerts", []):
                     # Skip alerts with no phenomenon or empty descriptions
                     if not alert.get("phenomenon") or not alert.get("description", {}).get("lt"):
                         continue
 
                     # Create warnings for each area in the group
-                    for area in area_group.get("areas", []):
-                        warning = self._create_warning_from_alert(alert, area)
-                        if warning:
-                            warnings.append(warning)
+                    alert_fields = self._alert_fields(alert)
+                    warnings.extend(WeatherWarning(county=county, **alert_fields) for county in counties)
 
-        return warnings
+        return WarningsSnapshot(weather, hydrological)
 
-    def _create_warning_from_alert(self, alert: Dict[str, Any], area: Dict[str, Any]) -> WeatherWarning:
-        """Create a WeatherWarning from alert data"""
-        county = area.get("name", "Unknown")
+    @staticmethod
+    def _alert_fields(alert: Dict[str, Any]) -> Dict[str, Any]:
+        """WeatherWarning fields shared by all areas of an alert"""
         phenomenon = alert.get("phenomenon", "")
-        severity = alert.get("severity", "Minor")
-
-        warning_type = re.sub(r"^(dangerous|severe|extreme)-", "", phenomenon)
 
         desc_dict = alert.get("description", {})
         inst_dict = alert.get("instruction", {})
@@ -72,35 +163,38 @@ class WeatherWarningsProcessor:
         if instruction:
             full_description += f"\n\nRecommendations: {instruction}"
 
-        return WeatherWarning(
-            county=county,
-            warning_type=warning_type,
-            severity=severity,
-            description=full_description,
-            start_time=alert.get("t_from"),
-            end_time=alert.get("t_to"),
-        )
+        start_time = alert.get("t_from")
+        end_time = alert.get("t_to")
+        return {
+            "warning_type": sys.intern(SEVERITY_PREFIX.sub("", phenomenon)),
+            "severity": sys.intern(alert.get("severity", "Minor")),
+            "description": full_description,
+            "start_time": start_time,
+            "end_time": end_time,
+            "start_datetime": parse_warning_time(start_time),
+            "end_datetime": parse_warning_time(end_time),
+        }
+
+    def _create_warning_from_alert(self, alert: Dict[str, Any], area: Dict[str, Any]) -> WeatherWarning:
+        """Create a WeatherWarning from alert data"""
+        return WeatherWarning(county=area.get("name", "Unknown"), **self._alert_fields(alert))
 
     def _warning_affects_area(self, warning: WeatherWarning, administrative_division: str) -> bool:
         """Check if warning affects specified administrative division"""
-        admin_lower = administrative_division.lower().replace(" savivaldybė", "").replace(" sav.", "")
-
-        # Check if the administrative division matches the warning county
-        if admin_lower in warning.county.lower():
-            return True
+        return self._area_affects_division(warning.county, administrative_division)
 
-        # Check if the administrative division is in the warning's county municipalities
-        if warning.county in COUNTY_MUNICIPALITIES:
-            municipalities = COUNTY_MUNICIPALITIES[warning.county]
-            for municipality in municipalities:
-                mun_clean = municipality.lower().replace(" savivaldybė", "").replace(" sav.", "")
-                if admin_lower in mun_clean or mun_clean in admin_lower:
-                    return True
-
-        return False
+    @staticmethod
+    def _area_affects_division(area: str, administrative_division: str) -> bool:
+        """Check if warning area affects specified administrative division"""
+        if area in KNOWN_WARNING_AREAS:
+            return area in division_warning_areas(administrative_division)
+        return normalize_division(administrative_division) in area.lower()
 
+    @traced("meteo_lt.match_forecast_warnings")
     def enrich_forecast_with_warnings(self, forecast: Forecast, warnings: List[WeatherWarning]) -> None:
         """Enrich forecast timestamps with relevant weather warnings"""
+        # Warnings without valid period can never apply
+        warnings = [w for w in warnings if w.start_datetime and w.end_datetime]
         if not warnings:
             return
 
@@ -118,26 +212,30 @@ class WeatherWarningsProcessor:
         """Get warnings that are active for a specific timestamp"""
         try:
             timestamp = datetime.fromisoformat(timestamp_str).replace(tzinfo=timezone.utc)
-            applicable_warnings = []
-
-            for warning in warnings:
-                if not warning.start_time or not warning.end_time:
-                    continue
-
-                try:
-                    start_time = datetime.fromisoformat(warning.start_time.replace("Z", "+00:00"))
-                    end_time = datetime.fromisoformat(warning.end_time.replace("Z", "+00:00"))
-
-                    # Check if timestamp falls within warning period
-                    if start_time <= timestamp <= end_time:
-                        applicable_warnings.append(warning)
-
-                except (ValueError, AttributeError):
-                    # Skip warnings with invalid time formats
-                    continue
-
-            return applicable_warnings
-
-        except (ValueError, AttributeError):
+        except (ValueError, TypeError):
             # Return empty list if timestamp parsing fails
             return []
+
+        # Check if timestamp falls within warning period, warnings with invalid times are skipped
+        return [
+            warning
+            for warning in warnings
+            if warning.start_datetime
+            and warning.end_datetime
+            and warning.start_datetime <= timestamp <= warning.end_datetime
+        ]
+
+
+def enrich_forecast_for_place(forecast: Forecast, warnings: List[WeatherWarning]) -> Forecast:
+    """Attach warnings affecting the administrative division of the forecast place
+
+    Returns the forecast, so executors can run it, including process pools.
+    """
+    if not forecast or not forecast.place or not forecast.place.administrative_division:
+        return forecast
+
+    areas = forecast.place.matching_warning_areas({w.county for w in warnings})
+    warnings = [w for w in warnings if w.county in areas]
+    if warnings:
+        WeatherWarningsProcessor(None).enrich_forecast_with_warnings(forecast, warnings)
+    return forecast
@@ -0,0 +1,101 @@
+"""Warnings change feed"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from .models import WeatherWarning
+from .warnings import WarningsSnapshot, WeatherWarningsProcessor
+from .const import WARNINGS_POLL_INTERVAL
+
+WarningKey = Tuple[str, str, str, Optional[str], int]
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+@dataclass
+class WarningChange:
+    """Warning added, removed or changed between two warnings files"""
+
+    change: str  # added, removed or changed
+    category: str  # weather or hydrological
+    warning: WeatherWarning  # removed warnings are the previous ones
+    previous: Optional[WeatherWarning] = None  # only for changed warnings
+
+
+def warning_keys(snapshot: WarningsSnapshot) -> Dict[WarningKey, WeatherWarning]:
+    """Warnings of a snapshot keyed by category, area, type and start time
+
+    Warnings with the same key are told apart by their order in the file.
+    """
+    keyed = {}
+    for category, warnings in (("weather", snapshot.weather), ("hydrological", snapshot.hydrological)):
+        occurrences = {}
+        for warning in warnings:
+            key = (category, warning.county, warning.warning_type, warning.start_time)
+            occurrence = occurrences[key] = occurrences.get(key, -1) + 1
+            keyed[key + (occurrence,)] = warning
+    return keyed
+
+
+def diff_warnings(
+    previous: Dict[WarningKey, WeatherWarning], current: Dict[WarningKey, WeatherWarning]
+) -> List[WarningChange]:
+    """Changes between keyed warnings, removed ones first"""
+    changes = [WarningChange(REMOVED, key[0], warning) for key, warning in previous.items() if key not in current]
+    for key, warning in current.items():
+        old = previous.get(key)
+        if old is None:
+            changes.append(WarningChange(ADDED, key[0], warning))
+        elif old != warning:
+            changes.append(WarningChange(CHANGED, key[0], warning, old))
+    return changes
+
+
+class WarningsWatcher:
+    """Polls the warnings list and emits changes when a new warnings file appears
+
+    The warnings file is downloaded only when the list points to a new one. With
+    emit_initial the first poll reports all current warnings as added, otherwise
+    they only become the baseline. Iterating polls forever; after an error is
+    raised iteration can be started again and continues from the last snapshot.
+    """
+
+    def __init__(
+        self,
+        processor: WeatherWarningsProcessor,
+        interval: float = WARNINGS_POLL_INTERVAL,
+        emit_initial: bool = True,
+    ):
+        self.processor = processor
+        self.interval = interval
+        self.emit_initial = emit_initial
+        self.file_url: Optional[str] = None
+        self.snapshot: Optional[WarningsSnapshot] = None
+        self._warnings: Dict[WarningKey, WeatherWarning] = {}
+
+    async def poll(self) -> List[WarningChange]:
+        """Check the warnings list once and return changes since the previous file"""
+        client = self.processor.client
+        file_list = await client.fetch_warnings_file_list()
+        file_url = file_list[0] if file_list else None
+        if self.snapshot is not None and file_url == self.file_url:
+            return []
+
+        warnings_data = await client.fetch_warnings_file(file_url) if file_url else []
+        snapshot = self.processor.parse_warnings_snapshot(warnings_data)
+        warnings = warning_keys(snapshot)
+        changes = diff_warnings(self._warnings, warnings)
+        if self.snapshot is None and not self.emit_initial:
+            changes = []
+
+        self.file_url, self.snapshot, self._warnings = file_url, snapshot, warnings
+        return changes
+
+    async def __aiter__(self) -> AsyncIterator[WarningChange]:
+        while True:
+            for change in await self.poll():
+                yield change
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,95 @@
+"""Shared test fixtures"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+
+from meteo_lt.models import Coordinates, Forecast, ForecastTimestamp, Place
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now is fixed at the class attribute current, pickled as a plain datetime"""
+
+    current: datetime
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current.astimezone(tz)
+
+    def __reduce_ex__(self, protocol):
+        return datetime, super().__reduce_ex__(protocol)[1]
+
+
+@pytest.fixture(name="start")
+def start_fixture(monkeypatch):
+    """Start of the current hour, with the clock of models and snapshots stopped in its middle
+
+    Forecasts drop timestamps before the current hour when created, so forecasts
+    built around start keep the same timestamps even when the hour changes while
+    tests run.
+    """
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    monkeypatch.setattr(_FrozenDatetime, "current", start + timedelta(minutes=30), raising=False)
+    monkeypatch.setattr("meteo_lt.models.datetime", _FrozenDatetime)
+    monkeypatch.setattr("meteo_lt.snapshot.datetime", _FrozenDatetime)
+    return start
+
+
+@pytest.fixture(name="make_place")
+def make_place_fixture():
+    """Factory of Lithuanian places named after their code, in Vilnius unless given other coordinates"""
+
+    def make_place(
+        code: str,
+        latitude: float = 54.68,
+        longitude: float = 25.28,
+        division: str = "Vilniaus miesto savivaldybė",
+    ) -> Place:
+        return Place(
+            code=code,
+            name=code.title(),
+            coordinates=Coordinates(latitude=latitude, longitude=longitude),
+            administrative_division=division,
+            country_code="LT",
+        )
+
+    return make_place
+
+
+@pytest.fixture(name="make_timestamp")
+def make_timestamp_fixture(start):
+    """Factory of clear weather forecast timestamps the given hours after start, values override fields"""
+
+    def make_timestamp(hours: int, **values) -> ForecastTimestamp:
+        fields = {
+            "temperature": 10.0,
+            "apparent_temperature": 8.0,
+            "condition_code": "clear",
+            "wind_speed": 3.0,
+            "wind_gust_speed": 6.0,
+            "wind_bearing": 350,
+            "cloud_coverage": 20,
+            "pressure": 1012,
+            "humidity": 70,
+            "precipitation": 0.0,
+        }
+        fields.update(values)
+        return ForecastTimestamp(datetime=(start + timedelta(hours=hours)).isoformat(), **fields)
+
+    return make_timestamp
+
+
+@pytest.fixture(name="make_forecast")
+def make_forecast_fixture(start, make_place):
+    """Factory of forecasts created at start, place values are passed to make_place"""
+
+    def make_forecast(code: str, timestamps: List[ForecastTimestamp], **place) -> Forecast:
+        return Forecast(
+            place=make_place(code, **place),
+            forecast_created=start.isoformat(),
+            current_conditions=timestamps[0] if timestamps else None,
+            forecast_timestamps=timestamps,
+        )
+
+    return make_forecast
@@ -0,0 +1,101 @@
+"""Forecast aggregate tests"""
+
+import math
+from datetime import timedelta
+
+import pytest
+
+from meteo_lt.aggregate import ForecastAggregator, aggregate_forecasts
+from meteo_lt.models import Forecast
+
+
+@pytest.fixture(name="first")
+def first_fixture(start):
+    """Time of the first forecast timestamp, two hours after the current one"""
+    return start + timedelta(hours=2)
+
+
+@pytest.fixture(name="forecasts")
+def forecasts_fixture(make_timestamp, make_forecast):
+    """Two places in Kauno apskritis, one in Klaipėdos apskritis and the Baltic coast area, 6 hour steps"""
+
+    def forecast(code: str, division: str, gusts, precipitation) -> Forecast:
+        timestamps = [
+            make_timestamp(
+                2 + 6 * index,
+                condition_code="cloudy",
+                wind_gust_speed=gust,
+                wind_bearing=180,
+                cloud_coverage=80,
+                pressure=1010,
+                humidity=75,
+                precipitation=amount,
+            )
+            for index, (gust, amount) in enumerate(zip(gusts, precipitation))
+        ]
+        return make_forecast(code, timestamps, latitude=55.0, longitude=24.0, division=division)
+
+    return [
+        forecast("kaunas", "Kauno miesto savivaldybė", [5, 9, 7, 3, 4, 2], [0.5, 1.0, 0.0, 0.5, 2.0, 0.0]),
+        forecast("garliava", "Kauno rajono savivaldybė", [6, 8, 12, None, 1, 2], [1.5, 0.0, None, 0.5, 0.0, 1.0]),
+        forecast("gargzdai", "Klaipėdos rajono savivaldybė", [15, 11, 9, 8, 7, 6], [3.0, 3.0, 2.0, 0.0, 0.0, 0.0]),
+    ]
+
+
+def test_max_gust_per_county(first, forecasts):
+    """Test maximum over time and places per county and day"""
+    result = aggregate_forecasts(forecasts, "wind_gust_speed", "max", "max")
+
+    assert result.datetimes() == [first.isoformat(), (first + timedelta(days=1)).isoformat()]
+    assert result.window == 24 * 60 * 60
+    assert list(result.values["Kauno apskritis"]) == [12, 4]
+    assert list(result.values["Klaipėdos apskritis"]) == [15, 7]
+    assert list(result.values["Pietryčių Baltija, Kuršių marios"]) == [15, 7]
+
+
+def test_precipitation_per_division(first, forecasts):
+    """Test sums over time averaged across places, skipping missing values"""
+    aggregator = ForecastAggregator(forecasts, by="administrative_division")
+    result = aggregator.aggregate("precipitation", "sum", "mean", window=timedelta(hours=12))
+
+    assert list(result.values["Kauno rajono savivaldybė"]) == [1.5, 0.5, 1.0]
+    assert result.to_dict()["Kauno miesto savivaldybė"] == {
+        first.isoformat(): 1.5,
+        (first + timedelta(hours=12)).isoformat(): 0.5,
+        (first + timedelta(hours=24)).isoformat(): 2.0,
+    }
+
+    result = aggregator.aggregate("precipitation", "max", window=6 * 60 * 60, start=first + timedelta(hours=12))
+    assert list(result.values["Kauno rajono savivaldybė"]) == [pytest.approx(math.nan, nan_ok=True), 0.5, 0, 1.0]
+    assert (first + timedelta(hours=12)).isoformat() not in result.to_dict()["Kauno rajono savivaldybė"]
+
+
+def test_time_range(first, forecasts):
+    """Test windows limited by end and with no values"""
+    result = aggregate_forecasts(
+        forecasts,
+        "wind_gust_speed",
+        "min",
+        "min",
+        window=timedelta(hours=12),
+        start=first - timedelta(hours=12),
+        end=first + timedelta(hours=6),
+    )
+
+    assert len(result.starts) == 2
+    assert math.isnan(result.values["Kauno apskritis"][0])
+    assert result.values["Kauno apskritis"][1] == 5
+    assert aggregate_forecasts([], "temperature").values == {}
+
+
+def test_invalid_arguments(forecasts):
+    """Test rejecting unknown fields, functions, groupings and windows"""
+    aggregator = ForecastAggregator(forecasts)
+    with pytest.raises(ValueError):
+        aggregator.aggregate("condition_code")
+    with pytest.raises(ValueError):
+        aggregator.aggregate("temperature", "median")
+    with pytest.raises(ValueError):
+        aggregator.aggregate("temperature", window=0)
+    with pytest.raises(ValueError):
+        ForecastAggregator(forecasts, by="country")
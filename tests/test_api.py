@@ -2,11 +2,17 @@
 
 # pylint: disable=protected-access
 
+import asyncio
+import json
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from meteo_lt.api import MeteoLtAPI
+from meteo_lt.api import HydroObservationError, MeteoLtAPI
 from meteo_lt.const import BASE_URL
+from meteo_lt.metrics import ClientMetrics
 from meteo_lt.models import (
     Place,
     Coordinates,
@@ -15,6 +21,7 @@ from meteo_lt.models import (
     HydroStation,
     HydroObservationData,
     HydroObservation,
+    WeatherWarning,
 )
 
 
@@ -37,7 +44,7 @@ class TestMeteoLtAPI(unittest.IsolatedAsyncioTestCase):
         self.assertEqual("lapes", nearest_place.code)
         self.assertEqual("LT", nearest_place.country_code)
         self.assertEqual("Kauno rajono savivaldybė", nearest_place.administrative_division)
-        self.assertEqual(["Kauno apskritis"], nearest_place.counties)
+        self.assertEqual(("Kauno apskritis",), nearest_place.counties)
         print(nearest_place)
 
     async def test_get_forecast(self):
@@ -56,16 +63,18 @@ class TestMeteoLtAPI(unittest.IsolatedAsyncioTestCase):
 
         mock_response = AsyncMock()
         mock_response.raise_for_status = MagicMock()
-        mock_response.json = AsyncMock(
-            return_value=[
-                {
-                    "code": "test",
-                    "name": "Test",
-                    "administrativeDivision": "Test savivaldybė",
-                    "countryCode": "LT",
-                    "coordinates": {"latitude": 1.0, "longitude": 2.0},
-                }
-            ]
+        mock_response.read = AsyncMock(
+            return_value=json.dumps(
+                [
+                    {
+                        "code": "test",
+                        "name": "Test",
+                        "administrativeDivision": "Test savivaldybė",
+                        "countryCode": "LT",
+                        "coordinates": {"latitude": 1.0, "longitude": 2.0},
+                    }
+                ]
+            ).encode()
         )
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -81,6 +90,83 @@ class TestMeteoLtAPI(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(api.places), 1)
         self.assertEqual(api.places[0].code, "test")
 
+    async def test_place_lookups(self):
+        """Test place lookups by code and name prefix"""
+        with patch.object(self.meteo_lt_api.client, "fetch_places") as mock_fetch:
+            mock_fetch.return_value = [
+                Place(
+                    code="siauliai",
+                    name="Šiauliai",
+                    country_code="LT",
+                    administrative_division="Šiaulių miesto savivaldybė",
+                    coordinates=Coordinates(latitude=55.93, longitude=23.31),
+                )
+            ]
+
+            self.assertEqual((await self.meteo_lt_api.get_place("siauliai")).name, "Šiauliai")
+            self.assertEqual([p.code for p in await self.meteo_lt_api.search_places("sia")], ["siauliai"])
+            self.assertEqual((await self.meteo_lt_api.get_nearest_place(55.9, 23.3)).code, "siauliai")
+            mock_fetch.assert_called_once()
+
+    async def test_nearest_place_cache(self):
+        """Test that nearest place lookups in one cell are cached and counted in metrics"""
+        places = [
+            Place(
+                code=code,
+                name=code.title(),
+                country_code="LT",
+                administrative_division="Vilniaus miesto savivaldybė",
+                coordinates=Coordinates(latitude=latitude, longitude=25.28),
+            )
+            for code, latitude in (("vilnius", 54.68), ("kaunas", 54.9))
+        ]
+        metrics = ClientMetrics()
+        api = MeteoLtAPI(metrics=metrics)
+        api.places = places
+
+        self.assertEqual((await api.get_nearest_place(54.681, 25.281)).code, "vilnius")
+        self.assertEqual((await api.get_nearest_place(54.682, 25.282)).code, "vilnius")
+        self.assertEqual(metrics.cache[("nearest_place", False)], 1)
+        self.assertEqual(metrics.cache[("nearest_place", True)], 1)
+
+        api.places = places[1:]
+        self.assertEqual(len(api.nearest_place_cache), 0)
+        self.assertEqual((await api.get_nearest_place(54.681, 25.281)).code, "kaunas")
+        await api.close()
+
+        api = MeteoLtAPI(nearest_cell_size=None)
+        api.places = places
+        self.assertIsNone(api.nearest_place_cache)
+        self.assertEqual((await api.get_nearest_place(54.681, 25.281)).code, "vilnius")
+        await api.close()
+
+    async def test_place_grid(self):
+        """Test building, saving and loading the nearest place grid"""
+        places = [
+            Place(
+                code=code,
+                name=code.title(),
+                country_code="LT",
+                administrative_division="Vilniaus miesto savivaldybė",
+                coordinates=Coordinates(latitude=latitude, longitude=longitude),
+            )
+            for code, latitude, longitude in (("vilnius", 54.68, 25.28), ("kaunas", 54.9, 23.9))
+        ]
+        self.meteo_lt_api.places = places
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.bin")
+            grid = await self.meteo_lt_api.build_place_grid(path, cell_size=0.05)
+            self.assertIs(self.meteo_lt_api.place_grid, grid)
+            self.assertEqual((await self.meteo_lt_api.get_nearest_place(54.7, 25.0)).code, "vilnius")
+            self.assertEqual((await self.meteo_lt_api.get_nearest_place(60.0, 20.0)).code, "kaunas")
+
+            self.meteo_lt_api.places = list(places)
+            self.assertIsNone(self.meteo_lt_api.place_grid)
+            loaded = await self.meteo_lt_api.load_place_grid(path)
+            self.assertEqual(loaded.cells, grid.cells)
+            self.assertIs(loaded.nearest(54.9, 24.0), self.meteo_lt_api.places[1])
+
     async def test_context_manager(self):
         """Test async context manager"""
         async with MeteoLtAPI() as api:
@@ -245,7 +331,7 @@ class TestMeteoLtAPI(unittest.IsolatedAsyncioTestCase):
 
     async def test_get_nearest_hydro_station(self):
         """Test getting nearest hydro station"""
-        with patch.object(self.meteo_lt_api, "get_hydro_stations") as mock_get:
+        with patch.object(self.meteo_lt_api.client, "fetch_hydro_stations") as mock_get:
             mock_station = HydroStation(
                 code="test_code",
                 name="Test Station",
@@ -260,7 +346,7 @@ class TestMeteoLtAPI(unittest.IsolatedAsyncioTestCase):
 
     async def test_get_nearest_hydro_station_no_stations(self):
         """Test getting nearest hydro station when no stations exist"""
-        with patch.object(self.meteo_lt_api, "get_hydro_stations") as mock_get:
+        with patch.object(self.meteo_lt_api.client, "fetch_hydro_stations") as mock_get:
             mock_get.return_value = []
 
             result = await self.meteo_lt_api.get_nearest_hydro_station(1.0, 2.0)
@@ -294,6 +380,196 @@ class TestMeteoLtAPI(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(result, mock_obs_data)
             mock_fetch.assert_called_once_with("station_1", "measured", "latest")
 
+    async def test_get_hydro_stations_cached(self):
+        """Test that hydro stations are fetched once for concurrent callers and reused"""
+        with patch.object(self.meteo_lt_api.client, "fetch_hydro_stations") as mock_fetch:
+            mock_station = HydroStation(
+                code="station_1",
+                name="Station 1",
+                water_body="River",
+                coordinates=Coordinates(latitude=54.0, longitude=24.0),
+            )
+
+            async def fetch():
+                await asyncio.sleep(0.01)
+                return [mock_station]
+
+            mock_fetch.side_effect = fetch
+
+            results = await asyncio.gather(*(self.meteo_lt_api.get_hydro_stations() for _ in range(5)))
+            result = await self.meteo_lt_api.get_hydro_stations()
+
+            self.assertEqual(results, [[mock_station]] * 5)
+            self.assertEqual(result, [mock_station])
+            mock_fetch.assert_called_once()
+
+    async def test_hydro_stations_cache_expiry(self):
+        """Test that expired hydro stations list is downloaded again"""
+        with patch.object(self.meteo_lt_api.client, "fetch_hydro_stations") as mock_fetch:
+            mock_station = HydroStation(
+                code="station_1",
+                name="Station 1",
+                water_body="Nemunas",
+                coordinates=Coordinates(latitude=54.0, longitude=24.0),
+            )
+            mock_fetch.return_value = [mock_station]
+
+            self.assertEqual(await self.meteo_lt_api.get_hydro_station("station_1"), mock_station)
+            self.assertIsNone(await self.meteo_lt_api.get_hydro_station("missing"))
+            self.assertEqual(await self.meteo_lt_api.get_hydro_stations_by_water_body("nemunas"), [mock_station])
+            mock_fetch.assert_called_once()
+
+            self.meteo_lt_api.hydro_stations_ttl = 0
+            self.meteo_lt_api._hydro_stations_updated -= 1
+            await self.meteo_lt_api.get_hydro_stations()
+            self.assertEqual(mock_fetch.call_count, 2)
+
+    async def test_iter_hydro_observation_data(self):
+        """Test streaming observation data for all cached stations"""
+        stations = [
+            HydroStation(
+                code=f"station_{i}",
+                name=f"Station {i}",
+                water_body="River",
+                coordinates=Coordinates(latitude=54.0 + i, longitude=24.0),
+            )
+            for i in range(5)
+        ]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fetch_observations(station_code, observation_type, date):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            station = next(s for s in stations if s.code == station_code)
+            return HydroObservationData(station=station, observations=[])
+
+        with (
+            patch.object(self.meteo_lt_api.client, "fetch_hydro_stations") as mock_stations,
+            patch.object(
+                self.meteo_lt_api.client, "fetch_hydro_observation_data", side_effect=fetch_observations
+            ) as mock_fetch,
+        ):
+            mock_stations.return_value = stations
+
+            results = [data async for data in self.meteo_lt_api.iter_hydro_observation_data(max_concurrency=2)]
+
+            self.assertEqual({data.station.code for data in results}, {s.code for s in stations})
+            self.assertEqual(max_in_flight, 2)
+            self.assertEqual(mock_fetch.call_count, 5)
+            mock_stations.assert_called_once()
+
+    async def test_iter_hydro_observation_data_exceptions(self):
+        """Test failed stations in observation data stream"""
+        station = HydroStation(
+            code="station_1",
+            name="Station 1",
+            water_body="River",
+            coordinates=Coordinates(latitude=54.0, longitude=24.0),
+        )
+
+        async def fetch_observations(station_code, observation_type, date):
+            if station_code == "broken":
+                raise ValueError("broken station")
+            return HydroObservationData(station=station, observations=[])
+
+        with patch.object(self.meteo_lt_api.client, "fetch_hydro_observation_data", side_effect=fetch_observations):
+            results = [
+                data
+                async for data in self.meteo_lt_api.iter_hydro_observation_data(
+                    ["station_1", "broken"], return_exceptions=True
+                )
+            ]
+            self.assertEqual(len(results), 2)
+            errors = [result for result in results if isinstance(result, HydroObservationError)]
+            self.assertEqual([error.station_code for error in errors], ["broken"])
+            self.assertIsInstance(errors[0].error, ValueError)
+            self.assertIs(errors[0].__cause__, errors[0].error)
+
+            with self.assertRaises(ValueError):
+                async for _ in self.meteo_lt_api.iter_hydro_observation_data(["station_1", "broken"]):
+                    pass
+
+        with self.assertRaises(ValueError):
+            async for _ in self.meteo_lt_api.iter_hydro_observation_data(["station_1"], max_concurrency=0):
+                pass
+
+    async def test_get_hydro_warnings(self):
+        """Test hydrological warnings for a station"""
+        self.meteo_lt_api.places = [
+            Place(
+                code="kaunas",
+                name="Kaunas",
+                administrative_division="Kauno miesto savivaldybė",
+                country_code="LT",
+                coordinates=Coordinates(latitude=54.9, longitude=23.9),
+            )
+        ]
+        self.meteo_lt_api.hydro_stations = [
+            HydroStation(
+                code="kauno-vms",
+                name="Kaunas",
+                water_body="Nemunas",
+                coordinates=Coordinates(latitude=54.88, longitude=23.88),
+            )
+        ]
+        warnings_data = {
+            "phenomenon_groups": [
+                {
+                    "phenomenon_category": "hydrological",
+                    "area_groups": [
+                        {
+                            "areas": [{"name": "Kauno apskritis"}, {"name": "Vilniaus apskritis"}],
+                            "single_alerts": [
+                                {
+                                    "phenomenon": "high-water-level",
+                                    "severity": "Minor",
+                                    "description": {"lt": "Aukštas vandens lygis"},
+                                    "t_from": "2025-09-30T12:00:00Z",
+                                    "t_to": "2025-10-02T12:00:00Z",
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+        with patch.object(self.meteo_lt_api.client, "fetch_weather_warnings", return_value=warnings_data):
+            warnings = await self.meteo_lt_api.get_hydro_warnings()
+            self.assertEqual([w.county for w in warnings], ["Kauno apskritis", "Vilniaus apskritis"])
+
+            warnings = await self.meteo_lt_api.get_hydro_warnings("kauno-vms")
+            self.assertEqual([w.county for w in warnings], ["Kauno apskritis"])
+
+            self.assertEqual(await self.meteo_lt_api.get_hydro_warnings("unknown"), [])
+            self.assertEqual(await self.meteo_lt_api.get_weather_warnings(), [])
+
+    async def test_get_forecast_with_executor(self):
+        """Test that with an executor warnings are fetched first and passed to the forecast build"""
+        api = MeteoLtAPI(executor=ThreadPoolExecutor(1))
+        warnings = [
+            WeatherWarning(county="Kauno apskritis", warning_type="wind", severity="Moderate", description="Wind")
+        ]
+        forecast = MagicMock()
+
+        with (
+            patch.object(api, "get_weather_warnings", return_value=warnings) as mock_warnings,
+            patch.object(api.client, "fetch_forecast", return_value=forecast) as mock_fetch,
+        ):
+            self.assertIs(await api.get_forecast("kaunas"), forecast)
+            mock_warnings.assert_called_once_with()
+            mock_fetch.assert_called_once_with("kaunas", warnings)
+
+            await api.get_forecast("kaunas", include_warnings=False)
+            mock_fetch.assert_called_with("kaunas")
+
+        api.client.executor.shutdown()
+        await api.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@
 # pylint: disable=redefined-outer-name
 
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 
@@ -10,6 +11,8 @@ import aiohttp
 import pytest
 
 from meteo_lt.client import MeteoLtClient
+from meteo_lt.metrics import ClientMetrics
+from meteo_lt.models import WeatherWarning
 
 
 @pytest.fixture
@@ -33,7 +36,7 @@ async def test_fetch_places(client):
 
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = mock_places_data
+        mock_response.read.return_value = json.dumps(mock_places_data).encode()
         mock_response.raise_for_status.return_value = None
         mock_response.encoding = "utf-8"
         mock_get.return_value.__aenter__.return_value = mock_response
@@ -46,6 +49,27 @@ async def test_fetch_places(client):
         assert places[0].name == "Lapės"
 
 
+@pytest.mark.asyncio
+async def test_custom_base_urls():
+    """Test fetching from configured API and warnings URLs"""
+    client = MeteoLtClient(base_url="http://localhost:8080/v1", warnings_url="http://localhost:8080/warnings")
+
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = AsyncMock()
+        mock_response.read.return_value = b"[]"
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        async with client:
+            await client.fetch_places()
+            await client.fetch_weather_warnings()
+
+        assert [call.args[0] for call in mock_get.call_args_list] == [
+            "http://localhost:8080/v1/places",
+            "http://localhost:8080/warnings",
+        ]
+
+
 @pytest.mark.asyncio
 async def test_fetch_forecast(client):
     """Test fetching forecast from API"""
@@ -80,7 +104,7 @@ async def test_fetch_forecast(client):
 
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = mock_forecast_data
+        mock_response.read.return_value = json.dumps(mock_forecast_data).encode()
         mock_response.raise_for_status.return_value = None
         mock_response.encoding = "utf-8"
         mock_get.return_value.__aenter__.return_value = mock_response
@@ -127,12 +151,12 @@ async def test_fetch_weather_warnings(client):
     with patch("aiohttp.ClientSession.get") as mock_get:
         # Mock the file list response
         mock_list_response = AsyncMock()
-        mock_list_response.json.return_value = mock_file_list
+        mock_list_response.read.return_value = json.dumps(mock_file_list).encode()
         mock_list_response.raise_for_status.return_value = None
 
         # Mock the warnings data response
         mock_data_response = AsyncMock()
-        mock_data_response.text.return_value = json.dumps(mock_warnings_data)
+        mock_data_response.read.return_value = json.dumps(mock_warnings_data).encode()
         mock_data_response.raise_for_status.return_value = None
 
         mock_get.return_value.__aenter__.side_effect = [
@@ -152,7 +176,7 @@ async def test_fetch_weather_warnings_empty(client):
     """Test handling empty warnings response"""
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = []
+        mock_response.read.return_value = b"[]"
         mock_response.raise_for_status.return_value = None
         mock_get.return_value.__aenter__.return_value = mock_response
 
@@ -176,7 +200,7 @@ async def test_fetch_hydro_stations(client):
 
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = mock_stations_data
+        mock_response.read.return_value = json.dumps(mock_stations_data).encode()
         mock_response.status = 200
         mock_response.raise_for_status.return_value = None
         mock_get.return_value.__aenter__.return_value = mock_response
@@ -214,7 +238,7 @@ async def test_fetch_hydro_station(client):
 
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = mock_station_data
+        mock_response.read.return_value = json.dumps(mock_station_data).encode()
         mock_response.status = 200
         mock_response.raise_for_status.return_value = None
         mock_get.return_value.__aenter__.return_value = mock_response
@@ -262,7 +286,7 @@ async def test_fetch_hydro_observation_data(client):
 
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = mock_observation_data
+        mock_response.read.return_value = json.dumps(mock_observation_data).encode()
         mock_response.status = 200
         mock_response.raise_for_status.return_value = None
         mock_get.return_value.__aenter__.return_value = mock_response
@@ -334,3 +358,48 @@ async def test_client_with_external_session():
         await client.close()
         # External session should still be usable
         assert not external_session.closed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+async def test_fetch_forecast_in_executor(executor_class):
+    """Test decoding and attaching warnings in an executor"""
+    tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+    mock_forecast_data = {
+        "place": {
+            "code": "kaunas",
+            "name": "Kaunas",
+            "administrativeDivision": "Kauno miesto savivaldybė",
+            "countryCode": "LT",
+            "coordinates": {"latitude": 54.9, "longitude": 23.9},
+        },
+        "forecastCreationTimeUtc": tomorrow.strftime("%Y-%m-%d 12:00:00"),
+        "forecastTimestamps": [{"forecastTimeUtc": tomorrow.strftime("%Y-%m-%d 15:00:00"), "conditionCode": "clear"}],
+    }
+    warnings = [
+        WeatherWarning(
+            county=county,
+            warning_type="wind",
+            severity="Moderate",
+            description="Strong wind",
+            start_time=tomorrow.strftime("%Y-%m-%dT00:00:00Z"),
+            end_time=tomorrow.strftime("%Y-%m-%dT23:00:00Z"),
+        )
+        for county in ("Kauno apskritis", "Vilniaus apskritis")
+    ]
+    metrics = ClientMetrics()
+
+    with executor_class(1) as executor, patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = AsyncMock()
+        mock_response.read.return_value = json.dumps(mock_forecast_data).encode()
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        async with MeteoLtClient(metrics=metrics, executor=executor) as client:
+            forecast = await client.fetch_forecast("kaunas", warnings)
+            plain = await client.fetch_forecast("kaunas")
+
+    assert [w.county for w in forecast.forecast_timestamps[0].warnings] == ["Kauno apskritis"]
+    assert plain.forecast_timestamps[0].warnings == []
+    stats = metrics.endpoints["forecast"]
+    assert stats.requests == 2
+    assert stats.decode > 0 and stats.build > 0
@@ -0,0 +1,83 @@
+"""Forecast columns and diff tests"""
+
+import math
+from datetime import timedelta
+
+import pytest
+
+from meteo_lt.columns import ForecastColumns, from_posix, to_posix
+from meteo_lt.diff import diff_forecasts
+
+
+@pytest.fixture(name="first")
+def first_fixture(start):
+    """Time of the first forecast timestamp, the hour after the current one"""
+    return start + timedelta(hours=1)
+
+
+def test_forecast_columns(first, make_timestamp, make_forecast):
+    """Test converting forecast timestamps to columns"""
+    forecast = make_forecast("vilnius", [make_timestamp(1), make_timestamp(2, temperature=None)])
+
+    columns = ForecastColumns.from_forecast(forecast)
+
+    assert len(columns) == 2
+    assert columns.place_code == "vilnius"
+    assert list(columns.times) == [first.timestamp(), first.timestamp() + 3600]
+    assert columns.columns["temperature"][0] == 10.0
+    assert math.isnan(columns.columns["temperature"][1])
+    assert columns.condition_codes == ["clear", "clear"]
+
+
+def test_posix_times():
+    """Test converting ISO 8601 times to POSIX timestamps and back"""
+    assert to_posix("2025-10-01T12:00:00+03:00") == to_posix("2025-10-01T09:00:00") == 1759309200.0
+    assert from_posix(1759309200.0) == "2025-10-01T09:00:00+00:00"
+    assert math.isnan(to_posix(None))
+    assert from_posix(math.nan) is None
+
+
+def test_diff_forecasts(first, make_timestamp, make_forecast):
+    """Test changed fields above thresholds, added and removed timestamps"""
+    old = make_forecast("vilnius", [make_timestamp(1), make_timestamp(2), make_timestamp(3), make_timestamp(4)])
+    new = make_forecast(
+        "vilnius",
+        [
+            make_timestamp(2, temperature=10.4, wind_bearing=5),
+            make_timestamp(3, temperature=11.0, condition_code="rain", humidity=None),
+            make_timestamp(4, wind_bearing=20),
+            make_timestamp(5),
+        ],
+    )
+    times = [first.timestamp() + hour * 3600 for hour in range(5)]
+
+    diff = diff_forecasts(old, new)
+
+    assert diff
+    assert diff.changed == {
+        "temperature": [times[2]],
+        "wind_bearing": [times[3]],
+        "humidity": [times[2]],
+        "condition_code": [times[2]],
+    }
+    assert diff.added == [times[4]]
+    assert diff.removed == [times[0]]
+    assert diff.timestamps == times[2:]
+    assert diff.datetimes("temperature") == [(first + timedelta(hours=2)).isoformat()]
+
+
+def test_diff_forecasts_thresholds(first, make_timestamp, make_forecast):
+    """Test configurable thresholds and unchanged forecasts"""
+    old = make_forecast("vilnius", [make_timestamp(1), make_timestamp(2)])
+    new = make_forecast("vilnius", [make_timestamp(1, temperature=10.1), make_timestamp(2)])
+
+    assert not diff_forecasts(old, old)
+    assert not diff_forecasts(old, new)
+    diff = diff_forecasts(ForecastColumns.from_forecast(old), new, {"temperature": 0})
+    assert diff.changed == {"temperature": [first.timestamp()]}
+
+
+def test_diff_forecasts_other_place(make_timestamp, make_forecast):
+    """Test that forecasts of different places are not compared"""
+    with pytest.raises(ValueError):
+        diff_forecasts(make_forecast("vilnius", [make_timestamp(1)]), make_forecast("kaunas", [make_timestamp(1)]))
@@ -0,0 +1,101 @@
+"""Place grid tests"""
+
+import random
+
+import pytest
+
+from meteo_lt.grid import PlaceGrid
+from meteo_lt.models import Place
+from meteo_lt.utils import find_nearest_location, haversine
+
+BOUNDS = (54.5, 24.5, 55.0, 25.5)
+
+
+@pytest.fixture(name="places")
+def places_fixture(make_place):
+    """Random places around the grid with a duplicate location"""
+    rnd = random.Random(42)
+    places = [make_place(f"place_{i}", rnd.uniform(54.4, 55.1), rnd.uniform(24.4, 25.6)) for i in range(150)]
+    places.append(make_place("twin", places[0].latitude, places[0].longitude))
+    return places
+
+
+@pytest.fixture(name="grid")
+def grid_fixture(places):
+    """Grid over BOUNDS"""
+    return PlaceGrid.build(places, BOUNDS, cell_size=0.01)
+
+
+def test_nearest_matches_linear_scan(places, grid):
+    """Test that lookups inside and outside the grid match the linear chord scan and the nearest place by haversine"""
+    rnd = random.Random(7)
+    for _ in range(3000):
+        latitude, longitude = rnd.uniform(54.3, 55.2), rnd.uniform(24.3, 25.7)
+        nearest = grid.nearest(latitude, longitude)
+        assert nearest is find_nearest_location(latitude, longitude, places)
+        reference = min(places, key=lambda place: haversine(latitude, longitude, place.latitude, place.longitude))
+        assert haversine(latitude, longitude, nearest.latitude, nearest.longitude) == pytest.approx(
+            haversine(latitude, longitude, reference.latitude, reference.longitude), abs=1e-9
+        )
+
+    assert grid.nearest(places[0].latitude, places[0].longitude) is places[0]
+    assert grid.rows == 50 and grid.columns == 100
+    assert grid.bounds == pytest.approx(BOUNDS)
+
+
+def test_save_and_load(tmp_path, places, grid, make_place):
+    """Test that a loaded grid uses the given place objects"""
+    path = tmp_path / "grid.bin"
+    grid.save(str(path))
+
+    copies = [make_place(place.code, place.latitude, place.longitude) for place in reversed(places)]
+    loaded = PlaceGrid.load(str(path), copies)
+
+    assert loaded.cells == grid.cells
+    assert loaded.candidates == grid.candidates
+    assert loaded.nearest(54.7, 25.0) is next(place for place in copies if place.code == grid.nearest(54.7, 25.0).code)
+
+
+def test_load_rejects_other_places(tmp_path, places, grid, make_place):
+    """Test that grids of other places or invalid files are rejected"""
+    path = tmp_path / "grid.bin"
+    grid.save(str(path))
+
+    with pytest.raises(ValueError, match="other places"):
+        PlaceGrid.load(str(path), places[1:])
+    with pytest.raises(ValueError, match="other places"):
+        PlaceGrid.load(str(path), places + [make_place("new", 54.7, 25.0)])
+    moved = places[:-1] + [make_place("twin", 54.7, 25.0)]
+    with pytest.raises(ValueError, match="other places"):
+        PlaceGrid.load(str(path), moved)
+
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="bytes"):
+        PlaceGrid.load(str(path), places)
+    path.write_bytes(b"not a grid")
+    with pytest.raises(ValueError):
+        PlaceGrid.load(str(path), places)
+
+
+def test_places_without_coordinates(tmp_path, places):
+    """Test that places without coordinates are left out of built and loaded grids"""
+    unlocated = Place.from_dict({"code": "unknown", "name": "Unknown", "administrativeDivision": "Vilniaus rajono"})
+    grid = PlaceGrid.build(places + [unlocated], BOUNDS, cell_size=0.01)
+
+    assert unlocated not in grid.places
+    assert grid.nearest(53.0, 23.0) is not unlocated
+    path = tmp_path / "grid.bin"
+    grid.save(str(path))
+    assert PlaceGrid.load(str(path), [unlocated] + places).cells == grid.cells
+    with pytest.raises(ValueError):
+        PlaceGrid.build([unlocated], BOUNDS)
+
+
+def test_build_invalid(places):
+    """Test rejecting empty places and invalid sizes"""
+    with pytest.raises(ValueError):
+        PlaceGrid.build([], BOUNDS)
+    with pytest.raises(ValueError):
+        PlaceGrid.build(places, BOUNDS, cell_size=0)
+    with pytest.raises(ValueError):
+        PlaceGrid.build(places, (55.0, 24.5, 54.5, 25.5))
@@ -0,0 +1,35 @@
+"""Package import tests"""
+
+import subprocess
+import sys
+
+import pytest
+
+import meteo_lt
+
+
+def test_models_and_utils_do_not_import_aiohttp():
+    """Test that importing the package, models and utils does not load aiohttp"""
+    code = "import sys, meteo_lt, meteo_lt.models, meteo_lt.utils; print('aiohttp' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+def test_models_do_not_import_serialization():
+    """Test that json, struct and binary serialization are loaded on first use only"""
+    code = (
+        "import sys, meteo_lt.models; "
+        "print(sorted(name for name in ('json', 'struct', 'meteo_lt.serialization') if name in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_lazy_exports():
+    """Test that all exports resolve on access"""
+    for name in meteo_lt.__all__:
+        assert getattr(meteo_lt, name).__name__ == name
+    assert set(meteo_lt.__all__) <= set(dir(meteo_lt))
+
+    with pytest.raises(AttributeError):
+        meteo_lt.Missing  # pylint: disable=pointless-statement,no-member
@@ -0,0 +1,215 @@
+"""Index unit tests"""
+
+import random
+import unittest
+
+from meteo_lt.index import SpatialIndex, HydroStationIndex, NearestCache, PlaceIndex, normalize_name
+from meteo_lt.models import Coordinates, HydroStation, Place
+from meteo_lt.utils import find_nearest_location, haversine
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Spatial index test class"""
+
+    def setUp(self):
+        """Set up the test fixtures."""
+        rnd = random.Random(42)
+        self.places = [
+            Place(
+                code=f"place_{i}",
+                name=f"Place {i}",
+                country_code="LT",
+                administrative_division="Kauno rajono savivaldybė",
+                coordinates=Coordinates(latitude=rnd.uniform(53.9, 56.4), longitude=rnd.uniform(21.0, 26.8)),
+            )
+            for i in range(500)
+        ]
+
+    def test_nearest_matches_linear_scan(self):
+        """Test that index lookups match the linear chord scan and the nearest place by haversine"""
+        index = SpatialIndex(self.places)
+        rnd = random.Random(7)
+        for _ in range(200):
+            latitude, longitude = rnd.uniform(53.0, 57.0), rnd.uniform(20.0, 27.5)
+            nearest = index.nearest(latitude, longitude)
+            self.assertIs(nearest, find_nearest_location(latitude, longitude, self.places))
+            reference = min(
+                self.places, key=lambda place: haversine(latitude, longitude, place.latitude, place.longitude)
+            )
+            self.assertAlmostEqual(
+                haversine(latitude, longitude, nearest.latitude, nearest.longitude),
+                haversine(latitude, longitude, reference.latitude, reference.longitude),
+                places=9,
+            )
+
+    def test_locations_without_coordinates(self):
+        """Test that locations without coordinates are kept but never nearest"""
+        station = HydroStation.from_dict({"code": "x", "name": "Station", "waterBody": "River"})
+        index = SpatialIndex([station] + self.places[:10])
+
+        self.assertEqual(len(index), 11)
+        self.assertIsNotNone(index.nearest(55.0, 24.0))
+        self.assertIsNot(index.nearest(55.0, 24.0), station)
+        self.assertIs(NearestCache(index).nearest(55.0, 24.0), index.nearest(55.0, 24.0))
+        self.assertIs(find_nearest_location(55.0, 24.0, [station] + self.places[:10]), index.nearest(55.0, 24.0))
+        self.assertIsNone(SpatialIndex([station]).nearest(55.0, 24.0))
+        self.assertIsNone(find_nearest_location(55.0, 24.0, [station]))
+
+    def test_nearest_empty(self):
+        """Test lookup in an empty index"""
+        self.assertIsNone(SpatialIndex([]).nearest(54.0, 24.0))
+
+    def test_nearest_with_margin(self):
+        """Test margin to the second nearest location"""
+        index = SpatialIndex(self.places[:2])
+        location, margin = index.nearest_with_margin(self.places[0].latitude, self.places[0].longitude)
+
+        self.assertIs(location, self.places[0])
+        first, second = self.places[:2]
+        self.assertAlmostEqual(margin, haversine(first.latitude, first.longitude, second.latitude, second.longitude))
+        self.assertEqual(SpatialIndex(self.places[:1]).nearest_with_margin(0.0, 0.0), (self.places[0], float("inf")))
+        self.assertEqual(SpatialIndex([]).nearest_with_margin(0.0, 0.0), (None, float("inf")))
+
+
+class TestNearestCache(unittest.TestCase):
+    """Nearest location cache test class"""
+
+    def setUp(self):
+        """Set up the test fixtures."""
+        rnd = random.Random(42)
+        self.index = SpatialIndex(
+            HydroStation(
+                code=f"station_{i}",
+                name=f"Station {i}",
+                water_body="River",
+                coordinates=Coordinates(latitude=rnd.uniform(53.9, 56.4), longitude=rnd.uniform(21.0, 26.8)),
+            )
+            for i in range(500)
+        )
+
+    def test_matches_exact_search(self):
+        """Test that cached lookups clustered around a few points match exact searches"""
+        rnd = random.Random(7)
+        centers = [(rnd.uniform(54.0, 56.3), rnd.uniform(21.5, 26.5)) for _ in range(5)]
+        for cell_size in (0.002, 0.01, 0.05):
+            cache = NearestCache(self.index, cell_size=cell_size)
+            hits = 0
+            for _ in range(2000):
+                latitude, longitude = rnd.choice(centers)
+                latitude, longitude = rnd.gauss(latitude, 0.05), rnd.gauss(longitude, 0.08)
+                location, hit = cache.lookup(latitude, longitude)
+                self.assertIs(location, self.index.nearest(latitude, longitude))
+                hits += hit
+            self.assertGreater(hits, 0)
+
+    def test_bounded(self):
+        """Test that the least recently used cells are dropped"""
+        cache = NearestCache(self.index, cell_size=0.01, maxsize=2)
+        cache.nearest(55.001, 24.001)
+        cache.nearest(55.011, 24.001)
+        cache.nearest(55.002, 24.002)
+        cache.nearest(55.021, 24.001)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(list(cache._cells), [(5500, 2400), (5502, 2400)])  # pylint: disable=protected-access
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_cell_size(self):
+        """Test that cells must have a size"""
+        with self.assertRaises(ValueError):
+            NearestCache(self.index, cell_size=0)
+
+
+class TestHydroStationIndex(unittest.TestCase):
+    """Hydro station index test class"""
+
+    def test_lookups(self):
+        """Test lookups by code and water body"""
+        stations = [
+            HydroStation(
+                code="kaunas",
+                name="Kaunas",
+                water_body="Nemunas",
+                coordinates=Coordinates(latitude=54.9, longitude=23.9),
+            ),
+            HydroStation(
+                code="smalininkai",
+                name="Smalininkai",
+                water_body="Nemunas",
+                coordinates=Coordinates(latitude=55.1, longitude=22.6),
+            ),
+            HydroStation(
+                code="vilnius",
+                name="Vilnius",
+                water_body="Neris",
+                coordinates=Coordinates(latitude=54.7, longitude=25.3),
+            ),
+        ]
+        index = HydroStationIndex(stations)
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.get("vilnius").name, "Vilnius")
+        self.assertIsNone(index.get("missing"))
+        self.assertEqual({s.code for s in index.for_water_body("NEMUNAS")}, {"kaunas", "smalininkai"})
+        self.assertEqual(index.for_water_body("Venta"), [])
+        self.assertEqual(index.nearest(54.68, 25.28).code, "vilnius")
+
+
+class TestPlaceIndex(unittest.TestCase):
+    """Place index test class"""
+
+    def setUp(self):
+        """Set up the test fixtures."""
+        self.places = [
+            Place(
+                code=code,
+                name=name,
+                country_code="LT",
+                administrative_division=division,
+                coordinates=Coordinates(latitude=latitude, longitude=longitude),
+            )
+            for code, name, division, latitude, longitude in [
+                ("siauliai", "Šiauliai", "Šiaulių miesto savivaldybė", 55.93, 23.31),
+                ("silute", "Šilutė", "Šilutės rajono savivaldybė", 55.35, 21.48),
+                ("naujoji-akmene", "Naujoji Akmenė", "Akmenės rajono savivaldybė", 56.32, 22.90),
+                ("akmene", "Akmenė", "Akmenės rajono savivaldybė", 56.25, 22.75),
+                ("kaunas", "Kaunas", "Kauno miesto savivaldybė", 54.90, 23.89),
+            ]
+        ]
+        self.index = PlaceIndex(self.places)
+
+    def test_normalize_name(self):
+        """Test case and diacritics folding"""
+        self.assertEqual(normalize_name("Šiaulių Ąžuolas"), "siauliu azuolas")
+
+    def test_get(self):
+        """Test lookup by code"""
+        self.assertEqual(self.index.get("kaunas").name, "Kaunas")
+        self.assertIsNone(self.index.get("missing"))
+        self.assertEqual(self.index.locations, self.places)
+
+    def test_search(self):
+        """Test name prefix search"""
+        self.assertEqual([p.code for p in self.index.search("ŠI")], ["siauliai", "silute"])
+        self.assertEqual([p.code for p in self.index.search("siau")], ["siauliai"])
+        self.assertEqual([p.code for p in self.index.search("akm")], ["akmene", "naujoji-akmene"])
+        self.assertEqual([p.code for p in self.index.search("naujoji  akm")], ["naujoji-akmene"])
+        self.assertEqual(len(self.index.search("s", limit=1)), 1)
+        self.assertEqual(self.index.search("x"), [])
+        self.assertEqual(self.index.search(" "), [])
+
+    def test_groups(self):
+        """Test grouping by administrative division and county"""
+        self.assertEqual(
+            [p.code for p in self.index.in_administrative_division("Akmenės rajono savivaldybė")],
+            ["naujoji-akmene", "akmene"],
+        )
+        self.assertEqual(
+            [p.code for p in self.index.in_county("Šiaulių apskritis")], ["siauliai", "naujoji-akmene", "akmene"]
+        )
+        self.assertEqual(self.index.in_county("Unknown"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
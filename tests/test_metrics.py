@@ -0,0 +1,116 @@
+"""Tests for request metrics"""
+
+# pylint: disable=redefined-outer-name
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+
+from meteo_lt import MeteoLtAPI
+from meteo_lt.client import MeteoLtClient
+from meteo_lt.metrics import ClientMetrics, RequestSample
+from meteo_lt.models import Coordinates, Place
+
+
+@pytest.fixture
+def metrics():
+    """Create metrics for testing"""
+    return ClientMetrics(buckets=(0.1, 1.0))
+
+
+def test_record_request(metrics):
+    """Test aggregating request samples per endpoint"""
+    samples = []
+    metrics.add_hook(samples.append)
+
+    metrics.record_request(RequestSample("places", "url", network=0.05, decode=0.01, build=0.02, size=100))
+    metrics.record_request(RequestSample("places", "url", network=0.5, size=50, error=ValueError()))
+
+    stats = metrics.endpoints["places"]
+    assert stats.requests == 2
+    assert stats.errors == 1
+    assert stats.response_bytes == 150
+    assert stats.network == pytest.approx(0.55)
+    assert stats.bucket_counts == [1, 1, 0]
+    assert len(samples) == 2
+
+
+def test_to_prometheus(metrics):
+    """Test Prometheus text exposition output"""
+    metrics.record_request(RequestSample("forecast", "url", network=0.05, decode=0.01, build=0.02, size=100))
+    metrics.record_request(RequestSample("forecast", "url", network=2.0))
+    metrics.record_cache("places", True)
+    metrics.record_cache("places", False)
+    metrics.record_cache("places", True)
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE meteo_lt_requests_total counter" in text
+    assert 'meteo_lt_requests_total{endpoint="forecast"} 2' in text
+    assert 'meteo_lt_response_bytes_total{endpoint="forecast"} 100' in text
+    assert 'meteo_lt_request_phase_seconds_total{endpoint="forecast",phase="decode"} 0.01' in text
+    assert 'meteo_lt_request_duration_seconds_bucket{endpoint="forecast",le="0.1"} 1' in text
+    assert 'meteo_lt_request_duration_seconds_bucket{endpoint="forecast",le="+Inf"} 2' in text
+    assert 'meteo_lt_request_duration_seconds_count{endpoint="forecast"} 2' in text
+    assert 'meteo_lt_cache_requests_total{cache="places",result="hit"} 2' in text
+    assert 'meteo_lt_cache_requests_total{cache="places",result="miss"} 1' in text
+    assert text.endswith("\n")
+
+
+@pytest.mark.asyncio
+async def test_client_records_phases(metrics):
+    """Test that client requests are measured per phase"""
+    body = json.dumps(
+        [
+            {
+                "code": "station_1",
+                "name": "Station 1",
+                "waterBody": "River",
+                "coordinates": {"latitude": 54.0, "longitude": 24.0},
+            }
+        ]
+    ).encode()
+    client = MeteoLtClient(metrics=metrics)
+
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        ok_response = AsyncMock()
+        ok_response.status = 200
+        ok_response.read.return_value = body
+        error_response = AsyncMock()
+        error_response.status = 500
+        mock_get.return_value.__aenter__.side_effect = [ok_response, error_response]
+
+        async with client:
+            await client.fetch_hydro_stations()
+            with pytest.raises(aiohttp.ClientError):
+                await client.fetch_hydro_stations()
+
+    stats = metrics.endpoints["hydro_stations"]
+    assert stats.requests == 2
+    assert stats.errors == 1
+    assert stats.response_bytes == len(body)
+    assert stats.decode > 0
+    assert stats.build > 0
+
+
+@pytest.mark.asyncio
+async def test_api_records_cache_hits(metrics):
+    """Test that API records places cache hits"""
+    api = MeteoLtAPI(metrics=metrics)
+    with patch.object(api.client, "fetch_places") as mock_fetch:
+        mock_fetch.return_value = [
+            Place(
+                code="vilnius",
+                name="Vilnius",
+                country_code="LT",
+                administrative_division="Vilniaus miesto savivaldybė",
+                coordinates=Coordinates(latitude=54.68, longitude=25.28),
+            )
+        ]
+        await api.get_place("vilnius")
+        await api.get_place("vilnius")
+    await api.close()
+
+    assert metrics.cache == {("places", False): 1, ("places", True): 1}
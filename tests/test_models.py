@@ -1,6 +1,8 @@
 """Models unit tests"""
 
-from datetime import datetime, timedelta
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+import json
 import unittest
 from meteo_lt.models import (
     Coordinates,
@@ -10,6 +12,7 @@ from meteo_lt.models import (
     HydroStation,
     HydroObservation,
     HydroObservationData,
+    WeatherWarning,
 )
 
 
@@ -172,7 +175,7 @@ class TestMeteoLtModels(unittest.TestCase):
                     administrative_division=f"{division} savivaldybė",
                     coordinates=Coordinates(latitude=1.0, longitude=1.0),
                 )
-                self.assertEqual(place.counties, expected_counties)
+                self.assertEqual(place.counties, tuple(expected_counties))
 
     def test_place_invalid_division(self):
         """Test that invalid divisions return 'Unknown county'."""
@@ -189,6 +192,68 @@ class TestMeteoLtModels(unittest.TestCase):
                 )
                 self.assertFalse(place.counties)
 
+    def test_place_warning_areas(self):
+        """Test that matching warning areas are precomputed per division"""
+        place = Place(
+            code="klaipeda",
+            name="Klaipėda",
+            country_code="LT",
+            administrative_division="Klaipėdos rajono savivaldybė",
+            coordinates=Coordinates(latitude=55.7, longitude=21.1),
+        )
+        other = Place(
+            code="gargzdai",
+            name="Gargždai",
+            country_code="LT",
+            administrative_division="Klaipėdos rajono savivaldybė",
+            coordinates=Coordinates(latitude=55.7, longitude=21.4),
+        )
+
+        self.assertEqual(place.division_key, "klaipėdos rajono")
+        self.assertIs(place.warning_areas, other.warning_areas)
+        self.assertEqual(
+            place.matching_warning_areas(
+                {"Klaipėdos apskritis", "Vilniaus apskritis", "Klaipėdos rajono sav. pajūris", "Kauno rajono pajūris"}
+            ),
+            {"Klaipėdos apskritis", "Klaipėdos rajono sav. pajūris"},
+        )
+        self.assertIn("Pietryčių Baltija, Kuršių marios", place.warning_areas)
+        self.assertNotIn("division_key", place.to_dict())
+
+    def test_from_dict_interning(self):
+        """Test that repeated strings of decoded models are shared"""
+        payload = {
+            "code": "vilnius",
+            "name": "Vilnius",
+            "administrativeDivision": "".join(["Vilniaus miesto ", "savivaldybė"]),
+            "countryCode": "".join(["L", "T"]),
+            "coordinates": {"latitude": 54.68, "longitude": 25.28},
+        }
+        other = dict(payload, code="naujininkai", administrativeDivision="".join(["Vilniaus miesto ", "savivaldybė"]))
+        other["countryCode"] = "".join(["L", "T"])
+
+        first, second = Place.from_dict(payload), Place.from_dict(other)
+
+        self.assertIsNot(payload["administrativeDivision"], other["administrativeDivision"])
+        self.assertIs(first.administrative_division, second.administrative_division)
+        self.assertIs(first.country_code, second.country_code)
+        self.assertIs(first.counties, second.counties)
+
+        timestamp = {"forecastTimeUtc": "2024-07-20 12:00:00", "conditionCode": "".join(["cle", "ar"])}
+        first = ForecastTimestamp.from_dict(timestamp)
+        second = ForecastTimestamp.from_dict(dict(timestamp, conditionCode="".join(["cle", "ar"])))
+        self.assertIs(first.condition_code, second.condition_code)
+        self.assertIs(first.datetime, second.datetime)
+
+        warning = {
+            "county": "Kauno apskritis",
+            "warning_type": "".join(["wi", "nd"]),
+            "severity": "".join(["Min", "or"]),
+        }
+        first = WeatherWarning.from_dict(warning)
+        second = WeatherWarning.from_dict(dict(warning, warning_type="".join(["wi", "nd"])))
+        self.assertIs(first.warning_type, second.warning_type)
+
     def test_hydro_station_creation(self):
         """Test HydroStation creation and properties."""
         station = HydroStation(
@@ -222,6 +287,18 @@ class TestMeteoLtModels(unittest.TestCase):
         self.assertEqual(station.latitude, 54.2)
         self.assertEqual(station.longitude, 25.8)
 
+    def test_location_without_coordinates(self):
+        """Test that stations and places without coordinates are created without unit vectors"""
+        station = HydroStation.from_dict({"code": "x", "name": "y", "waterBody": "z"})
+        self.assertIsNone(station.coordinates)
+        self.assertIsNone(station.unit_vector)
+
+        place = Place.from_dict(
+            {"code": "p", "name": "P", "administrativeDivision": "Vilniaus miesto savivaldybė", "coordinates": {}}
+        )
+        self.assertIsNone(place.unit_vector)
+        self.assertEqual(place.counties, ("Vilniaus apskritis",))
+
     def test_hydro_observation_creation(self):
         """Test HydroObservation creation with all fields."""
         observation = HydroObservation(
@@ -365,3 +442,226 @@ class TestMeteoLtModels(unittest.TestCase):
         # Test inherited properties from LocationBase
         self.assertEqual(station.latitude, 55.1)
         self.assertEqual(station.longitude, 23.9)
+
+    def _hourly_forecast(self, hours: int) -> Forecast:
+        start = datetime(2099, 6, 1, tzinfo=timezone.utc)
+        timestamps = [
+            ForecastTimestamp(
+                datetime=(start + timedelta(hours=hour)).isoformat(),
+                temperature=hour % 24,
+                apparent_temperature=hour % 24,
+                condition_code="rain" if hour % 24 in (1, 2, 9, 10, 11) else "clear" if hour % 24 < 12 else "cloudy",
+                wind_speed=2,
+                wind_gust_speed=5,
+                wind_bearing=300,
+                cloud_coverage=28,
+                pressure=1016,
+                humidity=58,
+                precipitation=0.5 if hour % 2 else None,
+            )
+            for hour in range(hours)
+        ]
+        return Forecast(
+            place=self.place,
+            forecast_created=start.isoformat(),
+            current_conditions=None,
+            forecast_timestamps=timestamps,
+        )
+
+    def test_forecast_windows(self):
+        """Test window queries over parsed times"""
+        forecast = self._hourly_forecast(30)
+        start = datetime(2099, 6, 1, 6, tzinfo=timezone.utc)
+
+        self.assertEqual(forecast.between(start, start + timedelta(hours=2)), forecast.forecast_timestamps[6:8])
+        self.assertEqual(forecast.next_hours(6, now=start + timedelta(minutes=30)), forecast.forecast_timestamps[7:13])
+        self.assertEqual(forecast.on_day(date(2099, 6, 2)), forecast.forecast_timestamps[24:])
+        vilnius = timezone(timedelta(hours=3))
+        self.assertEqual(forecast.on_day(date(2099, 6, 1), vilnius), forecast.forecast_timestamps[:21])
+        self.assertEqual(forecast.next_hours(6, now=start + timedelta(days=2)), [])
+
+    def test_forecast_resample(self):
+        """Test daily and 3-hourly summaries computed once"""
+        forecast = self._hourly_forecast(30)
+
+        daily = forecast.resample()
+        self.assertEqual([summary.count for summary in daily], [24, 6])
+        self.assertEqual((daily[0].temperature_min, daily[0].temperature_max), (0, 23))
+        self.assertEqual(daily[0].precipitation, 6.0)
+        self.assertEqual(daily[0].condition_code, "cloudy")
+        self.assertEqual(daily[0].start, datetime(2099, 6, 1, tzinfo=timezone.utc))
+        self.assertEqual(daily[0].end, datetime(2099, 6, 2, tzinfo=timezone.utc))
+        self.assertIs(forecast.resample()[0], daily[0])
+
+        three_hourly = forecast.resample(3)
+        self.assertEqual(len(three_hourly), 10)
+        self.assertEqual(three_hourly[0].condition_code, "rain")
+        self.assertEqual(three_hourly[3].condition_code, "rain")
+        self.assertEqual(three_hourly[1].precipitation, 1.0)
+
+        vilnius = timezone(timedelta(hours=3))
+        local = forecast.resample(24, vilnius)
+        self.assertEqual([summary.count for summary in local], [21, 9])
+        self.assertEqual(local[1].start, datetime(2099, 6, 2, tzinfo=vilnius))
+
+        forecast.forecast_timestamps = forecast.forecast_timestamps[:12]
+        self.assertEqual([summary.count for summary in forecast.resample()], [12])
+        for hours in (5, 0, 1.5, 3.0):
+            with self.assertRaises(ValueError):
+                forecast.resample(hours)
+
+    def test_forecast_replaced_timestamp(self):
+        """Test that reindex after replacing a timestamp in place updates parsed times and summaries"""
+        forecast = self._hourly_forecast(30)
+        start = datetime(2099, 6, 3, tzinfo=timezone.utc)
+        self.assertEqual(forecast.between(start, start + timedelta(hours=1)), [])
+        self.assertEqual([summary.count for summary in forecast.resample()], [24, 6])
+
+        moved = ForecastTimestamp.from_dict(
+            {"forecastTimeUtc": "2099-06-03 00:00:00", "conditionCode": "clear", "airTemperature": 5}
+        )
+        forecast.forecast_timestamps[-1] = moved
+        forecast.reindex()
+        self.assertEqual(forecast.between(start, start + timedelta(hours=1)), [moved])
+        self.assertEqual([summary.count for summary in forecast.resample()], [24, 5, 1])
+
+    def test_to_dict(self):
+        """Test to_dict with field names and API keys"""
+        forecast = Forecast(
+            place=self.place,
+            forecast_created="2024-07-20T12:00:00+00:00",
+            current_conditions=self.future_timestamp_1,
+            forecast_timestamps=[self.future_timestamp_1, self.future_timestamp_2],
+        )
+        warning = WeatherWarning(
+            county="Vilniaus apskritis",
+            warning_type="wind",
+            severity="Moderate",
+            description="Strong wind",
+            start_time="2024-07-20T12:00:00Z",
+        )
+        self.future_timestamp_2.warnings = [warning]
+
+        result = forecast.to_dict()
+        expected = asdict(forecast)
+        for name in ("unit_vector", "division_key", "warning_areas"):
+            del expected["place"][name]
+        for name in ("_indexed", "_times", "_summaries"):
+            del expected[name]
+        self.assertEqual(result, {**expected, "forecast_timestamps": result["forecast_timestamps"]})
+        self.assertEqual(
+            result["forecast_timestamps"][1]["warnings"],
+            [
+                {
+                    "county": "Vilniaus apskritis",
+                    "warning_type": "wind",
+                    "severity": "Moderate",
+                    "description": "Strong wind",
+                    "start_time": "2024-07-20T12:00:00Z",
+                    "end_time": None,
+                }
+            ],
+        )
+
+        result = forecast.to_dict(api_keys=True)
+        self.assertEqual(result["forecastCreationTimeUtc"], "2024-07-20 12:00:00")
+        self.assertEqual(result["place"]["administrativeDivision"], "Sample Admin Div")
+        self.assertEqual(result["place"]["coordinates"], {"latitude": 54.6872, "longitude": 25.2797})
+        self.assertNotIn("counties", result["place"])
+        self.assertNotIn("current_conditions", result)
+        timestamp = result["forecastTimestamps"][0]
+        self.assertEqual(timestamp["airTemperature"], 27)
+        self.assertEqual(timestamp["conditionCode"], "partly-cloudy")
+        self.assertNotIn("warnings", timestamp)
+
+    def test_to_dict_api_round_trip(self):
+        """Test that from_dict reads back to_dict with API keys"""
+        created = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        response = {
+            "place": {
+                "code": "vilnius",
+                "name": "Vilnius",
+                "administrativeDivision": "Vilniaus miesto savivaldybė",
+                "countryCode": "LT",
+                "coordinates": {"latitude": 54.6872, "longitude": 25.2797},
+            },
+            "forecastCreationTimeUtc": created.strftime("%Y-%m-%d %H:%M:%S"),
+            "forecastTimestamps": [
+                {
+                    "forecastTimeUtc": (created + timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S"),
+                    "airTemperature": 10 + hours,
+                    "feelsLikeTemperature": 8 + hours,
+                    "conditionCode": "cloudy",
+                    "windSpeed": 3,
+                    "windGust": 7,
+                    "windDirection": 180,
+                    "cloudCover": 90,
+                    "seaLevelPressure": 1012,
+                    "relativeHumidity": 80,
+                    "totalPrecipitation": 0.2,
+                }
+                for hours in (0, 1, 2, 3)
+            ],
+        }
+        forecast = Forecast.from_dict(response)
+        self.assertEqual(forecast.current_conditions.temperature, 10)
+        self.assertEqual(len(forecast.forecast_timestamps), 3)
+
+        result = forecast.to_dict(api_keys=True)
+        self.assertEqual(result, response)
+        copy = Forecast.from_dict(result)
+        self.assertEqual(copy.place, forecast.place)
+        self.assertEqual(copy.forecast_created, forecast.forecast_created)
+        self.assertEqual(copy.current_conditions, forecast.current_conditions)
+        self.assertEqual(copy.forecast_timestamps, forecast.forecast_timestamps)
+
+        forecast.current_conditions = None
+        self.assertEqual(forecast.to_dict(api_keys=True)["forecastTimestamps"], response["forecastTimestamps"][1:])
+
+        observation = HydroObservation.from_dict({"observationTimeUtc": "2023-01-01 14:00:00", "waterLevel": 120.0})
+        self.assertEqual(HydroObservation.from_dict(observation.to_dict(api_keys=True)), observation)
+
+    def test_to_dict_does_not_copy(self):
+        """Test that values which are not models are not copied"""
+        data = HydroObservationData(
+            station=HydroStation(
+                code="station_007",
+                name="Station",
+                water_body="River",
+                coordinates=Coordinates(latitude=55.1, longitude=23.9),
+            ),
+            observations_data_range={"startTimeUtc": "2023-01-01 00:00:00"},
+            observations=[HydroObservation("2023-01-01T12:00:00+00:00", 125.0, None, 45.0)],
+        )
+
+        result = data.to_dict(api_keys=True)
+
+        self.assertIs(result["observationsDataRange"], data.observations_data_range)
+        self.assertEqual(result["station"]["waterBody"], "River")
+        self.assertEqual(result["observations"][0]["waterLevel"], 125.0)
+        self.assertIsNone(result["observations"][0]["waterTemperature"])
+
+    def test_to_json(self):
+        """Test to_json as text and bytes"""
+        self.assertEqual(
+            json.loads(self.place.to_json()),
+            {
+                "code": "123",
+                "name": "Sample Place",
+                "coordinates": {"latitude": 54.6872, "longitude": 25.2797},
+                "administrative_division": "Sample Admin Div",
+                "country_code": "XX",
+                "counties": [],
+            },
+        )
+        place = Place(
+            code="vilnius",
+            name="Vilnius",
+            country_code="LT",
+            administrative_division="Vilniaus miesto savivaldybė",
+            coordinates=Coordinates(latitude=54.6872, longitude=25.2797),
+        )
+        data = place.to_json(api_keys=True, as_bytes=True)
+        self.assertIsInstance(data, bytes)
+        self.assertIn("savivaldybė".encode(), data)
+        self.assertEqual(json.loads(data)["countryCode"], "LT")
@@ -0,0 +1,131 @@
+"""Tests for recording and replaying client traffic"""
+
+import json
+import zipfile
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+
+from meteo_lt import MeteoLtAPI
+from meteo_lt.client import MeteoLtClient
+from meteo_lt.metrics import ClientMetrics
+from meteo_lt.replay import RecordedResponse, TrafficArchive
+
+PLACES = [
+    {
+        "code": "lapės",
+        "name": "Lapės",
+        "administrativeDivision": "Kauno rajono savivaldybė",
+        "countryCode": "LT",
+        "coordinates": {"latitude": 54.97371, "longitude": 24.00048},
+    }
+]
+
+
+def _response(body: bytes, status: int = 200) -> AsyncMock:
+    response = AsyncMock()
+    response.status = status
+    response.headers = {"Content-Type": "application/json"}
+    response.read.return_value = body
+    return response
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path):
+    """Test that recorded responses are saved and served through the same decoding without a session"""
+    record = TrafficArchive()
+    body = json.dumps(PLACES).encode()
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_get.return_value.__aenter__.side_effect = [_response(body), _response(body), _response(b"[]")]
+        async with MeteoLtClient(record=record) as client:
+            await client.fetch_places()
+            await client.fetch_places()
+            await client.fetch_warnings_file_list()
+
+    assert [response.endpoint for response in record.responses] == ["places", "places", "warnings_list"]
+    assert record.responses[0].headers == [("Content-Type", "application/json")]
+    assert record.responses[0].network >= 0
+
+    path = tmp_path / "traffic.zip"
+    record.save(str(path))
+    with zipfile.ZipFile(path) as archive:
+        assert len([name for name in archive.namelist() if name.startswith("bodies/")]) == 2
+
+    metrics = ClientMetrics()
+    replay = TrafficArchive.load(str(path))
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        async with MeteoLtAPI(replay=replay, metrics=metrics) as api:
+            await api.fetch_places()
+            assert await api.client.fetch_warnings_file_list() == []
+            assert await api.client.fetch_warnings_file_list() == []
+        mock_get.assert_not_called()
+
+    assert api.places[0].code == "lapės"
+    assert metrics.endpoints["places"].response_bytes == len(body)
+    assert metrics.endpoints["places"].decode > 0
+
+
+@pytest.mark.asyncio
+async def test_replay_order_and_status():
+    """Test that responses of a URL are served in turn and recorded statuses are checked"""
+    url = "https://api.meteo.lt/v1/hydro-stations"
+    replay = TrafficArchive(
+        [
+            RecordedResponse("hydro_stations", url, 200, [], b"[]", 0.01),
+            RecordedResponse("hydro_stations", url, 503, [], b"", 0.01),
+        ]
+    )
+    client = MeteoLtClient(replay=replay)
+
+    assert await client.fetch_hydro_stations() == []
+    with pytest.raises(aiohttp.ClientError, match="503"):
+        await client.fetch_hydro_stations()
+    with pytest.raises(aiohttp.ClientError, match="503"):
+        await client.fetch_hydro_stations()
+
+    replay.rewind()
+    assert await client.fetch_hydro_stations() == []
+    with pytest.raises(aiohttp.ClientConnectionError, match="No recorded response"):
+        await client.fetch_places()
+
+
+@pytest.mark.asyncio
+async def test_record_failed_responses(tmp_path):
+    """Test that rejected and non-200 responses are recorded and fail the same way when replayed"""
+    record = TrafficArchive()
+    rejected = aiohttp.ClientResponseError(None, (), status=500, message="Internal Server Error", headers={"A": "b"})
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_get.return_value.__aenter__.side_effect = [rejected, _response(b"gone", 404)]
+        async with MeteoLtClient(record=record) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.fetch_places()
+            with pytest.raises(aiohttp.ClientError, match="404"):
+                await client.fetch_hydro_stations()
+
+    assert [(response.status, response.error) for response in record.responses] == [
+        (500, "Internal Server Error"),
+        (404, None),
+    ]
+    path = tmp_path / "traffic.zip"
+    record.save(str(path))
+
+    client = MeteoLtClient(replay=TrafficArchive.load(str(path)))
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        await client.fetch_places()
+    assert (error.value.status, error.value.message, error.value.headers["A"]) == (500, "Internal Server Error", "b")
+    with pytest.raises(aiohttp.ClientError, match="404"):
+        await client.fetch_hydro_stations()
+
+
+def test_load_invalid(tmp_path):
+    """Test rejecting files that are not traffic archives"""
+    path = tmp_path / "traffic.zip"
+    path.write_bytes(b"not an archive")
+    with pytest.raises(ValueError):
+        TrafficArchive.load(str(path))
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("manifest.json", json.dumps({"version": 2, "responses": []}))
+    with pytest.raises(ValueError, match="version"):
+        TrafficArchive.load(str(path))
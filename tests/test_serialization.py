@@ -0,0 +1,109 @@
+"""Binary serialization tests"""
+
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from meteo_lt.models import (
+    Coordinates,
+    Forecast,
+    HydroObservation,
+    HydroObservationData,
+    HydroStation,
+    Place,
+    WeatherWarning,
+)
+from meteo_lt.serialization import VERSION
+
+
+@pytest.fixture
+def place(make_place):
+    """Place for testing"""
+    return make_place("vilnius", 54.68705, 25.28291)
+
+
+@pytest.fixture
+def forecast(start, place, make_timestamp):
+    """Forecast with warnings on some timestamps"""
+    warning = WeatherWarning(
+        county="Vilniaus apskritis",
+        warning_type="wind",
+        severity="Moderate",
+        description="Stiprus vėjas",
+        start_time="2025-09-30T12:00:00Z",
+        end_time=None,
+    )
+    values = {"temperature": 10.5, "apparent_temperature": 8.25, "precipitation": 0.1}
+    timestamps = [make_timestamp(hour, **values) for hour in range(0, 4)]
+    timestamps.append(make_timestamp(4, condition_code="rain", humidity=None, **values))
+    for timestamp in timestamps[2:4]:
+        timestamp.warnings = [warning]
+    forecast = Forecast(
+        place=place,
+        forecast_created=start.isoformat(),
+        current_conditions=timestamps[0],
+        forecast_timestamps=timestamps,
+    )
+    return forecast
+
+
+def test_place_round_trip(place):
+    """Test Place round trip"""
+    restored = Place.from_bytes(place.to_bytes())
+
+    assert restored == place
+    assert restored.counties == ("Vilniaus apskritis",)
+
+
+def test_forecast_round_trip(forecast):
+    """Test Forecast round trip with interned condition codes and shared warnings"""
+    data = forecast.to_bytes()
+    restored = Forecast.from_bytes(data)
+
+    assert restored == forecast
+    assert restored.forecast_timestamps[-1].humidity is None
+    assert restored.forecast_timestamps[1].warnings[0] is restored.forecast_timestamps[2].warnings[0]
+    assert restored.forecast_timestamps[1].warnings[0].start_datetime == datetime(2025, 9, 30, 12, tzinfo=timezone.utc)
+    assert restored.forecast_timestamps[0].condition_code is restored.forecast_timestamps[2].condition_code
+    assert data.count("clear".encode()) == 1
+    assert len(data) < len(pickle.dumps(forecast))
+
+
+def test_hydro_observation_data_round_trip():
+    """Test HydroObservationData round trip"""
+    data = HydroObservationData(
+        station=HydroStation(
+            code="vilniaus-vms",
+            name="Vilnius",
+            water_body="Neris",
+            coordinates=Coordinates(latitude=54.68, longitude=25.28),
+        ),
+        observations_data_range={"from": "2025-09-30", "to": "2025-10-01"},
+        observations=[
+            HydroObservation("2025-09-30T12:00:00+00:00", 120.5, 12.25, 85.0),
+            HydroObservation("2025-09-30T13:00:00+00:00", None, None, None),
+        ],
+    )
+
+    assert HydroObservationData.from_bytes(data.to_bytes()) == data
+
+    data.observations_data_range = None
+    data.observations = []
+    assert HydroObservationData.from_bytes(data.to_bytes()) == data
+
+
+def test_from_bytes_invalid(place, forecast):
+    """Test rejecting other kinds, versions and truncated data"""
+    data = forecast.to_bytes()
+
+    with pytest.raises(ValueError, match="expected P"):
+        Place.from_bytes(data)
+    with pytest.raises(ValueError, match="version"):
+        Forecast.from_bytes(data[:4] + bytes([VERSION + 1]) + data[5:])
+    with pytest.raises(ValueError):
+        Forecast.from_bytes(data[:-3])
+    with pytest.raises(ValueError):
+        Place.from_bytes(b"not serialized")
+    with pytest.raises(ValueError):
+        Place.from_bytes(place.to_bytes()[:20])
@@ -0,0 +1,109 @@
+"""Forecast snapshot tests"""
+
+import math
+import os
+from datetime import timedelta
+
+import pytest
+
+from meteo_lt.models import Forecast
+from meteo_lt.snapshot import ForecastSnapshot, write_snapshot
+
+
+@pytest.fixture(name="hourly_forecast")
+def hourly_forecast_fixture(make_timestamp, make_forecast):
+    """Factory of forecasts from the current hour, rain in odd hours and humidity missing in hour 2"""
+
+    def hourly_forecast(code: str, temperature: float = 10.0, hours: int = 3) -> Forecast:
+        timestamps = [
+            make_timestamp(
+                hour,
+                temperature=temperature + hour,
+                apparent_temperature=temperature - 2,
+                condition_code="rain" if hour % 2 else "clear",
+                humidity=None if hour == 2 else 70,
+                precipitation=0.1,
+            )
+            for hour in range(hours + 1)
+        ]
+        return make_forecast(code, timestamps)
+
+    return hourly_forecast
+
+
+@pytest.fixture
+def path(tmp_path, hourly_forecast):
+    """Snapshot with three places"""
+    path = str(tmp_path / "forecasts.snapshot")
+    write_snapshot(
+        path, [hourly_forecast("vilnius"), hourly_forecast("kaunas", 5.0), hourly_forecast("alytus", hours=0)]
+    )
+    return path
+
+
+def test_snapshot_views(path, start, hourly_forecast):
+    """Test reading forecasts through views"""
+    with ForecastSnapshot(path) as snapshot:
+        assert len(snapshot) == 3
+        assert list(snapshot) == ["alytus", "kaunas", "vilnius"]
+        assert "kaunas" in snapshot
+        assert "klaipeda" not in snapshot
+        assert snapshot.get("klaipeda") is None
+
+        forecast = snapshot.get("kaunas")
+        assert forecast.place == hourly_forecast("kaunas").place
+        assert forecast.forecast_created == start.isoformat()
+        assert forecast.current_conditions.datetime == start.isoformat()
+        assert forecast.current_conditions.temperature == 5.0
+        assert [t.condition_code for t in forecast.forecast_timestamps] == ["rain", "clear", "rain"]
+        assert forecast.forecast_timestamps[1].humidity is None
+        assert forecast.forecast_timestamps[0].warnings == []
+
+        assert list(forecast.times) == [(start + timedelta(hours=hour)).timestamp() for hour in range(4)]
+        humidity = forecast.column("humidity")
+        assert isinstance(humidity, memoryview)
+        assert math.isnan(humidity[2])
+
+        assert snapshot.get("alytus").forecast_timestamps == []
+
+
+def test_snapshot_to_forecast(path, hourly_forecast):
+    """Test copying views into models"""
+    with ForecastSnapshot(path) as snapshot:
+        assert snapshot.get("vilnius").to_forecast() == hourly_forecast("vilnius")
+
+
+def test_snapshot_reload(path, hourly_forecast):
+    """Test atomic replacement and reload while old views stay valid"""
+    snapshot = ForecastSnapshot(path)
+    old = snapshot.get("vilnius")
+
+    assert not snapshot.reload()
+    write_snapshot(path, [hourly_forecast("vilnius", 20.0), hourly_forecast("klaipeda")])
+    assert snapshot.reload()
+
+    assert snapshot.get("vilnius").current_conditions.temperature == 20.0
+    assert "klaipeda" in snapshot
+    assert old.current_conditions.temperature == 10.0
+    assert [name for name in os.listdir(os.path.dirname(path)) if name.startswith(".snapshot-")] == []
+
+    snapshot.close()
+    with pytest.raises(ValueError):
+        snapshot.get("vilnius")
+
+
+def test_snapshot_invalid(tmp_path, path, hourly_forecast):
+    """Test rejecting files that are not snapshots and duplicate places"""
+    other = tmp_path / "other"
+    other.write_bytes(b"not a snapshot at all, just some bytes" * 4)
+    with pytest.raises(ValueError):
+        ForecastSnapshot(str(other))
+
+    with open(path, "rb") as file:
+        data = file.read()
+    other.write_bytes(data[:-16])
+    with pytest.raises(ValueError, match="Truncated"):
+        ForecastSnapshot(str(other))
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        write_snapshot(str(tmp_path / "duplicate"), [hourly_forecast("vilnius"), hourly_forecast("vilnius")])
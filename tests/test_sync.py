@@ -0,0 +1,86 @@
+"""Synchronous facade tests"""
+
+# pylint: disable=protected-access
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import pytest
+
+from meteo_lt import MeteoLtSyncAPI
+from meteo_lt.models import Coordinates, HydroObservationData, HydroStation
+
+
+@pytest.fixture
+def api(make_place):
+    """Sync API with mocked places download"""
+    api = MeteoLtSyncAPI(timeout=5)
+    api.api.client.fetch_places = AsyncMock(return_value=[make_place("vilnius"), make_place("kaunas")])
+    yield api
+    api.close()
+
+
+def test_sync_calls_share_loop_and_cache(api):
+    """Test that calls from many threads run on one loop and share one places download"""
+    loops = set()
+    fetch_places = api.api.client.fetch_places
+
+    async def fetch():
+        loops.add((asyncio.get_running_loop(), threading.current_thread().name))
+        # Other calls arrive while the download is running
+        await asyncio.sleep(0.05)
+        return await fetch_places()
+
+    api.api.client.fetch_places = AsyncMock(side_effect=fetch)
+
+    with ThreadPoolExecutor(8) as executor:
+        places = list(executor.map(lambda code: api.get_place(code), ["vilnius", "kaunas"] * 20))
+
+    assert [place.code for place in places[:2]] == ["vilnius", "kaunas"]
+    assert loops == {(api._loop, "meteo-lt-loop")}
+    assert api.api.client.fetch_places.await_count == 1
+    assert [place.code for place in api.places] == ["vilnius", "kaunas"]
+
+
+def test_sync_iterate(api):
+    """Test that async generator methods become generators"""
+    station = HydroStation(
+        code="station_1", name="Station", water_body="River", coordinates=Coordinates(latitude=54.0, longitude=24.0)
+    )
+    api.api.client.fetch_hydro_observation_data = AsyncMock(
+        return_value=HydroObservationData(station=station, observations=[])
+    )
+
+    results = list(api.iter_hydro_observation_data(["station_1", "station_2"]))
+
+    assert len(results) == 2
+    assert api.api.client.fetch_hydro_observation_data.await_count == 2
+
+
+def test_sync_timeout(api):
+    """Test that calls longer than timeout raise TimeoutError"""
+    api.timeout = 0.01
+
+    async def fetch():
+        await asyncio.sleep(1)
+
+    api.api.client.fetch_places = AsyncMock(side_effect=fetch)
+
+    with pytest.raises(TimeoutError):
+        api.fetch_places()
+
+
+def test_sync_close():
+    """Test that close stops the loop thread and later calls fail"""
+    api = MeteoLtSyncAPI()
+    thread = api._thread
+
+    with api:
+        assert thread.is_alive()
+
+    assert not thread.is_alive()
+    api.close()
+    with pytest.raises(RuntimeError):
+        api.get_place("vilnius")
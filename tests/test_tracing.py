@@ -0,0 +1,148 @@
+"""Tests for tracing spans"""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from meteo_lt import MeteoLtAPI
+from meteo_lt.const import BASE_URL, WARNINGS_URL
+from meteo_lt.tracing import NOOP_TRACER, traced
+
+PLACE = {
+    "code": "kaunas",
+    "name": "Kaunas",
+    "administrativeDivision": "Kauno miesto savivaldybė",
+    "countryCode": "LT",
+    "coordinates": {"latitude": 54.9, "longitude": 23.9},
+}
+
+
+class RecordingSpan:
+    """Span storing its name, parent and attributes"""
+
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key, value):
+        """Store attribute"""
+        self.attributes[key] = value
+
+
+class RecordingTracer:
+    """Tracer keeping finished spans"""
+
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        """Start a child span of the current one"""
+        span = RecordingSpan(name, self._stack[-1].name if self._stack else None, attributes)
+        self._stack.append(span)
+        try:
+            yield span
+        finally:
+            self._stack.pop()
+            self.spans.append(span)
+
+
+class FakeResponse:
+    """Response returning a fixed body"""
+
+    status = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    async def read(self):
+        """Response body"""
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class FakeSession:
+    """Session serving JSON payloads by URL"""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def get(self, url):
+        """Response for url"""
+        return FakeResponse(json.dumps(self.payloads[url]).encode())
+
+
+def test_noop_tracer():
+    """Test that default tracer accepts the span interface"""
+    with NOOP_TRACER.start_as_current_span("name", attributes={"key": "value"}) as span:
+        span.set_attribute("key", "value")
+        span.record_exception(ValueError())
+
+
+def test_traced_sync_method():
+    """Test wrapping a regular method"""
+
+    class Traced:  # pylint: disable=too-few-public-methods
+        """Object with tracer"""
+
+        tracer = RecordingTracer()
+
+        @traced("work")
+        def work(self, value):
+            """Return value"""
+            return value
+
+    traced_object = Traced()
+    assert traced_object.work(5) == 5
+    assert [span.name for span in traced_object.tracer.spans] == ["work"]
+
+
+@pytest.mark.asyncio
+async def test_forecast_with_warnings_spans():
+    """Test spans created for every stage of forecast with warnings"""
+    hour = (datetime.now(timezone.utc) + timedelta(hours=3)).strftime("%Y-%m-%d %H:00:00")
+    warnings_file = "https://www.meteo.lt/warnings/latest"
+    session = FakeSession(
+        {
+            f"{BASE_URL}/places": [PLACE],
+            f"{BASE_URL}/places/kaunas/forecasts/long-term": {
+                "place": PLACE,
+                "forecastCreationTimeUtc": hour,
+                "forecastTimestamps": [{"forecastTimeUtc": hour, "airTemperature": 10.0}],
+            },
+            WARNINGS_URL: [warnings_file],
+            warnings_file: {"phenomenon_groups": []},
+        }
+    )
+    tracer = RecordingTracer()
+    api = MeteoLtAPI(session=session, tracer=tracer)
+
+    await api.get_forecast_with_warnings(latitude=54.9, longitude=23.9)
+
+    parents = {span.name: span.parent for span in tracer.spans}
+    assert parents == {
+        "meteo_lt.get_forecast_with_warnings": None,
+        "meteo_lt.get_nearest_place": "meteo_lt.get_forecast_with_warnings",
+        "meteo_lt.fetch_places": "meteo_lt.get_nearest_place",
+        "GET places": "meteo_lt.fetch_places",
+        "meteo_lt.get_forecast": "meteo_lt.get_forecast_with_warnings",
+        "GET forecast": "meteo_lt.get_forecast",
+        "meteo_lt.enrich_forecast_with_warnings": "meteo_lt.get_forecast",
+        "meteo_lt.get_weather_warnings": "meteo_lt.enrich_forecast_with_warnings",
+        "GET warnings_list": "meteo_lt.get_weather_warnings",
+        "GET warnings": "meteo_lt.get_weather_warnings",
+        "meteo_lt.parse_warnings": "meteo_lt.get_weather_warnings",
+    }
+    forecast_span = next(span for span in tracer.spans if span.name == "GET forecast")
+    assert forecast_span.attributes["url.full"] == f"{BASE_URL}/places/kaunas/forecasts/long-term"
+    assert forecast_span.attributes["http.response.status_code"] == 200
+    assert forecast_span.attributes["http.response.body.size"] > 0
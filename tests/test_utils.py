@@ -0,0 +1,123 @@
+"""Utility function tests"""
+
+import random
+from math import acos, cos, radians, sin
+
+import pytest
+
+from meteo_lt.models import Coordinates, HydroStation, LocationBase
+from meteo_lt.utils import (
+    EARTH_RADIUS,
+    atomic_write,
+    chord_distance,
+    distance_chord,
+    find_nearest_location,
+    haversine,
+    rectangle_radius,
+    squared_chord,
+    unit_vector,
+)
+
+VILNIUS = (54.6872, 25.2797)
+KAUNAS = (54.8985, 23.9036)
+
+
+def _cosine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance by the spherical law of cosines, independent of the tested formulas"""
+    lat1, lon1, lat2, lon2 = radians(lat1), radians(lon1), radians(lat2), radians(lon2)
+    cosine = sin(lat1) * sin(lat2) + cos(lat1) * cos(lat2) * cos(lon2 - lon1)
+    return EARTH_RADIUS * acos(max(-1.0, min(1.0, cosine)))
+
+
+def _points(count: int, seed: int = 42):
+    rnd = random.Random(seed)
+    return [(rnd.uniform(-89.0, 89.0), rnd.uniform(-180.0, 180.0)) for _ in range(count)]
+
+
+def test_haversine_known_distances():
+    """Test distances between Vilnius and Kaunas, along the equator and between antipodes"""
+    assert haversine(*VILNIUS, *KAUNAS) == pytest.approx(91.3, abs=0.05)
+    assert haversine(*VILNIUS, *KAUNAS) == pytest.approx(_cosine_distance(*VILNIUS, *KAUNAS), rel=1e-9)
+    assert haversine(0.0, 0.0, 0.0, 1.0) == pytest.approx(2 * 3.141592653589793 * EARTH_RADIUS / 360)
+    assert haversine(0.0, 0.0, 0.0, 180.0) == pytest.approx(3.141592653589793 * EARTH_RADIUS)
+    assert haversine(*VILNIUS, *VILNIUS) == 0
+
+
+def test_unit_vector():
+    """Test unit vectors of poles and the equator and their length"""
+    assert unit_vector(0.0, 0.0) == pytest.approx((1.0, 0.0, 0.0))
+    assert unit_vector(0.0, 90.0) == pytest.approx((0.0, 1.0, 0.0))
+    assert unit_vector(90.0, 45.0) == pytest.approx((0.0, 0.0, 1.0))
+    for latitude, longitude in _points(100):
+        assert sum(value**2 for value in unit_vector(latitude, longitude)) == pytest.approx(1.0)
+
+
+def test_chord_distances():
+    """Test that chords give the same distances as the law of cosines and convert back"""
+    squared = squared_chord(unit_vector(*VILNIUS), unit_vector(*KAUNAS))
+    assert chord_distance(squared) == pytest.approx(_cosine_distance(*VILNIUS, *KAUNAS), rel=1e-9)
+    assert chord_distance(squared_chord(unit_vector(0.0, 0.0), unit_vector(0.0, 180.0))) == pytest.approx(
+        3.141592653589793 * EARTH_RADIUS
+    )
+
+    points = _points(200)
+    for (lat1, lon1), (lat2, lon2) in zip(points, points[1:]):
+        squared = squared_chord(unit_vector(lat1, lon1), unit_vector(lat2, lon2))
+        distance = _cosine_distance(lat1, lon1, lat2, lon2)
+        assert chord_distance(squared) == pytest.approx(distance, rel=1e-6, abs=1e-6)
+        assert distance_chord(chord_distance(squared)) == pytest.approx(squared, rel=1e-9, abs=1e-15)
+        assert chord_distance(distance_chord(distance)) == pytest.approx(distance, rel=1e-9, abs=1e-9)
+
+
+def test_rectangle_radius():
+    """Test that no point of a rectangle is farther from its center than the radius"""
+    rnd = random.Random(7)
+    for south, west, north, east in [(54.0, 24.0, 54.5, 25.0), (-0.5, 10.0, 0.5, 11.0), (-60.0, 0.0, -59.0, 3.0)]:
+        radius = rectangle_radius(south, west, north, east)
+        center = ((south + north) / 2, (west + east) / 2)
+        corners = [(south, west), (south, east), (north, west), (north, east)]
+        inside = [(rnd.uniform(south, north), rnd.uniform(west, east)) for _ in range(500)]
+        farthest = max(haversine(*center, *point) for point in corners + inside)
+        assert farthest <= radius
+        assert farthest > radius / 2
+
+
+def test_find_nearest_location_matches_haversine_scan():
+    """Test that ranking by chords finds the location nearest by haversine"""
+    rnd = random.Random(3)
+    locations = [
+        LocationBase(code=str(i), name=str(i), coordinates=Coordinates(latitude=lat, longitude=lon))
+        for i, (lat, lon) in enumerate(_points(300, seed=11))
+    ]
+    locations.append(HydroStation.from_dict({"code": "x", "name": "No coordinates", "waterBody": "River"}))
+    located = locations[:-1]
+    for _ in range(500):
+        latitude, longitude = rnd.uniform(-90.0, 90.0), rnd.uniform(-180.0, 180.0)
+        nearest = find_nearest_location(latitude, longitude, locations)
+        reference = min(located, key=lambda location: haversine(latitude, longitude, *_coordinates(location)))
+        assert haversine(latitude, longitude, *_coordinates(nearest)) == pytest.approx(
+            haversine(latitude, longitude, *_coordinates(reference)), abs=1e-9
+        )
+    assert find_nearest_location(0.0, 0.0, []) is None
+
+
+def _coordinates(location: LocationBase):
+    return location.latitude, location.longitude
+
+
+def test_atomic_write(tmp_path):
+    """Test that files are replaced only when writing completes"""
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as file:
+            file.write(b"partial")
+            raise RuntimeError("interrupted")
+    assert path.read_bytes() == b"old"
+    assert [child.name for child in tmp_path.iterdir()] == ["data.bin"]
+
+    with atomic_write(str(path)) as file:
+        file.write(b"new")
+    assert path.read_bytes() == b"new"
+    assert [child.name for child in tmp_path.iterdir()] == ["data.bin"]
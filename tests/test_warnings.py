@@ -65,12 +65,12 @@ async def test_get_weather_warnings_success(api_client, mock_file_list, mock_war
     with patch("aiohttp.ClientSession.get") as mock_get:
         # Mock the file list response
         mock_list_response = AsyncMock()
-        mock_list_response.json.return_value = mock_file_list
+        mock_list_response.read.return_value = json.dumps(mock_file_list).encode()
         mock_list_response.raise_for_status.return_value = None
 
         # Mock the warnings data response
         mock_data_response = AsyncMock()
-        mock_data_response.text.return_value = json.dumps(mock_warnings_data)
+        mock_data_response.read.return_value = json.dumps(mock_warnings_data).encode()
         mock_data_response.raise_for_status.return_value = None
 
         # Configure the mock to return different responses for different calls
@@ -93,11 +93,11 @@ async def test_get_weather_warnings_for_specific_area(api_client, mock_file_list
     """Test weather warnings for specific administrative division"""
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_list_response = AsyncMock()
-        mock_list_response.json.return_value = mock_file_list
+        mock_list_response.read.return_value = json.dumps(mock_file_list).encode()
         mock_list_response.raise_for_status.return_value = None
 
         mock_data_response = AsyncMock()
-        mock_data_response.text.return_value = json.dumps(mock_warnings_data)
+        mock_data_response.read.return_value = json.dumps(mock_warnings_data).encode()
         mock_data_response.raise_for_status.return_value = None
 
         mock_get.return_value.__aenter__.side_effect = [
@@ -116,7 +116,7 @@ async def test_get_weather_warnings_empty_response(api_client):
     """Test handling of empty warnings response"""
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
-        mock_response.json.return_value = []
+        mock_response.read.return_value = b"[]"
         mock_response.raise_for_status.return_value = None
         mock_get.return_value.__aenter__.return_value = mock_response
 
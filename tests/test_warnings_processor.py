@@ -2,13 +2,15 @@
 
 # pylint: disable=redefined-outer-name, protected-access
 
+from datetime import datetime, timezone
 from unittest.mock import patch
 
 import pytest
 
-from meteo_lt import WeatherWarning
+from meteo_lt import Coordinates, HydroStation, Place, WeatherWarning
 from meteo_lt.client import MeteoLtClient
-from meteo_lt.warnings import WeatherWarningsProcessor
+from meteo_lt.index import PlaceIndex
+from meteo_lt.warnings import WarningsSnapshot, WeatherWarningsProcessor
 
 
 @pytest.fixture
@@ -170,3 +172,127 @@ async def test_get_weather_warnings_filtered(warnings_processor, mock_warnings_d
         # Test with non-matching area
         warnings = await warnings_processor.get_weather_warnings("Vilniaus miesto")
         assert len(warnings) == 0
+
+
+def test_parse_warnings_data_shares_alert_fields(warnings_processor, mock_warnings_data):
+    """Test that warnings of one alert share fields and have parsed times"""
+    area_group = mock_warnings_data["phenomenon_groups"][0]["area_groups"][0]
+    area_group["areas"].append({"id": "lt.lhms.county:LT001", "name": "Vilniaus apskritis"})
+    area_group["single_alerts"][0]["phenomenon"] = "dangerous-wind"
+
+    warnings = warnings_processor._parse_warnings_data(mock_warnings_data)
+
+    assert [w.county for w in warnings] == ["Kauno apskritis", "Vilniaus apskritis"]
+    assert warnings[0].warning_type == "wind"
+    assert warnings[0].description is warnings[1].description
+    assert warnings[0].start_datetime == datetime(2025, 9, 30, 12, tzinfo=timezone.utc)
+    assert warnings[0].end_datetime == datetime(2025, 9, 30, 18, tzinfo=timezone.utc)
+
+
+def test_parse_warnings_data_filtered(warnings_processor, mock_warnings_data):
+    """Test that only warnings for affected areas are created"""
+    area_group = mock_warnings_data["phenomenon_groups"][0]["area_groups"][0]
+    area_group["areas"].append({"id": "lt.lhms.county:LT001", "name": "Vilniaus apskritis"})
+
+    warnings = warnings_processor._parse_warnings_data(mock_warnings_data, "Vilniaus miesto savivaldybė")
+
+    assert [w.county for w in warnings] == ["Vilniaus apskritis"]
+    assert warnings_processor._parse_warnings_data(mock_warnings_data, "Unknown savivaldybė") == []
+
+
+def test_get_warnings_for_timestamp_invalid_times(warnings_processor):
+    """Test that warnings with invalid or missing times never apply"""
+    warnings = [
+        WeatherWarning(
+            county="Kauno apskritis",
+            warning_type="wind",
+            severity="Moderate",
+            description="Strong wind",
+            start_time="invalid",
+            end_time="2025-09-30T18:00:00Z",
+        ),
+        WeatherWarning(county="Kauno apskritis", warning_type="wind", severity="Moderate", description="No times"),
+    ]
+
+    assert warnings[0].start_datetime is None
+    assert warnings_processor._get_warnings_for_timestamp("2025-09-30T15:00:00+00:00", warnings) == []
+    assert warnings_processor._get_warnings_for_timestamp("invalid", warnings) == []
+
+
+@pytest.fixture
+def mock_hydro_warnings_data(mock_warnings_data):
+    """Mock warnings JSON data with a hydrological warning"""
+    mock_warnings_data["phenomenon_groups"].append(
+        {
+            "phenomenon_category": "hydrological",
+            "area_groups": [
+                {
+                    "areas": [{"id": "lt.lhms.county:LT002", "name": "Kauno apskritis"}, {"name": "Nemunas"}],
+                    "single_alerts": [
+                        {
+                            "phenomenon": "high-water-level",
+                            "severity": "Minor",
+                            "description": {"en": "High water level", "lt": "Aukštas vandens lygis"},
+                            "t_from": "2025-09-30T12:00:00Z",
+                            "t_to": "2025-10-02T12:00:00Z",
+                        }
+                    ],
+                }
+            ],
+        }
+    )
+    return mock_warnings_data
+
+
+def test_parse_warnings_hydrological(warnings_processor, mock_hydro_warnings_data):
+    """Test that hydrological warnings are kept apart and not filtered by division"""
+    snapshot = warnings_processor._parse_warnings(mock_hydro_warnings_data, "Vilniaus miesto", True)
+
+    assert snapshot.weather == []
+    assert [w.county for w in snapshot.hydrological] == ["Kauno apskritis", "Nemunas"]
+    assert snapshot.hydrological_for_area("Nemunas")[0].warning_type == "high-water-level"
+    assert snapshot.hydrological_for_area("Neris") == []
+
+    # Hydrological warnings are still left out of weather warnings
+    assert len(warnings_processor._parse_warnings_data(mock_hydro_warnings_data)) == 1
+    assert warnings_processor._parse_warnings(mock_hydro_warnings_data).hydrological == []
+
+
+def test_hydrological_for_station(warnings_processor, mock_hydro_warnings_data):
+    """Test linking hydrological warnings to a station by nearest place and water body"""
+    snapshot = warnings_processor._parse_warnings(mock_hydro_warnings_data, include_hydrological=True)
+    place_index = PlaceIndex(
+        [
+            Place(
+                code="kaunas",
+                name="Kaunas",
+                administrative_division="Kauno miesto savivaldybė",
+                country_code="LT",
+                coordinates=Coordinates(latitude=54.9, longitude=23.9),
+            )
+        ]
+    )
+    station = HydroStation(
+        code="kauno-vms", name="Kaunas", water_body="Nemunas", coordinates=Coordinates(latitude=54.88, longitude=23.88)
+    )
+
+    warnings = snapshot.hydrological_for_station(station, place_index)
+    assert [w.county for w in warnings] == ["Nemunas", "Kauno apskritis"]
+
+    station.water_body = "Neris"
+    assert [w.county for w in snapshot.hydrological_for_station(station, place_index)] == ["Kauno apskritis"]
+    assert snapshot.hydrological_for_station(station, PlaceIndex([])) == []
+
+
+@pytest.mark.asyncio
+async def test_get_warnings_snapshot(warnings_processor, mock_hydro_warnings_data):
+    """Test getting both warning categories with one download"""
+    with patch.object(warnings_processor.client, "fetch_weather_warnings") as mock_fetch:
+        mock_fetch.return_value = mock_hydro_warnings_data
+
+        snapshot = await warnings_processor.get_warnings_snapshot()
+
+        mock_fetch.assert_called_once()
+        assert isinstance(snapshot, WarningsSnapshot)
+        assert len(snapshot.weather) == 1
+        assert len(snapshot.hydrological) == 2
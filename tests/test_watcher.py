@@ -0,0 +1,117 @@
+"""Warnings watcher tests"""
+
+import copy
+from unittest.mock import AsyncMock
+
+import pytest
+
+from meteo_lt.client import MeteoLtClient
+from meteo_lt.warnings import WeatherWarningsProcessor
+from meteo_lt.watcher import WarningsWatcher
+
+
+def _warnings_data(*alerts):
+    """Warnings file with alerts given as (area, phenomenon, severity, start)"""
+    return {
+        "phenomenon_groups": [
+            {
+                "phenomenon_category": "hydrological" if phenomenon.startswith("water") else "wind",
+                "area_groups": [
+                    {
+                        "areas": [{"name": area}],
+                        "single_alerts": [
+                            {
+                                "phenomenon": phenomenon,
+                                "severity": severity,
+                                "description": {"lt": f"{phenomenon} {area}"},
+                                "t_from": start,
+                                "t_to": "2025-10-01T18:00:00Z",
+                            }
+                        ],
+                    }
+                ],
+            }
+            for area, phenomenon, severity, start in alerts
+        ]
+    }
+
+
+@pytest.fixture
+def files():
+    """Warnings files served by the mocked client"""
+    return {
+        "file1": _warnings_data(
+            ("Kauno apskritis", "wind", "Moderate", "2025-09-30T12:00:00Z"),
+            ("Vilniaus apskritis", "wind", "Moderate", "2025-09-30T12:00:00Z"),
+        ),
+        "file2": _warnings_data(
+            ("Kauno apskritis", "wind", "Severe", "2025-09-30T12:00:00Z"),
+            ("Klaipėdos apskritis", "wind", "Moderate", "2025-09-30T12:00:00Z"),
+            ("Nemunas", "water-level", "Minor", "2025-09-30T12:00:00Z"),
+        ),
+    }
+
+
+@pytest.fixture
+def client(files):
+    """Client serving warnings files from the files fixture"""
+    client = MeteoLtClient()
+    client.fetch_warnings_file_list = AsyncMock(return_value=["file1"])
+    client.fetch_warnings_file = AsyncMock(side_effect=lambda url: copy.deepcopy(files[url]))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_poll_changes(client):
+    """Test added, removed and changed warnings between files"""
+    watcher = WarningsWatcher(WeatherWarningsProcessor(client))
+
+    changes = await watcher.poll()
+    assert [(c.change, c.warning.county) for c in changes] == [
+        ("added", "Kauno apskritis"),
+        ("added", "Vilniaus apskritis"),
+    ]
+
+    client.fetch_warnings_file_list.return_value = ["file2", "file1"]
+    changes = await watcher.poll()
+    assert [(c.change, c.category, c.warning.county) for c in changes] == [
+        ("removed", "weather", "Vilniaus apskritis"),
+        ("changed", "weather", "Kauno apskritis"),
+        ("added", "weather", "Klaipėdos apskritis"),
+        ("added", "hydrological", "Nemunas"),
+    ]
+    assert changes[1].previous.severity == "Moderate"
+    assert changes[1].warning.severity == "Severe"
+    assert len(watcher.snapshot.hydrological) == 1
+
+    client.fetch_warnings_file_list.return_value = []
+    changes = await watcher.poll()
+    assert [c.change for c in changes] == ["removed"] * 3
+    assert client.fetch_warnings_file.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_downloads_only_new_files(client):
+    """Test that an unchanged list does not download the warnings file again"""
+    watcher = WarningsWatcher(WeatherWarningsProcessor(client), emit_initial=False)
+
+    assert await watcher.poll() == []
+    assert await watcher.poll() == []
+    assert client.fetch_warnings_file_list.call_count == 2
+    client.fetch_warnings_file.assert_called_once_with("file1")
+    assert watcher.file_url == "file1"
+
+
+@pytest.mark.asyncio
+async def test_iterate_changes(client):
+    """Test that iterating polls until changes appear"""
+    watcher = WarningsWatcher(WeatherWarningsProcessor(client), interval=0, emit_initial=False)
+    lists = iter([["file1"], ["file1"], ["file2"]])
+    client.fetch_warnings_file_list.side_effect = lambda: next(lists)
+
+    changes = aiter(watcher)
+    change = await anext(changes)
+    await changes.aclose()
+
+    assert (change.change, change.warning.county) == ("removed", "Vilniaus apskritis")
+    assert client.fetch_warnings_file_list.call_count == 3